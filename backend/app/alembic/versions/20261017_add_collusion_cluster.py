@@ -0,0 +1,67 @@
+"""Add collusion cluster tables
+
+Revision ID: 20261017_collusion_cluster
+Revises: 20261017_endorsement_fanout_idx
+Create Date: 2026-10-17 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "20261017_collusion_cluster"
+down_revision = "20261017_endorsement_fanout_idx"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "collusioncluster",
+        sa.Column("id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("kind", sqlmodel.sql.sqltypes.AutoString(length=16), nullable=False),
+        sa.Column("size", sa.Integer(), nullable=False),
+        sa.Column("density", sa.Float(), nullable=False),
+        sa.Column("internal_share", sa.Float(), nullable=False),
+        sa.Column("mean_confidence", sa.Float(), nullable=False),
+        sa.Column("detected_at", sa.TIMESTAMP(timezone=False), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        op.f("ix_collusioncluster_detected_at"),
+        "collusioncluster",
+        ["detected_at"],
+        unique=False,
+    )
+    op.create_table(
+        "collusionmember",
+        sa.Column("cluster_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("user_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["cluster_id"], ["collusioncluster.id"], ondelete="CASCADE"
+        ),
+        sa.ForeignKeyConstraint(["user_id"], ["user.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("cluster_id", "user_id"),
+    )
+    op.create_index(
+        op.f("ix_collusionmember_user_id"), "collusionmember", ["user_id"], unique=False
+    )
+    op.add_column(
+        "reputationstate",
+        sa.Column("collusion_checked_at", sa.TIMESTAMP(timezone=False), nullable=True),
+    )
+    # Finding what changed since the last run scans endorsements by update time
+    op.create_index(
+        "ix_endorsement_updated_at", "endorsement", ["updated_at"], unique=False
+    )
+
+
+def downgrade():
+    op.drop_index("ix_endorsement_updated_at", table_name="endorsement")
+    op.drop_column("reputationstate", "collusion_checked_at")
+    op.drop_index(op.f("ix_collusionmember_user_id"), table_name="collusionmember")
+    op.drop_table("collusionmember")
+    op.drop_index(op.f("ix_collusioncluster_detected_at"), table_name="collusioncluster")
+    op.drop_table("collusioncluster")
@@ -0,0 +1,80 @@
+"""Add decayed reputation table
+
+Revision ID: 20261017_decayed_reputation
+Revises: 20261017_add_rating_summary
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "20261017_decayed_reputation"
+down_revision = "20261017_add_rating_summary"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "decayedreputation",
+        sa.Column("user_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("landmark", sa.TIMESTAMP(timezone=False), nullable=False),
+        sa.Column("rating_sum", sa.Float(), nullable=False),
+        sa.Column("rating_weight", sa.Float(), nullable=False),
+        sa.Column("endorsement_sum", sa.Float(), nullable=False),
+        sa.Column("endorsement_weight", sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["user.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("user_id"),
+    )
+    # Backfill with every sum decayed to now, using the default 90 day half-life.
+    # Ratings age from their creation, endorsements from their last update.
+    op.execute(
+        """
+        INSERT INTO decayedreputation
+            (user_id, landmark, rating_sum, rating_weight,
+             endorsement_sum, endorsement_weight)
+        SELECT
+            user_id,
+            now() AT TIME ZONE 'utc',
+            sum(rating * weight),
+            sum(weight) FILTER (WHERE kind = 'rating'),
+            sum(confidence * weight),
+            sum(weight) FILTER (WHERE kind = 'endorsement')
+        FROM (
+            SELECT
+                'rating' AS kind,
+                CASE WHEN r.rater_id = i.initiator_id
+                    THEN i.target_id ELSE i.initiator_id END AS user_id,
+                r.rating,
+                NULL::float AS confidence,
+                r.created_at AS at
+            FROM rating r
+            JOIN interaction i ON i.id = r.interaction_id
+            UNION ALL
+            SELECT 'endorsement', e.endorsed_id, NULL, e.confidence, e.updated_at
+            FROM endorsement e
+        ) AS events,
+        LATERAL (
+            SELECT exp(
+                -ln(2) / (90 * 86400)
+                * extract(epoch FROM (now() AT TIME ZONE 'utc') - events.at)
+            ) AS weight
+        ) AS decay
+        GROUP BY user_id
+        """
+    )
+    op.execute(
+        """
+        UPDATE decayedreputation SET
+            rating_sum = coalesce(rating_sum, 0),
+            rating_weight = coalesce(rating_weight, 0),
+            endorsement_sum = coalesce(endorsement_sum, 0),
+            endorsement_weight = coalesce(endorsement_weight, 0)
+        """
+    )
+
+
+def downgrade():
+    op.drop_table("decayedreputation")
@@ -0,0 +1,55 @@
+"""Add interaction and rating indexes for the hot read paths
+
+Revision ID: 20261017_hot_path_indexes
+Revises: 20261017_user_endorse_counters
+Create Date: 2026-10-17 20:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "20261017_hot_path_indexes"
+down_revision = "20261017_user_endorse_counters"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # get_user_interactions: one range per side, newest first; the OR of both
+    # sides becomes a BitmapOr of the two
+    op.create_index(
+        "ix_interaction_initiator_created",
+        "interaction",
+        ["initiator_id", "created_at", "id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_interaction_target_created",
+        "interaction",
+        ["target_id", "created_at", "id"],
+        unique=False,
+    )
+    # create_interaction: duplicate pending request check
+    op.create_index(
+        "ix_interaction_pending_pair",
+        "interaction",
+        ["initiator_id", "target_id"],
+        unique=False,
+        postgresql_where=sa.text("status = 'pending'"),
+    )
+    # add_rating: duplicate rating check; also serves ratings by interaction
+    op.create_index(
+        "ix_rating_interaction_rater",
+        "rating",
+        ["interaction_id", "rater_id"],
+        unique=False,
+    )
+    # get_endorsers_for_user is already served by ix_endorsement_endorsed_id
+
+
+def downgrade():
+    op.drop_index("ix_rating_interaction_rater", table_name="rating")
+    op.drop_index("ix_interaction_pending_pair", table_name="interaction")
+    op.drop_index("ix_interaction_target_created", table_name="interaction")
+    op.drop_index("ix_interaction_initiator_created", table_name="interaction")
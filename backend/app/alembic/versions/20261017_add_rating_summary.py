@@ -0,0 +1,63 @@
+"""Add rating summary table
+
+Revision ID: 20261017_add_rating_summary
+Revises: 20261017_reputation_state
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "20261017_add_rating_summary"
+down_revision = "20261017_reputation_state"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "ratingsummary",
+        sa.Column("user_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("count", sa.Integer(), nullable=False),
+        sa.Column("total", sa.Integer(), nullable=False),
+        sa.Column("sum_squares", sa.Integer(), nullable=False),
+        sa.Column("bayesian_mean", sa.Float(), nullable=False),
+        sa.Column("histogram", postgresql.ARRAY(sa.Integer()), nullable=False),
+        sa.Column("updated_at", sa.TIMESTAMP(timezone=False), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["user.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("user_id"),
+    )
+    # Backfill from existing ratings; the rated user is the other participant.
+    # Bayesian mean uses the default prior (mean 0, weight 5).
+    histogram = ", ".join(
+        f"count(*) FILTER (WHERE rated.rating = {value})" for value in range(-5, 6)
+    )
+    op.execute(
+        f"""
+        INSERT INTO ratingsummary
+            (user_id, count, total, sum_squares, bayesian_mean, histogram, updated_at)
+        SELECT
+            rated.user_id,
+            count(*),
+            sum(rated.rating),
+            sum(rated.rating * rated.rating),
+            sum(rated.rating)::float / (5 + count(*)),
+            ARRAY[{histogram}],
+            now() AT TIME ZONE 'utc'
+        FROM (
+            SELECT
+                CASE WHEN r.rater_id = i.initiator_id
+                    THEN i.target_id ELSE i.initiator_id END AS user_id,
+                r.rating
+            FROM rating r
+            JOIN interaction i ON i.id = r.interaction_id
+        ) AS rated
+        GROUP BY rated.user_id
+        """
+    )
+
+
+def downgrade():
+    op.drop_table("ratingsummary")
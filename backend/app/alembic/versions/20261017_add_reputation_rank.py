@@ -0,0 +1,35 @@
+"""Add leaderboard rank to reputation
+
+Revision ID: 20261017_reputation_rank
+Revises: 20261017_decayed_reputation
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "20261017_reputation_rank"
+down_revision = "20261017_decayed_reputation"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("reputation", sa.Column("rank", sa.Integer(), nullable=True))
+    op.execute(
+        """
+        UPDATE reputation SET rank = ranked.new_rank
+        FROM (
+            SELECT user_id, row_number() OVER (ORDER BY score DESC, user_id) AS new_rank
+            FROM reputation
+        ) AS ranked
+        WHERE reputation.user_id = ranked.user_id
+        """
+    )
+    op.create_index("ix_reputation_rank", "reputation", ["rank"], unique=False)
+
+
+def downgrade():
+    op.drop_index("ix_reputation_rank", table_name="reputation")
+    op.drop_column("reputation", "rank")
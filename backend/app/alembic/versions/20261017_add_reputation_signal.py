@@ -0,0 +1,34 @@
+"""Add reputation recompute signal queue
+
+Revision ID: 20261017_reputation_signal
+Revises: 20261017_reputation_rank
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+# revision identifiers, used by Alembic.
+revision = "20261017_reputation_signal"
+down_revision = "20261017_reputation_rank"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "reputationsignal",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("reason", sqlmodel.sql.sqltypes.AutoString(length=50), nullable=False),
+        sa.Column("created_at", sa.TIMESTAMP(timezone=False), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.add_column(
+        "reputationstate", sa.Column("last_run_seconds", sa.Float(), nullable=True)
+    )
+
+
+def downgrade():
+    op.drop_column("reputationstate", "last_run_seconds")
+    op.drop_table("reputationsignal")
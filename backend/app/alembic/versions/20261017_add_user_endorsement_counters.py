@@ -0,0 +1,60 @@
+"""Add denormalized endorsement counters to user
+
+Revision ID: 20261017_user_endorse_counters
+Revises: 20261017_collusion_cluster
+Create Date: 2026-10-17 19:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "20261017_user_endorse_counters"
+down_revision = "20261017_collusion_cluster"
+branch_labels = None
+depends_on = None
+
+COLUMNS = {
+    "endorsements_received": sa.Integer(),
+    "endorsements_given": sa.Integer(),
+    "confidence_received": sa.Float(),
+    "confidence_given": sa.Float(),
+}
+
+
+def upgrade():
+    for name, type_ in COLUMNS.items():
+        op.add_column(
+            "user", sa.Column(name, type_, nullable=False, server_default="0")
+        )
+    op.execute(
+        """
+        UPDATE "user" u SET
+            endorsements_received = coalesce(received.n, 0),
+            endorsements_given = coalesce(given.n, 0),
+            confidence_received = coalesce(received.total, 0),
+            confidence_given = coalesce(given.total, 0)
+        FROM "user" base
+        LEFT JOIN (
+            SELECT endorsed_id AS id, count(*) AS n, sum(confidence) AS total
+            FROM endorsement GROUP BY endorsed_id
+        ) received ON received.id = base.id
+        LEFT JOIN (
+            SELECT endorser_id AS id, count(*) AS n, sum(confidence) AS total
+            FROM endorsement GROUP BY endorser_id
+        ) given ON given.id = base.id
+        WHERE u.id = base.id AND (received.id IS NOT NULL OR given.id IS NOT NULL)
+        """
+    )
+    # Most endorsed / most trusted users first, with id as the tie-breaker
+    op.create_index(
+        "ix_user_endorsements_received", "user", ["endorsements_received", "id"]
+    )
+    op.create_index("ix_user_confidence_received", "user", ["confidence_received", "id"])
+
+
+def downgrade():
+    op.drop_index("ix_user_confidence_received", table_name="user")
+    op.drop_index("ix_user_endorsements_received", table_name="user")
+    for name in reversed(COLUMNS):
+        op.drop_column("user", name)
@@ -0,0 +1,40 @@
+"""Add created_at to user and item for keyset paging
+
+Revision ID: 20261017_user_item_created_at
+Revises: 20261017_hot_path_indexes
+Create Date: 2026-10-17 21:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "20261017_user_item_created_at"
+down_revision = "20261017_hot_path_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Existing rows all get the migration time; id breaks the tie
+    for table in ("user", "item"):
+        op.add_column(
+            table,
+            sa.Column(
+                "created_at",
+                sa.TIMESTAMP(timezone=False),
+                nullable=False,
+                server_default=sa.text("timezone('utc', now())"),
+            ),
+        )
+    op.create_index("ix_user_created_at", "user", ["created_at", "id"])
+    op.create_index("ix_item_created_at", "item", ["created_at", "id"])
+    op.create_index("ix_item_owner_created_at", "item", ["owner_id", "created_at", "id"])
+
+
+def downgrade():
+    op.drop_index("ix_item_owner_created_at", table_name="item")
+    op.drop_index("ix_item_created_at", table_name="item")
+    op.drop_index("ix_user_created_at", table_name="user")
+    op.drop_column("item", "created_at")
+    op.drop_column("user", "created_at")
@@ -0,0 +1,48 @@
+"""Add trigram and prefix indexes for user search
+
+Revision ID: 20261017_user_search_indexes
+Revises: 20261017_user_item_created_at
+Create Date: 2026-10-17 22:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "20261017_user_search_indexes"
+down_revision = "20261017_user_item_created_at"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # Rewrites the table once to fill in the generated column
+    op.add_column(
+        "user",
+        sa.Column(
+            "search_text",
+            sa.Text(),
+            sa.Computed(
+                "lower(coalesce(full_name, '') || ' ' || email)", persisted=True
+            ),
+        ),
+    )
+    op.execute(
+        'CREATE INDEX ix_user_search_text_trgm ON "user"'
+        " USING gin (search_text gin_trgm_ops)"
+    )
+    # Prefix autocomplete: LIKE 'q%' and ORDER BY both served in "C" order
+    op.execute(
+        'CREATE INDEX ix_user_full_name_prefix ON "user" ((lower(full_name) COLLATE "C"))'
+    )
+    op.execute(
+        'CREATE INDEX ix_user_email_prefix ON "user" ((lower(email) COLLATE "C"))'
+    )
+
+
+def downgrade():
+    op.drop_index("ix_user_email_prefix", table_name="user")
+    op.drop_index("ix_user_full_name_prefix", table_name="user")
+    op.drop_index("ix_user_search_text_trgm", table_name="user")
+    op.drop_column("user", "search_text")
@@ -0,0 +1,34 @@
+"""Add endorsement confidence indexes for top-k fanout
+
+Revision ID: 20261017_endorsement_fanout_idx
+Revises: 20261017_reputation_signal
+Create Date: 2026-10-17 15:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20261017_endorsement_fanout_idx"
+down_revision = "20261017_reputation_signal"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        "ix_endorsement_endorser_confidence",
+        "endorsement",
+        ["endorser_id", "confidence"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_endorsement_endorsed_confidence",
+        "endorsement",
+        ["endorsed_id", "confidence"],
+        unique=False,
+    )
+
+
+def downgrade():
+    op.drop_index("ix_endorsement_endorsed_confidence", table_name="endorsement")
+    op.drop_index("ix_endorsement_endorser_confidence", table_name="endorsement")
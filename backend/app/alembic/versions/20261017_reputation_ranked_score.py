@@ -0,0 +1,30 @@
+"""Store the full-run score each leaderboard rank was computed from
+
+Revision ID: 20261017_ranked_score
+Revises: 20261017_state_updated_at
+Create Date: 2026-10-17 23:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "20261017_ranked_score"
+down_revision = "20261017_state_updated_at"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("reputation", sa.Column("ranked_score", sa.Float(), nullable=True))
+    op.execute(
+        """
+        UPDATE reputation SET ranked_score = reputation.score / s.estimate_total
+        FROM reputationstate s
+        WHERE s.id = 1 AND s.estimate_total > 0 AND reputation.rank IS NOT NULL
+        """
+    )
+
+
+def downgrade():
+    op.drop_column("reputation", "ranked_score")
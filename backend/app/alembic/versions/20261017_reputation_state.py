@@ -0,0 +1,35 @@
+"""Add incremental reputation state
+
+Revision ID: 20261017_reputation_state
+Revises: 20261017_add_reputation_table
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "20261017_reputation_state"
+down_revision = "20261017_add_reputation_table"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column(
+        "reputation",
+        sa.Column("residual", sa.Float(), nullable=False, server_default="0"),
+    )
+    op.create_table(
+        "reputationstate",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("estimate_total", sa.Float(), nullable=False),
+        sa.Column("residual_l1", sa.Float(), nullable=False),
+        sa.Column("computed_at", sa.TIMESTAMP(timezone=False), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+
+
+def downgrade():
+    op.drop_table("reputationstate")
+    op.drop_column("reputation", "residual")
@@ -0,0 +1,27 @@
+"""Track the last change to stored reputation scores
+
+Revision ID: 20261017_state_updated_at
+Revises: 20261017_user_search_indexes
+Create Date: 2026-10-17 23:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "20261017_state_updated_at"
+down_revision = "20261017_user_search_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column(
+        "reputationstate", sa.Column("updated_at", sa.DateTime(), nullable=True)
+    )
+    op.execute("UPDATE reputationstate SET updated_at = computed_at")
+    op.alter_column("reputationstate", "updated_at", nullable=False)
+
+
+def downgrade():
+    op.drop_column("reputationstate", "updated_at")
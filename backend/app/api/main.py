@@ -1,6 +1,17 @@
 from fastapi import APIRouter
 
-from app.api.routes import items, login, private, users, utils, interactions, endorsements
+from app.api.routes import (
+    bulk_import,
+    endorsements,
+    export,
+    interactions,
+    items,
+    login,
+    private,
+    reputation,
+    users,
+    utils,
+)
 from app.core.config import settings
 
 api_router = APIRouter()
@@ -10,6 +21,9 @@ api_router.include_router(utils.router)
 api_router.include_router(items.router)
 api_router.include_router(interactions.router)
 api_router.include_router(endorsements.router)
+api_router.include_router(reputation.router)
+api_router.include_router(export.router)
+api_router.include_router(bulk_import.router)
 
 
 if settings.ENVIRONMENT == "local":
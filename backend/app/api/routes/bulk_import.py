@@ -0,0 +1,29 @@
+from typing import Any, Literal
+
+from fastapi import APIRouter, Depends, File, UploadFile
+
+from app.api.deps import get_current_active_superuser
+from app.bulk_import import open_records, read_records, run_import
+from app.core.db import direct_engine
+from app.models import BulkImportPublic
+
+router = APIRouter(prefix="/import", tags=["import"])
+
+
+@router.post(
+    "/{kind}",
+    dependencies=[Depends(get_current_active_superuser)],
+    response_model=BulkImportPublic,
+)
+def bulk_import(
+    kind: Literal["endorsements", "interactions", "ratings"],
+    file: UploadFile = File(...),
+    format: Literal["csv", "ndjson"] | None = None,
+) -> Any:
+    """
+    Import endorsements, interactions or ratings from a CSV or NDJSON upload.
+    """
+    if format is None:
+        format = "csv" if (file.filename or "").endswith(".csv") else "ndjson"
+    stream = open_records(file.file)
+    return run_import(direct_engine, kind, read_records(stream, format))
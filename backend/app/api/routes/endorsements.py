@@ -1,11 +1,33 @@
 import uuid
-from typing import Any
+from typing import Any, Literal
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 
-from app import crud
-from app.api.deps import CurrentUser, SessionDep
-from app.models import EndorsementCreate, EndorsementPublic, EndorsementWithUser, User
+from app import crud, crud_async
+from app.api.deps import (
+    AsyncCurrentUser,
+    AsyncSessionDep,
+    CurrentUser,
+    SessionDep,
+    get_current_user,
+)
+from app.core.config import settings
+from app.models import (
+    EndorsementCreate,
+    EndorsementNeighborhoodPublic,
+    EndorsementPublic,
+    EndorsementWithUser,
+    PersonalizedTrustPublic,
+    TrustPathPublic,
+    User,
+)
+from app.reputation.adjacency import adjacency
+from app.reputation.paths import IndexEdges, SqlEdges, strongest_path
+from app.reputation.personalized import (
+    forward_push,
+    index_neighbours,
+    sql_neighbours,
+)
 
 router = APIRouter(prefix="/endorsements", tags=["endorsements"])
 
@@ -46,63 +68,177 @@ def create_or_update_endorsement(
         raise HTTPException(status_code=400, detail=str(e))
 
 
-@router.get("/endorsed-by-me", response_model=list[EndorsementWithUser])
-def get_my_endorsements(
+@router.get(
+    "/path",
+    dependencies=[Depends(get_current_user)],
+    response_model=TrustPathPublic,
+)
+def get_trust_path(
     *,
     session: SessionDep,
-    current_user: CurrentUser,
+    from_id: uuid.UUID = Query(alias="from"),
+    to_id: uuid.UUID = Query(alias="to"),
+    max_depth: int = Query(settings.TRUST_PATH_MAX_DEPTH, ge=1, le=10),
+    time_budget_ms: int = Query(
+        settings.TRUST_PATH_TIME_BUDGET_MS,
+        gt=0,
+        le=2000,
+        description="Hard time budget for the search",
+    ),
+) -> Any:
+    """
+    Get the strongest chain of endorsements from one user to another.
+    """
+    if from_id == to_id:
+        raise HTTPException(status_code=400, detail="from and to must differ")
+    for user_id in (from_id, to_id):
+        if not session.get(User, user_id):
+            raise HTTPException(status_code=404, detail="User not found")
+    edges = IndexEdges(adjacency.view()) if adjacency.loaded else SqlEdges(session)
+    result = strongest_path(
+        from_id, to_id, edges, max_depth=max_depth, time_budget_ms=time_budget_ms
+    )
+    return TrustPathPublic(
+        from_id=from_id,
+        to_id=to_id,
+        max_depth=max_depth,
+        status=result.status,
+        path=result.path,
+        confidences=result.confidences,
+        weight=result.weight,
+        explored=result.explored,
+    )
+
+
+@router.get("/endorsed-by-me", response_model=list[EndorsementWithUser])
+async def get_my_endorsements(
+    *,
+    session: AsyncSessionDep,
+    current_user: AsyncCurrentUser,
 ) -> Any:
     """
     Get all endorsements made by the current user.
     """
-    endorsements = crud.get_endorsements_with_user_info(
+    endorsements = await crud_async.get_endorsements_with_user_info(
         session=session, endorser_id=current_user.id
     )
     return endorsements
 
 
 @router.get("/endorsing-me", response_model=list[EndorsementWithUser])
-def get_my_endorsers(
+async def get_my_endorsers(
     *,
-    session: SessionDep,
-    current_user: CurrentUser,
+    session: AsyncSessionDep,
+    current_user: AsyncCurrentUser,
 ) -> Any:
     """
     Get all users endorsing the current user.
     """
-    endorsements = crud.get_endorsers_with_user_info(
+    endorsements = await crud_async.get_endorsers_with_user_info(
         session=session, endorsed_id=current_user.id
     )
     return endorsements
 
 
 @router.get("/{user_id}/endorsed-by", response_model=list[EndorsementWithUser])
-def get_user_endorsements(
+async def get_user_endorsements(
     *,
-    session: SessionDep,
-    current_user: CurrentUser,
+    session: AsyncSessionDep,
+    current_user: AsyncCurrentUser,
     user_id: uuid.UUID,
 ) -> Any:
     """
     Get all endorsements made by a specific user.
     """
-    endorsements = crud.get_endorsements_with_user_info(
+    endorsements = await crud_async.get_endorsements_with_user_info(
         session=session, endorser_id=user_id
     )
     return endorsements
 
 
 @router.get("/{user_id}/endorsers", response_model=list[EndorsementWithUser])
-def get_user_endorsers(
+async def get_user_endorsers(
     *,
-    session: SessionDep,
-    current_user: CurrentUser,
+    session: AsyncSessionDep,
+    current_user: AsyncCurrentUser,
     user_id: uuid.UUID,
 ) -> Any:
     """
     Get all endorsers of a specific user.
     """
-    endorsements = crud.get_endorsers_with_user_info(
+    endorsements = await crud_async.get_endorsers_with_user_info(
         session=session, endorsed_id=user_id
     )
     return endorsements
+
+
+@router.get(
+    "/{user_id}/neighborhood",
+    dependencies=[Depends(get_current_user)],
+    response_model=EndorsementNeighborhoodPublic,
+)
+def get_user_neighborhood(
+    *,
+    session: SessionDep,
+    user_id: uuid.UUID,
+    depth: int = Query(2, ge=1, le=4),
+    max_fanout: int = Query(20, ge=1, le=100, description="Edges kept per user"),
+    direction: Literal["out", "in"] = Query(
+        "out", description="Follow endorsements made (out) or received (in)"
+    ),
+) -> Any:
+    """
+    Get the endorsement subgraph within depth hops of a user.
+    """
+    if not session.get(User, user_id):
+        raise HTTPException(status_code=404, detail="User not found")
+    return crud.get_endorsement_neighborhood(
+        session=session,
+        user_id=user_id,
+        depth=depth,
+        max_fanout=max_fanout,
+        direction=direction,
+    )
+
+
+@router.get("/{user_id}/trust-from-me", response_model=PersonalizedTrustPublic)
+def get_trust_from_me(
+    *,
+    session: SessionDep,
+    current_user: CurrentUser,
+    user_id: uuid.UUID,
+    epsilon: float = Query(
+        settings.PERSONALIZED_TRUST_EPSILON,
+        gt=0,
+        le=1,
+        description="Residual threshold; smaller is more accurate but slower",
+    ),
+    time_budget_ms: int = Query(
+        settings.PERSONALIZED_TRUST_TIME_BUDGET_MS,
+        gt=0,
+        le=1000,
+        description="Hard time budget for the computation",
+    ),
+) -> Any:
+    """
+    Estimate how much the current user should trust a user, from the current
+    user's own endorsements (approximate personalized PageRank).
+    """
+    if not session.get(User, user_id):
+        raise HTTPException(status_code=404, detail="User not found")
+    neighbours = (
+        index_neighbours(adjacency) if adjacency.loaded else sql_neighbours(session)
+    )
+    trust = forward_push(
+        current_user.id,
+        neighbours,
+        epsilon=epsilon,
+        time_budget_ms=time_budget_ms,
+    )
+    return PersonalizedTrustPublic(
+        source_id=current_user.id,
+        target_id=user_id,
+        score=trust.scores.get(user_id, 0.0),
+        error_bound=trust.error_bound,
+        converged=trust.converged,
+    )
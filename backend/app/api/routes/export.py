@@ -0,0 +1,37 @@
+import uuid
+from typing import Literal
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+
+from app.api.deps import get_current_active_superuser
+from app.core.db import engine
+from app.export import MEDIA_TYPES, export_table
+
+router = APIRouter(prefix="/export", tags=["export"])
+
+
+@router.get(
+    "/{table}",
+    dependencies=[Depends(get_current_active_superuser)],
+    response_class=StreamingResponse,
+)
+def export(
+    table: Literal["endorsements", "interactions", "ratings"],
+    format: Literal["ndjson", "csv"] = "ndjson",
+    after: uuid.UUID | None = Query(
+        None, description="Resume after this id (the last row received)"
+    ),
+) -> StreamingResponse:
+    """
+    Stream every row of a table in id order as NDJSON or CSV.
+    """
+    # The stream opens its own connection: the request session is closed
+    # before the body is sent
+    return StreamingResponse(
+        export_table(engine, table, format=format, after=after),
+        media_type=MEDIA_TYPES[format],
+        headers={
+            "Content-Disposition": f'attachment; filename="{table}.{format}"',
+        },
+    )
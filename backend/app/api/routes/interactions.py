@@ -1,20 +1,32 @@
-from typing import Any, List
+from typing import Any, List, Literal
 import uuid
 
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlmodel import select
 
-from app.api.deps import CurrentUser, SessionDep
-from app import crud
+from app.api.deps import (
+    AsyncCurrentUser,
+    AsyncSessionDep,
+    CurrentUser,
+    CursorDep,
+    SessionDep,
+)
+from app import crud, crud_async
 from app.models import (
     InteractionCreate,
     InteractionPublic,
+    InteractionsPublic,
     Interaction,
     Message,
     User,
+    InteractionRatingsBatch,
+    InteractionRatingsPublic,
+    InteractionsRatingsPublic,
     RatingCreate,
     RatingPublic,
+    RatingWithRater,
 )
+from app.pagination import page
 
 router = APIRouter(prefix="/interactions", tags=["interactions"])
 
@@ -56,10 +68,10 @@ def respond_interaction(
 
 
 @router.get("/users/{user_id}", response_model=List[InteractionPublic])
-def list_user_interactions(
+async def list_user_interactions(
     user_id: uuid.UUID,
-    session: SessionDep,
-    current_user: CurrentUser,
+    session: AsyncSessionDep,
+    current_user: AsyncCurrentUser,
     role: str | None = Query(None),
     skip: int = Query(0),
     limit: int = Query(100),
@@ -67,20 +79,60 @@ def list_user_interactions(
     """List interactions for a user. Only the user themselves or superuser can list."""
     if user_id != current_user.id and not current_user.is_superuser:
         raise HTTPException(status_code=403, detail="Not authorized")
-    interactions = crud.get_user_interactions(
+    interactions = await crud_async.get_user_interactions(
         session=session, user_id=user_id, role=role, skip=skip, limit=limit
     )
     return interactions
 
 
-@router.get("/{interaction_id}/ratings")
-def list_ratings_for_interaction(
+@router.get("/users/{user_id}/page", response_model=InteractionsPublic)
+async def page_user_interactions(
+    user_id: uuid.UUID,
+    session: AsyncSessionDep,
+    current_user: AsyncCurrentUser,
+    cursor: CursorDep,
+    role: Literal["initiator", "target"] | None = Query(None),
+    limit: int = Query(100, gt=0, le=1000),
+) -> Any:
+    """List interactions for a user, newest first, one cursor page at a time.
+    Pass next_cursor back as cursor for the next page. Only the user themselves or superuser can list."""
+    if user_id != current_user.id and not current_user.is_superuser:
+        raise HTTPException(status_code=403, detail="Not authorized")
+    interactions = await crud_async.get_user_interactions(
+        session=session, user_id=user_id, role=role, limit=limit + 1, cursor=cursor
+    )
+    data, next_cursor = page(interactions, limit)
+    return InteractionsPublic(data=data, next_cursor=next_cursor)
+
+
+@router.post("/ratings", response_model=InteractionsRatingsPublic)
+async def list_ratings_for_interactions(
+    body: InteractionRatingsBatch,
+    session: AsyncSessionDep,
+    current_user: AsyncCurrentUser,
+) -> Any:
+    """List ratings with rater information for many interactions at once.
+    Interactions the current user took no part in are omitted unless superuser."""
+    ratings = await crud_async.get_ratings_with_rater(
+        session=session,
+        interaction_ids=body.interaction_ids,
+        viewer_id=None if current_user.is_superuser else current_user.id,
+    )
+    data = [
+        InteractionRatingsPublic(interaction_id=interaction_id, ratings=items)
+        for interaction_id, items in ratings.items()
+    ]
+    return InteractionsRatingsPublic(data=data, count=len(data))
+
+
+@router.get("/{interaction_id}/ratings", response_model=List[RatingWithRater])
+async def list_ratings_for_interaction(
     interaction_id: uuid.UUID,
-    session: SessionDep,
-    current_user: CurrentUser,
+    session: AsyncSessionDep,
+    current_user: AsyncCurrentUser,
 ) -> Any:
     """List ratings for an interaction with rater information. Only participants or superuser can view."""
-    interaction = session.get(Interaction, interaction_id)
+    interaction = await session.get(Interaction, interaction_id)
     if not interaction:
         raise HTTPException(status_code=404, detail="Interaction not found")
     if (
@@ -88,23 +140,10 @@ def list_ratings_for_interaction(
         and not current_user.is_superuser
     ):
         raise HTTPException(status_code=403, detail="Not authorized")
-    ratings = crud.get_ratings_for_interaction(session=session, interaction_id=interaction_id)
-    
-    # Enrich with rater info
-    result = []
-    for rating in ratings:
-        rater = session.get(User, rating.rater_id)
-        result.append({
-            "id": str(rating.id),
-            "interaction_id": str(rating.interaction_id),
-            "rater_id": str(rating.rater_id),
-            "rating": rating.rating,
-            "comment": rating.comment,
-            "created_at": rating.created_at.isoformat(),
-            "rater_email": rater.email if rater else "Unknown",
-            "rater_full_name": rater.full_name if rater else "Unknown User",
-        })
-    return result
+    ratings = await crud_async.get_ratings_with_rater(
+        session=session, interaction_ids=[interaction_id]
+    )
+    return ratings.get(interaction_id, [])
 
 
 
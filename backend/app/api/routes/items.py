@@ -1,44 +1,40 @@
 import uuid
 from typing import Any
 
-from fastapi import APIRouter, HTTPException
-from sqlmodel import func, select
+from fastapi import APIRouter, HTTPException, Query
+from sqlmodel import select
 
-from app.api.deps import CurrentUser, SessionDep
+from app.api.deps import CurrentUser, CursorDep, SessionDep
 from app.models import Item, ItemCreate, ItemPublic, ItemsPublic, ItemUpdate, Message
+from app.pagination import CountMode, count_rows, keyset, page
 
 router = APIRouter(prefix="/items", tags=["items"])
 
 
 @router.get("/", response_model=ItemsPublic)
 def read_items(
-    session: SessionDep, current_user: CurrentUser, skip: int = 0, limit: int = 100
+    session: SessionDep,
+    current_user: CurrentUser,
+    cursor: CursorDep,
+    skip: int = 0,
+    limit: int = 100,
+    count: CountMode = Query(
+        "exact", description="How to total the items: exact, estimate or none"
+    ),
 ) -> Any:
     """
-    Retrieve items.
+    Retrieve items, newest first.
+    Page with the returned next_cursor (constant cost at any depth) or skip.
     """
 
-    if current_user.is_superuser:
-        count_statement = select(func.count()).select_from(Item)
-        count = session.exec(count_statement).one()
-        statement = select(Item).offset(skip).limit(limit)
-        items = session.exec(statement).all()
-    else:
-        count_statement = (
-            select(func.count())
-            .select_from(Item)
-            .where(Item.owner_id == current_user.id)
-        )
-        count = session.exec(count_statement).one()
-        statement = (
-            select(Item)
-            .where(Item.owner_id == current_user.id)
-            .offset(skip)
-            .limit(limit)
-        )
-        items = session.exec(statement).all()
+    statement = select(Item)
+    if not current_user.is_superuser:
+        statement = statement.where(Item.owner_id == current_user.id)
+    total = count_rows(session, statement, count)
+    statement = keyset(statement, Item, cursor).offset(skip).limit(limit + 1)
+    items, next_cursor = page(session.exec(statement).all(), limit)
 
-    return ItemsPublic(data=items, count=count)
+    return ItemsPublic(data=items, count=total, next_cursor=next_cursor)
 
 
 @router.get("/{id}", response_model=ItemPublic)
@@ -0,0 +1,134 @@
+import uuid
+from typing import Any
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from app import crud
+from app.api.deps import SessionDep, get_current_active_superuser, get_current_user
+from app.models import (
+    CollusionCheckPublic,
+    CollusionClustersPublic,
+    LeaderboardPublic,
+    ReputationRunPublic,
+    ReputationSnapshotPublic,
+    ReputationWorkerStatusPublic,
+    SnapshotReputationPublic,
+)
+from app.reputation.collusion import check_collusion
+from app.reputation.engine import recompute_reputation
+from app.reputation.snapshot import snapshots
+from app.reputation.worker import worker_status
+
+router = APIRouter(prefix="/reputation", tags=["reputation"])
+
+
+@router.get(
+    "/leaderboard",
+    dependencies=[Depends(get_current_user)],
+    response_model=LeaderboardPublic,
+)
+def read_leaderboard(
+    session: SessionDep,
+    after_rank: int = Query(0, ge=0, description="Last rank of the previous page"),
+    limit: int = Query(100, gt=0, le=1000),
+    is_active: bool | None = None,
+) -> Any:
+    """
+    List users by reputation rank, highest first.
+    Ranks are refreshed by each full recompute.
+    """
+    return crud.get_leaderboard(
+        session=session, after_rank=after_rank, limit=limit, is_active=is_active
+    )
+
+
+@router.post(
+    "/recompute",
+    dependencies=[Depends(get_current_active_superuser)],
+    response_model=ReputationRunPublic,
+)
+def recompute(session: SessionDep) -> Any:
+    """
+    Recompute global reputation scores for all users.
+    """
+    return recompute_reputation(session=session)
+
+
+@router.get(
+    "/worker",
+    dependencies=[Depends(get_current_active_superuser)],
+    response_model=ReputationWorkerStatusPublic,
+)
+def read_worker_status(session: SessionDep) -> Any:
+    """
+    Get the recompute queue depth and the duration of the last recompute.
+    """
+    return worker_status(session=session)
+
+
+@router.get(
+    "/collusion",
+    dependencies=[Depends(get_current_active_superuser)],
+    response_model=CollusionClustersPublic,
+)
+def read_collusion_clusters(
+    session: SessionDep, skip: int = 0, limit: int = Query(100, gt=0, le=1000)
+) -> Any:
+    """
+    List suspected collusion clusters found by the last checks, newest first.
+    """
+    return crud.get_collusion_clusters(session=session, skip=skip, limit=limit)
+
+
+@router.post(
+    "/collusion/check",
+    dependencies=[Depends(get_current_active_superuser)],
+    response_model=CollusionCheckPublic,
+)
+def run_collusion_check(session: SessionDep, full: bool = False) -> Any:
+    """
+    Re-check the endorsement components changed since the last check for
+    collusion clusters, or the whole graph with full=true.
+    """
+    return check_collusion(session=session, full=full)
+
+
+@router.get(
+    "/snapshot",
+    dependencies=[Depends(get_current_user)],
+    response_model=ReputationSnapshotPublic,
+)
+def read_snapshot() -> Any:
+    """
+    Get the version of the reputation snapshot this worker serves.
+    """
+    snapshot = snapshots.current()
+    if snapshot is None:
+        raise HTTPException(status_code=404, detail="No reputation snapshot yet")
+    return ReputationSnapshotPublic(
+        version=snapshot.version,
+        computed_at=snapshot.computed_at,
+        users=len(snapshot),
+    )
+
+
+@router.get(
+    "/snapshot/{user_id}",
+    dependencies=[Depends(get_current_user)],
+    response_model=SnapshotReputationPublic,
+)
+def read_snapshot_score(user_id: uuid.UUID) -> Any:
+    """
+    Get a user's score from the latest snapshot, without a database query.
+    """
+    snapshot = snapshots.current()
+    score = snapshot.lookup(user_id) if snapshot else None
+    if snapshot is None or score is None:
+        raise HTTPException(status_code=404, detail="User not in snapshot")
+    certified = snapshot.lookup(user_id, "certified")
+    return SnapshotReputationPublic(
+        user_id=user_id,
+        score=score,
+        computed_at=snapshot.computed_at,
+        certified=None if certified is None else bool(certified),
+    )
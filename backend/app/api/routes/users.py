@@ -1,29 +1,39 @@
 import uuid
-from typing import Any
+from typing import Any, Literal
 
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlmodel import col, delete, func, select
+from sqlmodel import col, delete, select
 
-from app import crud
+from app import crud, crud_async
 from app.api.deps import (
+    AsyncCurrentUser,
+    AsyncSessionDep,
     CurrentUser,
+    CursorDep,
     SessionDep,
     get_current_active_superuser,
+    get_current_user,
 )
 from app.core.config import settings
 from app.core.security import get_password_hash, verify_password
 from app.models import (
+    DecayedReputationPublic,
     Item,
     Message,
+    RatingSummaryPublic,
+    ReputationPublic,
     UpdatePassword,
     User,
     UserCreate,
     UserPublic,
     UserRegister,
+    UserReputationBatch,
+    UserReputationsPublic,
     UsersPublic,
     UserUpdate,
     UserUpdateMe,
 )
+from app.pagination import CountMode, count_rows, keyset, page
 from app.utils import generate_new_account_email, send_email
 
 router = APIRouter(prefix="/users", tags=["users"])
@@ -34,34 +44,69 @@ router = APIRouter(prefix="/users", tags=["users"])
     dependencies=[Depends(get_current_active_superuser)],
     response_model=UsersPublic,
 )
-def read_users(session: SessionDep, skip: int = 0, limit: int = 100) -> Any:
+def read_users(
+    session: SessionDep,
+    cursor: CursorDep,
+    skip: int = 0,
+    limit: int = 100,
+    order_by: Literal["endorsements_received", "confidence_received"] | None = Query(
+        None, description="Sort by this endorsement counter, highest first"
+    ),
+    count: CountMode = Query(
+        "exact", description="How to total the users: exact, estimate or none"
+    ),
+) -> Any:
     """
-    Retrieve users.
+    Retrieve users, newest first.
+    Page with the returned next_cursor (constant cost at any depth) or skip.
     """
 
-    count_statement = select(func.count()).select_from(User)
-    count = session.exec(count_statement).one()
+    total = count_rows(session, select(User), count)
 
-    statement = select(User).offset(skip).limit(limit)
-    users = session.exec(statement).all()
+    if order_by is not None:
+        if cursor is not None:
+            raise HTTPException(
+                status_code=400, detail="Cursor paging is by creation time only"
+            )
+        # Walks the (counter, id) index backwards
+        column = getattr(User, order_by)
+        statement = (
+            select(User)
+            .order_by(column.desc(), col(User.id).desc())
+            .offset(skip)
+            .limit(limit)
+        )
+        return UsersPublic(data=session.exec(statement).all(), count=total)
 
-    return UsersPublic(data=users, count=count)
+    statement = keyset(select(User), User, cursor).offset(skip).limit(limit + 1)
+    users, next_cursor = page(session.exec(statement).all(), limit)
 
+    return UsersPublic(data=users, count=total, next_cursor=next_cursor)
 
 
 @router.get("/search", response_model=UsersPublic)
-def search_users_endpoint(
-    session: SessionDep,
-    current_user: CurrentUser,
+async def search_users_endpoint(
+    session: AsyncSessionDep,
+    current_user: AsyncCurrentUser,
     query: str = Query(..., description="Search query for user email or full name"),
-    limit: int = Query(20, description="Maximum results to return"),
+    limit: int = Query(20, gt=0, le=100, description="Maximum results to return"),
+    mode: Literal["fuzzy", "prefix"] = Query(
+        "fuzzy",
+        description="fuzzy: ranked substring/typo match; prefix: fast autocomplete",
+    ),
+    boost: bool = Query(False, description="Rank reputable users higher (fuzzy)"),
 ) -> Any:
-    """Search users by email or full name. Authenticated users only."""
+    """Search users by email or full name, excluding the current user. Authenticated users only."""
     if not query or not query.strip():
         return UsersPublic(data=[], count=0)
-    results = crud.search_users(session=session, query=query, limit=limit)
-    # Exclude the current user from search results
-    results = [r for r in results if r.id != current_user.id]
+    results = await crud_async.search_users(
+        session=session,
+        query=query,
+        limit=limit,
+        exclude_id=current_user.id,
+        prefix=mode == "prefix",
+        reputation_boost=boost,
+    )
     return UsersPublic(data=results, count=len(results))
 
 
@@ -151,8 +196,7 @@ def delete_user_me(session: SessionDep, current_user: CurrentUser) -> Any:
         raise HTTPException(
             status_code=403, detail="Super users are not allowed to delete themselves"
         )
-    session.delete(current_user)
-    session.commit()
+    crud.delete_user(session=session, db_user=current_user)
     return Message(message="User deleted successfully")
 
 
@@ -190,6 +234,71 @@ def read_user_by_id(
     return user
 
 
+@router.get(
+    "/{user_id}/reputation",
+    dependencies=[Depends(get_current_user)],
+    response_model=ReputationPublic,
+)
+def read_user_reputation(user_id: uuid.UUID, session: SessionDep) -> Any:
+    """
+    Get the global reputation score of a user.
+    """
+    user = session.get(User, user_id)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    reputation = crud.get_reputation(session=session, user_id=user_id)
+    if not reputation:
+        # Not scored yet: the user joined after the last recompute
+        return ReputationPublic(user_id=user_id, score=0.0)
+    return reputation
+
+
+@router.get(
+    "/{user_id}/rating-summary",
+    dependencies=[Depends(get_current_user)],
+    response_model=RatingSummaryPublic,
+)
+def read_user_rating_summary(user_id: uuid.UUID, session: SessionDep) -> Any:
+    """
+    Get the aggregated ratings a user has received.
+    """
+    user = session.get(User, user_id)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    return crud.get_rating_summary(session=session, user_id=user_id)
+
+
+@router.post(
+    "/reputation:batch",
+    dependencies=[Depends(get_current_user)],
+    response_model=UserReputationsPublic,
+)
+def read_users_reputation_batch(
+    session: SessionDep, batch_in: UserReputationBatch
+) -> Any:
+    """
+    Get reputation, rating aggregates and endorsement counts for many users.
+    Unknown user ids are omitted from the response.
+    """
+    data = crud.get_reputation_batch(session=session, user_ids=batch_in.user_ids)
+    return UserReputationsPublic(data=data, count=len(data))
+
+
+@router.get(
+    "/{user_id}/decayed-reputation",
+    dependencies=[Depends(get_current_user)],
+    response_model=DecayedReputationPublic,
+)
+def read_user_decayed_reputation(user_id: uuid.UUID, session: SessionDep) -> Any:
+    """
+    Get a user's time-decayed rating and endorsement scores.
+    """
+    user = session.get(User, user_id)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    return crud.get_decayed_reputation(session=session, user_id=user_id)
+
+
 @router.patch(
     "/{user_id}",
     dependencies=[Depends(get_current_active_superuser)],
@@ -238,6 +347,5 @@ def delete_user(
         )
     statement = delete(Item).where(col(Item.owner_id) == user_id)
     session.exec(statement)  # type: ignore
-    session.delete(user)
-    session.commit()
+    crud.delete_user(session=session, db_user=user)
     return Message(message="User deleted successfully")
@@ -1,8 +1,12 @@
+from typing import Any
+
 from fastapi import APIRouter, Depends
 from pydantic.networks import EmailStr
 
 from app.api.deps import get_current_active_superuser
-from app.models import Message
+from app.core.config import settings
+from app.core.db import async_engine, direct_engine, engine
+from app.models import DatabasePoolPublic, DatabasePoolsPublic, Message
 from app.utils import generate_test_email, send_email
 
 router = APIRouter(prefix="/utils", tags=["utils"])
@@ -26,6 +30,27 @@ def test_email(email_to: EmailStr) -> Message:
     return Message(message="Test email sent")
 
 
+@router.get(
+    "/db-pool/",
+    dependencies=[Depends(get_current_active_superuser)],
+    response_model=DatabasePoolsPublic,
+)
+def read_db_pool() -> Any:
+    """
+    Connection pool saturation and checkout wait times of this worker process.
+    """
+    pools = {"sync": engine.pool, "async": async_engine.pool}
+    if direct_engine is not engine:
+        pools["direct"] = direct_engine.pool
+    return DatabasePoolsPublic(
+        data=[
+            DatabasePoolPublic(engine=name, **pool.stats())  # type: ignore[attr-defined]
+            for name, pool in pools.items()
+        ],
+        pgbouncer=settings.POSTGRES_PGBOUNCER,
+    )
+
+
 @router.get("/health-check/")
 async def health_check() -> bool:
     return True
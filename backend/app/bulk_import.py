@@ -0,0 +1,580 @@
+"""Bulk import of endorsements, interactions and ratings.
+
+Records are read from CSV (with a header row) or NDJSON and loaded
+``IMPORT_BATCH_ROWS`` at a time into a temporary staging table of text
+columns with ``COPY``. Each batch is then checked with a handful of
+set-based ``UPDATE``s, each marking the rows that fail one rule (bad
+format, out of range, unknown user or interaction, rule the CRUD layer
+enforces, duplicate within the batch), and the surviving rows are merged
+with one ``INSERT ... ON CONFLICT`` per batch. Records that cannot be read at
+all (malformed JSON, a line that is not an object, bytes that are not UTF-8)
+are staged already rejected, so they are reported like any other reject. Every batch commits on its
+own and is reported with its throughput. The staging tables outlive those
+commits, so imports run on ``direct_engine``, which bypasses PgBouncer.
+
+The aggregates the CRUD layer maintains row by row (rating summaries and
+decayed reputation) are rebuilt once at the end for every user the import
+touched, a single reputation recompute is queued and every API worker is
+told to reload its adjacency index.
+
+Run from the command line with::
+
+    python -m app.bulk_import endorsements endorsements.csv
+"""
+
+import argparse
+import csv
+import io
+import json
+import logging
+import sys
+import time
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from itertools import islice
+from typing import IO, Any
+
+from sqlalchemy import Connection, Engine, text
+from sqlmodel import Session
+
+from app.core.config import settings
+from app.core.db import direct_engine
+from app.models import BulkImportBatchPublic, BulkImportPublic, BulkImportRejectPublic
+from app.reputation import adjacency, counters, decay, worker
+
+logger = logging.getLogger(__name__)
+
+STAGING = "import_staging"
+TOUCHED = "import_touched"
+
+COLUMNS = {
+    "endorsements": (
+        "id",
+        "endorser_id",
+        "endorsed_id",
+        "confidence",
+        "created_at",
+        "updated_at",
+    ),
+    "interactions": (
+        "id",
+        "initiator_id",
+        "target_id",
+        "message",
+        "status",
+        "created_at",
+        "updated_at",
+    ),
+    "ratings": ("id", "interaction_id", "rater_id", "rating", "comment", "created_at"),
+}
+
+NOW = "(now() AT TIME ZONE 'utc')"
+
+
+def _valid(column: str, type_: str, *, required: bool = False) -> str:
+    if required:
+        return f"coalesce(pg_input_is_valid(s.{column}, '{type_}'), false)"
+    return f"(s.{column} IS NULL OR pg_input_is_valid(s.{column}, '{type_}'))"
+
+
+def _exists(table: str, condition: str) -> str:
+    return f'EXISTS (SELECT 1 FROM "{table}" t WHERE {condition})'
+
+
+# (reason, condition) per kind, applied in order to rows not yet rejected.
+# Format rules come first so the later ones can cast safely.
+RULES: dict[str, list[tuple[str, str]]] = {
+    "endorsements": [
+        ("invalid id", f"NOT {_valid('id', 'uuid')}"),
+        ("invalid endorser_id", f"NOT {_valid('endorser_id', 'uuid', required=True)}"),
+        ("invalid endorsed_id", f"NOT {_valid('endorsed_id', 'uuid', required=True)}"),
+        (
+            "invalid confidence",
+            f"NOT {_valid('confidence', 'double precision', required=True)}",
+        ),
+        ("invalid created_at", f"NOT {_valid('created_at', 'timestamp')}"),
+        ("invalid updated_at", f"NOT {_valid('updated_at', 'timestamp')}"),
+        ("confidence out of range", "s.confidence::float8 NOT BETWEEN 0 AND 1"),
+        ("cannot endorse yourself", "s.endorser_id::uuid = s.endorsed_id::uuid"),
+        (
+            "unknown endorser_id",
+            f"NOT {_exists('user', 't.id = s.endorser_id::uuid')}",
+        ),
+        (
+            "unknown endorsed_id",
+            f"NOT {_exists('user', 't.id = s.endorsed_id::uuid')}",
+        ),
+        (
+            "duplicate in batch",
+            _exists(
+                STAGING,
+                "t.reason IS NULL AND t.line > s.line"
+                " AND t.endorser_id::uuid = s.endorser_id::uuid"
+                " AND t.endorsed_id::uuid = s.endorsed_id::uuid",
+            ),
+        ),
+    ],
+    "interactions": [
+        ("invalid id", f"NOT {_valid('id', 'uuid')}"),
+        (
+            "invalid initiator_id",
+            f"NOT {_valid('initiator_id', 'uuid', required=True)}",
+        ),
+        ("invalid target_id", f"NOT {_valid('target_id', 'uuid', required=True)}"),
+        ("invalid created_at", f"NOT {_valid('created_at', 'timestamp')}"),
+        ("invalid updated_at", f"NOT {_valid('updated_at', 'timestamp')}"),
+        (
+            "invalid status",
+            "coalesce(s.status, 'pending') NOT IN ('pending', 'accepted', 'denied')",
+        ),
+        ("message too long", "length(s.message) > 1024"),
+        (
+            "cannot interact with yourself",
+            "s.initiator_id::uuid = s.target_id::uuid",
+        ),
+        (
+            "unknown initiator_id",
+            f"NOT {_exists('user', 't.id = s.initiator_id::uuid')}",
+        ),
+        ("unknown target_id", f"NOT {_exists('user', 't.id = s.target_id::uuid')}"),
+        (
+            "a pending interaction already exists",
+            "coalesce(s.status, 'pending') = 'pending' AND "
+            + _exists(
+                "interaction",
+                "t.initiator_id = s.initiator_id::uuid"
+                " AND t.target_id = s.target_id::uuid AND t.status = 'pending'"
+                " AND t.id IS DISTINCT FROM s.id::uuid",
+            ),
+        ),
+        (
+            "duplicate in batch",
+            "s.id IS NOT NULL AND "
+            + _exists(
+                STAGING,
+                "t.reason IS NULL AND t.line > s.line AND t.id::uuid = s.id::uuid",
+            ),
+        ),
+        (
+            # One pending interaction per pair, as in crud.create_interaction;
+            # the first one in the batch is kept
+            "a pending interaction already exists",
+            "coalesce(s.status, 'pending') = 'pending' AND "
+            + _exists(
+                STAGING,
+                "t.reason IS NULL AND t.line < s.line"
+                " AND coalesce(t.status, 'pending') = 'pending'"
+                " AND t.initiator_id::uuid = s.initiator_id::uuid"
+                " AND t.target_id::uuid = s.target_id::uuid",
+            ),
+        ),
+    ],
+    "ratings": [
+        ("invalid id", f"NOT {_valid('id', 'uuid')}"),
+        (
+            "invalid interaction_id",
+            f"NOT {_valid('interaction_id', 'uuid', required=True)}",
+        ),
+        ("invalid rater_id", f"NOT {_valid('rater_id', 'uuid', required=True)}"),
+        ("invalid rating", f"NOT {_valid('rating', 'integer', required=True)}"),
+        ("invalid created_at", f"NOT {_valid('created_at', 'timestamp')}"),
+        ("rating out of range", "s.rating::int NOT BETWEEN -5 AND 5"),
+        ("comment too long", "length(s.comment) > 1024"),
+        (
+            "interaction not found",
+            f"NOT {_exists('interaction', 't.id = s.interaction_id::uuid')}",
+        ),
+        (
+            "can only rate an accepted interaction",
+            _exists(
+                "interaction",
+                "t.id = s.interaction_id::uuid AND t.status <> 'accepted'",
+            ),
+        ),
+        (
+            "not authorized to rate this interaction",
+            _exists(
+                "interaction",
+                "t.id = s.interaction_id::uuid"
+                " AND s.rater_id::uuid NOT IN (t.initiator_id, t.target_id)",
+            ),
+        ),
+        (
+            "user has already rated this interaction",
+            _exists(
+                "rating",
+                "t.interaction_id = s.interaction_id::uuid"
+                " AND t.rater_id = s.rater_id::uuid"
+                " AND t.id IS DISTINCT FROM s.id::uuid",
+            ),
+        ),
+        (
+            "duplicate in batch",
+            _exists(
+                STAGING,
+                "t.reason IS NULL AND t.line > s.line"
+                " AND t.interaction_id::uuid = s.interaction_id::uuid"
+                " AND t.rater_id::uuid = s.rater_id::uuid",
+            ),
+        ),
+    ],
+}
+
+# Merge of the accepted rows, recording whose aggregates must be rebuilt.
+# Rows go in key order so index inserts touch neighbouring pages.
+MERGE = {
+    "endorsements": f"""
+        WITH merged AS (
+            INSERT INTO endorsement
+                (id, endorser_id, endorsed_id, confidence, created_at, updated_at)
+            SELECT
+                coalesce(id::uuid, gen_random_uuid()),
+                endorser_id::uuid,
+                endorsed_id::uuid,
+                confidence::float8,
+                coalesce(created_at::timestamp, {NOW}),
+                coalesce(updated_at::timestamp, created_at::timestamp, {NOW})
+            FROM {STAGING} WHERE reason IS NULL
+            ORDER BY 2, 3
+            ON CONFLICT (endorser_id, endorsed_id) DO UPDATE SET
+                confidence = excluded.confidence,
+                updated_at = excluded.updated_at
+            RETURNING endorser_id, endorsed_id
+        )
+        INSERT INTO {TOUCHED}
+        SELECT endorsed_id FROM merged UNION SELECT endorser_id FROM merged
+        ON CONFLICT DO NOTHING
+    """,
+    "interactions": f"""
+        INSERT INTO interaction
+            (id, initiator_id, target_id, message, status, created_at, updated_at)
+        SELECT
+            coalesce(id::uuid, gen_random_uuid()),
+            initiator_id::uuid,
+            target_id::uuid,
+            message,
+            coalesce(status, 'pending'),
+            coalesce(created_at::timestamp, {NOW}),
+            coalesce(updated_at::timestamp, created_at::timestamp, {NOW})
+        FROM {STAGING} WHERE reason IS NULL
+        -- status only moves through crud.respond_interaction
+        ON CONFLICT (id) DO UPDATE SET
+            message = excluded.message,
+            updated_at = excluded.updated_at
+    """,
+    "ratings": f"""
+        WITH merged AS (
+            INSERT INTO rating
+                (id, interaction_id, rater_id, rating, comment, created_at)
+            SELECT
+                coalesce(id::uuid, gen_random_uuid()),
+                interaction_id::uuid,
+                rater_id::uuid,
+                rating::int,
+                comment,
+                coalesce(created_at::timestamp, {NOW})
+            FROM {STAGING} WHERE reason IS NULL
+            ORDER BY 2, 3
+            ON CONFLICT (id) DO UPDATE SET
+                rating = excluded.rating,
+                comment = excluded.comment
+            RETURNING interaction_id, rater_id
+        )
+        INSERT INTO {TOUCHED}
+        SELECT DISTINCT CASE WHEN m.rater_id = i.initiator_id
+            THEN i.target_id ELSE i.initiator_id END
+        FROM merged m JOIN interaction i ON i.id = m.interaction_id
+        ON CONFLICT DO NOTHING
+    """,
+}
+
+
+@dataclass
+class Unreadable:
+    """A record that could not be parsed, with the reason it is rejected."""
+
+    reason: str
+
+
+def _is_utf8(value: str) -> bool:
+    # Streams are decoded with errors="surrogateescape", which turns invalid
+    # bytes into lone surrogates that cannot be encoded back
+    try:
+        value.encode("utf-8")
+    except UnicodeEncodeError:
+        return False
+    return True
+
+
+def read_records(stream: IO[str], format: str) -> Iterator[dict[str, Any] | Unreadable]:
+    """Records of a CSV or NDJSON stream, one item per input record."""
+    if format == "csv":
+        reader = csv.DictReader(stream)
+        while True:
+            try:
+                row = next(reader)
+            except StopIteration:
+                return
+            except csv.Error as error:
+                yield Unreadable(f"invalid CSV: {error}")
+                continue
+            values = [v for v in row.values() if isinstance(v, str)]
+            if all(_is_utf8(v) for v in values):
+                yield row
+            else:
+                yield Unreadable("invalid UTF-8")
+        return
+    for line in stream:
+        if not line.strip():
+            continue
+        if not _is_utf8(line):
+            yield Unreadable("invalid UTF-8")
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            yield Unreadable("invalid JSON")
+            continue
+        if isinstance(record, dict):
+            yield record
+        else:
+            yield Unreadable("record is not an object")
+
+
+def open_records(stream: IO[bytes]) -> IO[str]:
+    """Text view of an upload or file that leaves invalid UTF-8 for
+    :func:`read_records` to reject record by record."""
+    return io.TextIOWrapper(
+        stream, encoding="utf-8", errors="surrogateescape", newline=""
+    )
+
+
+def _text(value: Any) -> str | None:
+    if value is None or value == "":
+        return None
+    return str(value)
+
+
+def _prepare(connection: Connection, kind: str) -> None:
+    columns = ", ".join(f"{name} text" for name in COLUMNS[kind])
+    connection.execute(text(f"DROP TABLE IF EXISTS {STAGING}, {TOUCHED}"))
+    connection.execute(
+        text(f"CREATE TEMP TABLE {STAGING} (line bigint, {columns}, reason text)")
+    )
+    connection.execute(text(f"CREATE TEMP TABLE {TOUCHED} (user_id uuid PRIMARY KEY)"))
+    connection.commit()
+
+
+def _row(
+    line: int, record: dict[str, Any] | Unreadable, columns: tuple[str, ...]
+) -> tuple[Any, ...]:
+    if isinstance(record, Unreadable):
+        return (line, *(None for _ in columns), record.reason)
+    return (line, *(_text(record.get(name)) for name in columns), None)
+
+
+def _copy(connection: Connection, kind: str, batch: list[tuple[Any, ...]]) -> None:
+    raw = connection.connection.driver_connection
+    assert raw is not None
+    columns = ", ".join(("line", *COLUMNS[kind], "reason"))
+    with raw.cursor() as cursor:
+        with cursor.copy(f"COPY {STAGING} ({columns}) FROM STDIN") as copy:
+            for row in batch:
+                copy.write_row(row)
+
+
+def import_batch(
+    connection: Connection, kind: str, batch: list[tuple[Any, ...]]
+) -> tuple[int, list[BulkImportRejectPublic]]:
+    """Stage, validate and merge one batch; returns (imported, rejects)."""
+    connection.execute(text(f"TRUNCATE {STAGING}"))
+    _copy(connection, kind, batch)
+    connection.execute(text(f"ANALYZE {STAGING}"))
+    for reason, condition in RULES[kind]:
+        connection.execute(
+            text(
+                f"UPDATE {STAGING} s SET reason = :reason"
+                f" WHERE s.reason IS NULL AND ({condition})"
+            ),
+            {"reason": reason},
+        )
+    rejects = [
+        BulkImportRejectPublic(line=line, reason=reason)
+        for line, reason in connection.execute(
+            text(
+                f"SELECT line, reason FROM {STAGING}"
+                " WHERE reason IS NOT NULL ORDER BY line"
+            )
+        )
+    ]
+    connection.execute(text(MERGE[kind]))
+    connection.commit()
+    return len(batch) - len(rejects), rejects
+
+
+def rebuild_aggregates(connection: Connection) -> None:
+    """Recompute rating summaries, decayed sums and endorsement counters of
+    the touched users from the underlying rows, as the migrations that
+    introduced them did."""
+    histogram = ", ".join(
+        f"count(*) FILTER (WHERE rated.rating = {value})" for value in range(-5, 6)
+    )
+    rated = """
+        SELECT
+            CASE WHEN r.rater_id = i.initiator_id
+                THEN i.target_id ELSE i.initiator_id END AS user_id,
+            r.rating,
+            r.created_at
+        FROM rating r
+        JOIN interaction i ON i.id = r.interaction_id
+    """
+    connection.execute(
+        text(
+            f"DELETE FROM ratingsummary WHERE user_id IN (SELECT user_id FROM {TOUCHED})"
+        )
+    )
+    connection.execute(
+        text(
+            f"""
+            INSERT INTO ratingsummary
+                (user_id, count, total, sum_squares, bayesian_mean, histogram,
+                 updated_at)
+            SELECT
+                rated.user_id,
+                count(*),
+                sum(rated.rating),
+                sum(rated.rating * rated.rating),
+                (:prior_weight * :prior_mean + sum(rated.rating))
+                    / (:prior_weight + count(*)),
+                ARRAY[{histogram}],
+                {NOW}
+            FROM ({rated}) AS rated
+            WHERE rated.user_id IN (SELECT user_id FROM {TOUCHED})
+            GROUP BY rated.user_id
+            """
+        ),
+        {
+            "prior_weight": settings.RATING_PRIOR_WEIGHT,
+            "prior_mean": settings.RATING_PRIOR_MEAN,
+        },
+    )
+    connection.execute(
+        text(
+            f"DELETE FROM decayedreputation"
+            f" WHERE user_id IN (SELECT user_id FROM {TOUCHED})"
+        )
+    )
+    connection.execute(
+        text(
+            f"""
+            INSERT INTO decayedreputation
+                (user_id, landmark, rating_sum, rating_weight,
+                 endorsement_sum, endorsement_weight)
+            SELECT
+                events.user_id,
+                {NOW},
+                coalesce(sum(events.rating * w.weight), 0),
+                coalesce(sum(w.weight) FILTER (WHERE events.rating IS NOT NULL), 0),
+                coalesce(sum(events.confidence * w.weight), 0),
+                coalesce(sum(w.weight) FILTER (WHERE events.confidence IS NOT NULL), 0)
+            FROM (
+                SELECT user_id, rating, NULL::float AS confidence, created_at AS at
+                FROM ({rated}) AS rated
+                UNION ALL
+                SELECT endorsed_id, NULL, confidence, updated_at FROM endorsement
+            ) AS events,
+            LATERAL (
+                SELECT exp(-:rate * extract(epoch FROM {NOW} - events.at)) AS weight
+            ) AS w
+            WHERE events.user_id IN (SELECT user_id FROM {TOUCHED})
+            GROUP BY events.user_id
+            """
+        ),
+        {"rate": decay.decay_rate()},
+    )
+    counters.reconcile_counters(connection, scope=f"SELECT user_id FROM {TOUCHED}")
+    connection.commit()
+
+
+def run_import(
+    db_engine: Engine,
+    kind: str,
+    records: Iterable[dict[str, Any] | Unreadable],
+    *,
+    batch_size: int | None = None,
+) -> BulkImportPublic:
+    batch_size = batch_size or settings.IMPORT_BATCH_ROWS
+    columns = COLUMNS[kind]
+    numbered = (
+        _row(line, record, columns) for line, record in enumerate(records, start=1)
+    )
+    report = BulkImportPublic(kind=kind)
+    started = time.perf_counter()
+    with db_engine.connect() as connection:
+        _prepare(connection, kind)
+        try:
+            while batch := list(islice(numbered, batch_size)):
+                batch_started = time.perf_counter()
+                imported, rejects = import_batch(connection, kind, batch)
+                seconds = time.perf_counter() - batch_started
+                result = BulkImportBatchPublic(
+                    batch=len(report.batches) + 1,
+                    rows=len(batch),
+                    imported=imported,
+                    rejected=len(rejects),
+                    seconds=seconds,
+                    rows_per_second=len(batch) / seconds if seconds else 0.0,
+                )
+                logger.info(
+                    "Imported %s batch %d: %d rows, %d rejected, %.0f rows/s",
+                    kind,
+                    result.batch,
+                    result.rows,
+                    result.rejected,
+                    result.rows_per_second,
+                )
+                report.batches.append(result)
+                report.rows += result.rows
+                report.imported += result.imported
+                report.rejected += result.rejected
+                room = settings.IMPORT_MAX_REJECTS_REPORTED - len(report.rejects)
+                report.rejects.extend(rejects[: max(room, 0)])
+            rebuild_aggregates(connection)
+        finally:
+            connection.rollback()
+            connection.execute(text(f"DROP TABLE IF EXISTS {STAGING}, {TOUCHED}"))
+            connection.commit()
+
+    if report.imported and kind != "interactions":
+        with Session(db_engine) as session:
+            worker.signal_dirty(session=session, reason=f"import:{kind}")
+            if kind == "endorsements":
+                adjacency.notify_reload(session=session)
+            session.commit()
+    report.seconds = time.perf_counter() - started
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("kind", choices=sorted(COLUMNS))
+    parser.add_argument("path", help="CSV or NDJSON file, - for stdin")
+    parser.add_argument("--format", choices=["csv", "ndjson"])
+    parser.add_argument("--batch-size", type=int)
+    args = parser.parse_args()
+
+    format = args.format or ("csv" if args.path.endswith(".csv") else "ndjson")
+    logging.basicConfig(level=logging.INFO)
+    binary = sys.stdin.buffer if args.path == "-" else open(args.path, "rb")
+    with open_records(binary) as stream:
+        report = run_import(
+            direct_engine,
+            args.kind,
+            read_records(stream, format),
+            batch_size=args.batch_size,
+        )
+    sys.stdout.write(report.model_dump_json(indent=2) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -55,6 +55,25 @@ class Settings(BaseSettings):
     POSTGRES_USER: str
     POSTGRES_PASSWORD: str = ""
     POSTGRES_DB: str = ""
+    # Connection pool of each engine (sync and async) in every worker process,
+    # so a deployment opens up to workers * 2 * (size + overflow) connections
+    POSTGRES_POOL_SIZE: int = 5
+    POSTGRES_MAX_OVERFLOW: int = 10
+    # Seconds a checkout waits for a free connection before failing
+    POSTGRES_POOL_TIMEOUT_SECONDS: float = 30.0
+    # Reopen connections older than this; -1 keeps them forever
+    POSTGRES_POOL_RECYCLE_SECONDS: int = 1800
+    # Test each connection on checkout and reconnect if it was dropped
+    POSTGRES_POOL_PRE_PING: bool = True
+    # Cancel statements running longer than this; 0 disables the limit
+    POSTGRES_STATEMENT_TIMEOUT_MS: int = 0
+    # Connect through PgBouncer in transaction pooling mode: no prepared
+    # statements, and the statement timeout is set per transaction
+    POSTGRES_PGBOUNCER: bool = False
+    # Direct server for session state PgBouncer cannot carry (the endorsement
+    # index LISTEN connection); defaults to POSTGRES_SERVER / POSTGRES_PORT
+    POSTGRES_DIRECT_SERVER: str | None = None
+    POSTGRES_DIRECT_PORT: int | None = None
 
     @computed_field  # type: ignore[prop-decorator]
     @property
@@ -68,6 +87,18 @@ class Settings(BaseSettings):
             path=self.POSTGRES_DB,
         )
 
+    @computed_field  # type: ignore[prop-decorator]
+    @property
+    def SQLALCHEMY_DIRECT_DATABASE_URI(self) -> PostgresDsn:
+        return PostgresDsn.build(
+            scheme="postgresql+psycopg",
+            username=self.POSTGRES_USER,
+            password=self.POSTGRES_PASSWORD,
+            host=self.POSTGRES_DIRECT_SERVER or self.POSTGRES_SERVER,
+            port=self.POSTGRES_DIRECT_PORT or self.POSTGRES_PORT,
+            path=self.POSTGRES_DB,
+        )
+
     SMTP_TLS: bool = True
     SMTP_SSL: bool = False
     SMTP_PORT: int = 587
@@ -90,6 +121,74 @@ class Settings(BaseSettings):
     def emails_enabled(self) -> bool:
         return bool(self.SMTP_HOST and self.EMAILS_FROM_EMAIL)
 
+    # Global reputation: EigenTrust/PageRank-style power iteration over endorsements
+    REPUTATION_DAMPING_FACTOR: float = 0.85
+    REPUTATION_TOLERANCE: float = 1e-8
+    REPUTATION_MAX_ITERATIONS: int = 100
+    # Endorsement rows fetched per server-side cursor round trip by graph loads
+    REPUTATION_LOAD_CHUNK_ROWS: int = 50_000
+    # Incremental push updates applied on each endorsement write
+    REPUTATION_INCREMENTAL: bool = True
+    REPUTATION_INCREMENTAL_TOLERANCE: float = 1e-3
+    REPUTATION_INCREMENTAL_PUSH_BUDGET: int = 1000
+    # Debounced recompute: writes queue a signal, one recompute runs per window
+    REPUTATION_RECOMPUTE_WINDOW_SECONDS: float = 30.0
+    REPUTATION_WORKER_POLL_SECONDS: float = 5.0
+    # Run the worker as an asyncio task in each API process instead of standalone
+    REPUTATION_WORKER_IN_PROCESS: bool = False
+    # Memory-mapped score snapshots shared by all workers on a host
+    REPUTATION_SNAPSHOT_DIR: str = "/tmp/repulink/reputation"
+    REPUTATION_SNAPSHOT_KEEP: int = 3
+    # Advogato-style trust flow from seed users (FIRST_SUPERUSER when empty)
+    TRUST_FLOW_ENABLED: bool = False
+    TRUST_FLOW_SEEDS: list[EmailStr] = []
+    TRUST_FLOW_CAPACITIES: list[int] = [800, 200, 200, 50, 12, 4, 2, 1]
+    TRUST_FLOW_MIN_CONFIDENCE: float = 0.5
+    # Half-life of the time-decayed rating and endorsement scores
+    REPUTATION_HALF_LIFE_DAYS: float = 90.0
+    # Personalized trust (forward push): residual threshold and hard time budget
+    PERSONALIZED_TRUST_EPSILON: float = 1e-4
+    PERSONALIZED_TRUST_TIME_BUDGET_MS: int = 50
+
+    # In-process CSR index of endorsements, loaded at startup in every worker
+    ENDORSEMENT_INDEX_ENABLED: bool = True
+    # Overlay size (edges) at which pending writes are folded into the CSR arrays
+    ENDORSEMENT_INDEX_COMPACT_EDGES: int = 100_000
+    ENDORSEMENT_INDEX_RECONNECT_SECONDS: float = 5.0
+    # Upper bound on edges returned by the endorsement neighborhood walk
+    ENDORSEMENT_NEIGHBORHOOD_MAX_EDGES: int = 10000
+    # Strongest trust path: hop cap and hard time budget of the search
+    TRUST_PATH_MAX_DEPTH: int = 6
+    TRUST_PATH_TIME_BUDGET_MS: int = 200
+    # Collusion detection over endorsements of at least this confidence
+    COLLUSION_MIN_CONFIDENCE: float = 0.7
+    COLLUSION_MIN_SIZE: int = 3
+    COLLUSION_MAX_SIZE: int = 50
+    # Rings: share of the members' incoming weight that comes from each other
+    COLLUSION_MIN_INTERNAL_SHARE: float = 0.8
+    # Reciprocal clusters: mutual partners per member and share of mutual pairs
+    COLLUSION_MIN_RECIPROCAL: int = 2
+    COLLUSION_MIN_DENSITY: float = 0.5
+
+    # Bonus added to the search similarity of the top-ranked user, shrinking
+    # with the log of the rank, when search results are boosted by reputation
+    USER_SEARCH_REPUTATION_WEIGHT: float = 0.2
+
+    # List totals with count=estimate: planner estimates are cached this long,
+    # and results estimated below the threshold are counted exactly instead
+    COUNT_ESTIMATE_TTL_SECONDS: float = 60.0
+    COUNT_ESTIMATE_EXACT_BELOW: int = 10_000
+
+    # Rows fetched per server-side cursor round trip by the streaming export
+    EXPORT_CHUNK_ROWS: int = 5000
+    # Bulk import: rows staged, validated and merged per transaction
+    IMPORT_BATCH_ROWS: int = 50_000
+    IMPORT_MAX_REJECTS_REPORTED: int = 1000
+
+    # Bayesian mean of ratings: shrink towards PRIOR_MEAN by PRIOR_WEIGHT ratings
+    RATING_PRIOR_MEAN: float = 0.0
+    RATING_PRIOR_WEIGHT: float = 5.0
+
     EMAIL_TEST_USER: EmailStr = "test@example.com"
     FIRST_SUPERUSER: EmailStr
     FIRST_SUPERUSER_PASSWORD: str
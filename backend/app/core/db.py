@@ -1,10 +1,77 @@
+from typing import Any
+
+from sqlalchemy import Connection, Engine, event
+from sqlalchemy.ext.asyncio import create_async_engine
 from sqlmodel import Session, create_engine, select
 
 from app import crud
 from app.core.config import settings
+from app.core.pool import InstrumentedAsyncQueuePool, InstrumentedQueuePool
 from app.models import User, UserCreate
 
-engine = create_engine(str(settings.SQLALCHEMY_DATABASE_URI))
+
+def engine_options(*, direct: bool = False) -> dict[str, Any]:
+    """Pool and connection options shared by the sync and async engines.
+
+    ``direct`` is for connections to the server itself, never PgBouncer.
+    """
+    connect_args: dict[str, Any] = {}
+    if settings.POSTGRES_PGBOUNCER and not direct:
+        # Transaction pooling runs each transaction on whichever server
+        # connection is free, where statements prepared earlier do not exist
+        connect_args["prepare_threshold"] = None
+    elif settings.POSTGRES_STATEMENT_TIMEOUT_MS:
+        connect_args["options"] = (
+            f"-c statement_timeout={settings.POSTGRES_STATEMENT_TIMEOUT_MS}"
+        )
+    return {
+        "pool_size": settings.POSTGRES_POOL_SIZE,
+        "max_overflow": settings.POSTGRES_MAX_OVERFLOW,
+        "pool_timeout": settings.POSTGRES_POOL_TIMEOUT_SECONDS,
+        "pool_recycle": settings.POSTGRES_POOL_RECYCLE_SECONDS,
+        "pool_pre_ping": settings.POSTGRES_POOL_PRE_PING,
+        "connect_args": connect_args,
+    }
+
+
+def _set_local_statement_timeout(db_engine: Engine) -> None:
+    """Behind PgBouncer session settings would leak to other clients (and
+    startup options are refused), so every transaction sets its own."""
+
+    @event.listens_for(db_engine, "begin")
+    def begin(connection: Connection) -> None:
+        connection.exec_driver_sql(
+            "SET LOCAL statement_timeout = "
+            f"{int(settings.POSTGRES_STATEMENT_TIMEOUT_MS)}"
+        )
+
+
+engine = create_engine(
+    str(settings.SQLALCHEMY_DATABASE_URI),
+    poolclass=InstrumentedQueuePool,
+    **engine_options(),
+)
+# Same database through psycopg's async driver, for async routes
+async_engine = create_async_engine(
+    str(settings.SQLALCHEMY_DATABASE_URI),
+    poolclass=InstrumentedAsyncQueuePool,
+    **engine_options(),
+)
+if settings.POSTGRES_PGBOUNCER and settings.POSTGRES_STATEMENT_TIMEOUT_MS:
+    _set_local_statement_timeout(engine)
+    _set_local_statement_timeout(async_engine.sync_engine)
+# For session state that must stay on one server connection across
+# transactions (advisory locks, TEMP tables): behind PgBouncer it goes to
+# POSTGRES_DIRECT_SERVER, otherwise it is the main engine
+direct_engine = (
+    create_engine(
+        str(settings.SQLALCHEMY_DIRECT_DATABASE_URI),
+        poolclass=InstrumentedQueuePool,
+        **engine_options(direct=True),
+    )
+    if settings.POSTGRES_PGBOUNCER
+    else engine
+)
 
 
 # make sure all SQLModel models are imported (app.models) before initializing DB
@@ -0,0 +1,113 @@
+"""Connection pools that time every checkout.
+
+``InstrumentedQueuePool`` and ``InstrumentedAsyncQueuePool`` behave as
+SQLAlchemy's queue pools and keep a ``PoolMetrics`` of how long each checkout
+waited (including opening a new connection), how many gave up after
+``pool_timeout`` and how many connections were out at once, which
+``GET /utils/db-pool/`` reports next to the current saturation.
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Any
+
+import numpy as np
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, PoolProxiedConnection, QueuePool
+
+# Checkout waits kept for the percentiles
+RECENT_WAITS = 1000
+
+
+class PoolMetrics:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.peak_checked_out = 0
+        self.recent: deque[float] = deque(maxlen=RECENT_WAITS)
+
+    def record(self, wait: float, checked_out: int) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.wait_total += wait
+            self.wait_max = max(self.wait_max, wait)
+            self.peak_checked_out = max(self.peak_checked_out, checked_out)
+            self.recent.append(wait)
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    def summary(self) -> dict[str, Any]:
+        with self._lock:
+            recent = np.asarray(self.recent) * 1000
+            checkouts, wait_total = self.checkouts, self.wait_total
+            summary = {
+                "checkouts": checkouts,
+                "timeouts": self.timeouts,
+                "peak_checked_out": self.peak_checked_out,
+                "wait_max_ms": self.wait_max * 1000,
+            }
+        p50, p95, p99 = (
+            np.percentile(recent, [50, 95, 99]) if recent.size else (0, 0, 0)
+        )
+        summary.update(
+            wait_mean_ms=wait_total / checkouts * 1000 if checkouts else 0.0,
+            wait_p50_ms=float(p50),
+            wait_p95_ms=float(p95),
+            wait_p99_ms=float(p99),
+        )
+        return summary
+
+
+class _Instrumented:
+    metrics: PoolMetrics
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def connect(self) -> PoolProxiedConnection:
+        started = time.perf_counter()
+        try:
+            connection = super().connect()  # type: ignore[misc]
+        except exc.TimeoutError:
+            self.metrics.record_timeout()
+            raise
+        self.metrics.record(time.perf_counter() - started, self.checkedout())  # type: ignore[attr-defined]
+        return connection
+
+    def recreate(self) -> Any:
+        # Engine.dispose() swaps in a new pool; keep counting across it
+        pool = super().recreate()  # type: ignore[misc]
+        pool.metrics = self.metrics
+        return pool
+
+    def stats(self) -> dict[str, Any]:
+        """Current occupancy and checkout metrics of the pool."""
+        size = self.size()  # type: ignore[attr-defined]
+        max_overflow = self._max_overflow  # type: ignore[attr-defined]
+        checked_out = self.checkedout()  # type: ignore[attr-defined]
+        return {
+            "size": size,
+            "max_overflow": max_overflow,
+            "checked_out": checked_out,
+            "idle": self.checkedin(),  # type: ignore[attr-defined]
+            # Share of the connections the pool may open; None if unbounded
+            "saturation": (
+                checked_out / (size + max_overflow) if max_overflow >= 0 else None
+            ),
+            **self.metrics.summary(),
+        }
+
+
+class InstrumentedQueuePool(_Instrumented, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_Instrumented, AsyncAdaptedQueuePool):
+    pass
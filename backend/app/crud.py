@@ -4,15 +4,20 @@ from typing import Any
 from sqlmodel import Session, select
 from sqlalchemy import or_
 
+from app.core.config import settings
 from app.core.security import get_password_hash, verify_password
 from app.models import Item, ItemCreate, User, UserCreate, UserUpdate
 
 
 def create_user(*, session: Session, user_create: UserCreate) -> User:
+    from app.reputation import worker
+
     db_obj = User.model_validate(
         user_create, update={"hashed_password": get_password_hash(user_create.password)}
     )
     session.add(db_obj)
+    # A new user changes everyone's teleport share, beyond incremental updates
+    worker.signal_dirty(session=session, reason="user")
     session.commit()
     session.refresh(db_obj)
     return db_obj
@@ -32,19 +37,106 @@ def update_user(*, session: Session, db_user: User, user_in: UserUpdate) -> Any:
     return db_user
 
 
+def delete_user(*, session: Session, db_user: User) -> None:
+    from app.reputation import adjacency, counters, worker
+
+    # The user's endorsements go with it (ON DELETE CASCADE)
+    counters.release_counters(session=session, user_id=db_user.id)
+    adjacency.notify_user_deleted(session=session, user_id=db_user.id)
+    worker.signal_dirty(session=session, reason="user")
+    session.delete(db_user)
+    session.commit()
+    adjacency.adjacency.remove_user(db_user.id)
+
+
 def get_user_by_email(*, session: Session, email: str) -> User | None:
     statement = select(User).where(User.email == email)
     session_user = session.exec(statement).first()
     return session_user
 
 
-def search_users(*, session: Session, query: str, limit: int = 10) -> list[User]:
-    """Search users by email or full_name (case-insensitive)."""
+def search_users(
+    *,
+    session: Session,
+    query: str,
+    limit: int = 10,
+    exclude_id: uuid.UUID | None = None,
+    prefix: bool = False,
+    reputation_boost: bool = False,
+) -> list[User]:
+    """Search users by email or full_name (case-insensitive).
+
+    By default substrings and misspellings match through the trigram index
+    on ``search_text`` and results are ranked by word similarity, plus up to
+    ``USER_SEARCH_REPUTATION_WEIGHT`` for highly ranked users with
+    ``reputation_boost``. ``prefix`` is the autocomplete mode: names and
+    emails starting with ``query`` in alphabetical order, each read off a
+    ``COLLATE "C"`` btree index so only about ``limit`` rows are touched.
+    """
+    statement = search_users_statement(
+        query=query,
+        limit=limit,
+        exclude_id=exclude_id,
+        prefix=prefix,
+        reputation_boost=reputation_boost,
+    )
+    return session.exec(statement).all()
+
+
+def search_users_statement(
+    *,
+    query: str,
+    limit: int = 10,
+    exclude_id: uuid.UUID | None = None,
+    prefix: bool = False,
+    reputation_boost: bool = False,
+) -> Any:
+    """The statement ``search_users`` runs."""
+    import sqlalchemy as sa
+
+    from app.models import Reputation
+
+    term = query.strip().lower()
+    escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    # Patterns are inlined so the planner can match them to the indexes
+    if prefix:
+        pattern = sa.bindparam("pattern", f"{escaped}%", literal_execute=True)
+        branches = []
+        for column in (User.full_name, User.email):
+            key = sa.func.lower(column).collate("C")
+            branch = select(User.id, key.label("key")).where(key.like(pattern))
+            if exclude_id is not None:
+                branch = branch.where(User.id != exclude_id)
+            branches.append(branch.order_by(key).limit(limit))
+        matches = sa.union_all(*branches).subquery()
+        best = (
+            select(matches.c.id, sa.func.min(matches.c.key).label("key"))
+            .group_by(matches.c.id)
+            .subquery()
+        )
+        return (
+            select(User)
+            .join(best, best.c.id == User.id)
+            .order_by(best.c.key, User.id)
+            .limit(limit)
+        )
+
+    search_text = User.__table__.c.search_text
+    needle = sa.bindparam("needle", term, literal_execute=True)
+    pattern = sa.bindparam("pattern", f"%{escaped}%", literal_execute=True)
+    rank = sa.func.word_similarity(needle, search_text)
     statement = select(User).where(
-        or_(User.email.ilike(f"%{query}%"), User.full_name.ilike(f"%{query}%"))
-    ).limit(limit)
-    results = session.exec(statement).all()
-    return results
+        or_(search_text.like(pattern), needle.op("<%")(search_text))
+    )
+    if exclude_id is not None:
+        statement = statement.where(User.id != exclude_id)
+    if reputation_boost:
+        statement = statement.outerjoin(Reputation, Reputation.user_id == User.id)
+        rank = rank + sa.func.coalesce(
+            settings.USER_SEARCH_REPUTATION_WEIGHT / (1 + sa.func.ln(Reputation.rank)),
+            0,
+        )
+    return statement.order_by(rank.desc(), User.id).limit(limit)
 
 
 def authenticate(*, session: Session, email: str, password: str) -> User | None:
@@ -111,25 +203,66 @@ def respond_interaction(
 
 
 def get_user_interactions(
-    *, session: Session, user_id: uuid.UUID, role: str | None = None, skip: int = 0, limit: int = 100
+    *,
+    session: Session,
+    user_id: uuid.UUID,
+    role: str | None = None,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: "Cursor | None" = None,
 ) -> list["Interaction"]:
+    """Interactions of a user, newest first, after ``cursor`` if given.
+
+    Each side is a range scan of its ``(side, created_at, id)`` index cut at
+    ``skip + limit`` rows; without a role the two sides are merged, so a
+    cursor page costs the same at any depth.
+    """
+    statement = user_interactions_statement(
+        user_id=user_id, role=role, skip=skip, limit=limit, cursor=cursor
+    )
+    results = session.exec(statement).all()
+    return results
+
+
+def user_interactions_statement(
+    *,
+    user_id: uuid.UUID,
+    role: str | None = None,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: "Cursor | None" = None,
+) -> Any:
+    """The statement ``get_user_interactions`` runs."""
+    from sqlalchemy import union_all
+    from sqlalchemy.orm import aliased
+
     from app.models import Interaction
-    from sqlmodel import select
+    from app.pagination import keyset
 
-    statement = select(Interaction)
     if role == "initiator":
-        statement = statement.where(Interaction.initiator_id == user_id)
+        sides = [Interaction.initiator_id]
     elif role == "target":
-        statement = statement.where(Interaction.target_id == user_id)
+        sides = [Interaction.target_id]
     else:
-        statement = statement.where((Interaction.initiator_id == user_id) | (Interaction.target_id == user_id))
-    statement = statement.offset(skip).limit(limit)
-    results = session.exec(statement).all()
-    return results
+        sides = [Interaction.initiator_id, Interaction.target_id]
+    branches = [
+        keyset(select(Interaction).where(side == user_id), Interaction, cursor)
+        for side in sides
+    ]
+    if len(branches) == 1:
+        statement = branches[0]
+    else:
+        merged = union_all(*(b.limit(skip + limit) for b in branches)).subquery()
+        interaction = aliased(Interaction, merged)
+        statement = select(interaction).order_by(
+            merged.c.created_at.desc(), merged.c.id.desc()
+        )
+    return statement.offset(skip).limit(limit)
 
 
 def add_rating(*, session: Session, interaction_id: uuid.UUID, rater_id: uuid.UUID, rating: int, comment: str | None = None) -> "Rating":
     from app.models import Interaction, Rating, RatingCreate
+    from app.reputation import decay, worker
     from sqlmodel import select
 
     interaction = session.get(Interaction, interaction_id)
@@ -152,11 +285,83 @@ def add_rating(*, session: Session, interaction_id: uuid.UUID, rater_id: uuid.UU
     rating_in = RatingCreate.model_validate({"rating": rating, "comment": comment})
     db_obj = Rating.model_validate(rating_in, update={"interaction_id": interaction_id, "rater_id": rater_id})
     session.add(db_obj)
+    rated_id = (
+        interaction.target_id if rater_id == interaction.initiator_id else interaction.initiator_id
+    )
+    update_rating_summary(session=session, user_id=rated_id, rating=rating)
+    decay.record_rating(
+        session=session, user_id=rated_id, rating=rating, at=db_obj.created_at
+    )
+    worker.signal_dirty(session=session, reason="rating")
     session.commit()
     session.refresh(db_obj)
     return db_obj
 
 
+def bayesian_mean(*, count: int, total: int) -> float:
+    prior_weight = settings.RATING_PRIOR_WEIGHT
+    return (prior_weight * settings.RATING_PRIOR_MEAN + total) / (prior_weight + count)
+
+
+def update_rating_summary(*, session: Session, user_id: uuid.UUID, rating: int) -> "RatingSummary":
+    """Fold one new rating of ``user_id`` into its aggregate row.
+
+    Meant to run in the same transaction as the rating insert; the row is
+    locked so concurrent ratings of the same user are applied one at a time.
+    """
+    from sqlalchemy.dialects.postgresql import insert
+
+    from app.models import RatingSummary
+
+    session.execute(
+        insert(RatingSummary)
+        .values(
+            user_id=user_id,
+            count=0,
+            total=0,
+            sum_squares=0,
+            bayesian_mean=settings.RATING_PRIOR_MEAN,
+            histogram=[0] * 11,
+            updated_at=__import__("datetime").datetime.utcnow(),
+        )
+        .on_conflict_do_nothing(index_elements=[RatingSummary.user_id])
+    )
+    statement = select(RatingSummary).where(RatingSummary.user_id == user_id).with_for_update()
+    summary = session.exec(statement).one()
+    summary.count += 1
+    summary.total += rating
+    summary.sum_squares += rating * rating
+    summary.bayesian_mean = bayesian_mean(count=summary.count, total=summary.total)
+    histogram = list(summary.histogram)
+    histogram[rating + 5] += 1
+    summary.histogram = histogram
+    summary.updated_at = __import__("datetime").datetime.utcnow()
+    session.add(summary)
+    return summary
+
+
+def get_rating_summary(*, session: Session, user_id: uuid.UUID) -> "RatingSummaryPublic":
+    from app.models import RatingSummary, RatingSummaryPublic
+
+    summary = session.get(RatingSummary, user_id)
+    if not summary or not summary.count:
+        return RatingSummaryPublic(
+            user_id=user_id, bayesian_mean=bayesian_mean(count=0, total=0)
+        )
+    mean = summary.total / summary.count
+    variance = max(summary.sum_squares / summary.count - mean * mean, 0.0)
+    return RatingSummaryPublic(
+        user_id=user_id,
+        count=summary.count,
+        total=summary.total,
+        sum_squares=summary.sum_squares,
+        mean=mean,
+        stddev=variance**0.5,
+        bayesian_mean=summary.bayesian_mean,
+        histogram=summary.histogram,
+    )
+
+
 def get_ratings_for_interaction(*, session: Session, interaction_id: uuid.UUID) -> list["Rating"]:
     from app.models import Rating
     from sqlmodel import select
@@ -165,34 +370,134 @@ def get_ratings_for_interaction(*, session: Session, interaction_id: uuid.UUID)
     return session.exec(statement).all()
 
 
+def get_ratings_with_rater(
+    *,
+    session: Session,
+    interaction_ids: list[uuid.UUID],
+    viewer_id: uuid.UUID | None = None,
+) -> dict[uuid.UUID, list["RatingWithRater"]]:
+    """Ratings with rater info for many interactions, in one query.
+
+    With ``viewer_id`` only interactions the viewer took part in are
+    returned. Interactions without ratings map to an empty list; unknown
+    (or hidden) ids are left out.
+    """
+    statement = ratings_with_rater_statement(
+        interaction_ids=interaction_ids, viewer_id=viewer_id
+    )
+    return group_ratings_with_rater(session.exec(statement).all())
+
+
+def ratings_with_rater_statement(
+    *, interaction_ids: list[uuid.UUID], viewer_id: uuid.UUID | None = None
+) -> Any:
+    """The statement ``get_ratings_with_rater`` runs."""
+    import sqlalchemy as sa
+    from sqlalchemy.dialects.postgresql import ARRAY
+
+    from app.models import Interaction, Rating
+
+    ids = list(dict.fromkeys(interaction_ids))
+    statement = (
+        select(Interaction.id, Rating, User.email, User.full_name)
+        .outerjoin(Rating, Rating.interaction_id == Interaction.id)
+        .outerjoin(User, User.id == Rating.rater_id)
+        .where(
+            Interaction.id
+            == sa.any_(sa.bindparam("ids", ids, type_=ARRAY(sa.Uuid(as_uuid=True))))
+        )
+        .order_by(Interaction.id, Rating.created_at)
+    )
+    if viewer_id is not None:
+        statement = statement.where(
+            or_(Interaction.initiator_id == viewer_id, Interaction.target_id == viewer_id)
+        )
+    return statement
+
+
+def group_ratings_with_rater(
+    rows: Any,
+) -> dict[uuid.UUID, list["RatingWithRater"]]:
+    """Group the rows of ``ratings_with_rater_statement`` by interaction."""
+    from app.models import RatingWithRater
+
+    result: dict[uuid.UUID, list[RatingWithRater]] = {}
+    for interaction_id, rating, email, full_name in rows:
+        ratings = result.setdefault(interaction_id, [])
+        if rating is not None:
+            ratings.append(
+                RatingWithRater(
+                    **rating.model_dump(),
+                    rater_email=email or "Unknown",
+                    rater_full_name=full_name if email else "Unknown User",
+                )
+            )
+    return result
+
+
 def create_or_update_endorsement(
     *, session: Session, endorser_id: uuid.UUID, endorsed_id: uuid.UUID, confidence: float
 ) -> "Endorsement":
     from app.models import Endorsement, EndorsementCreate
+    from app.reputation import adjacency, counters, decay, incremental, worker
 
     if endorser_id == endorsed_id:
         raise ValueError("Cannot endorse yourself")
 
+    old_row = None
+    if settings.REPUTATION_INCREMENTAL:
+        old_row = incremental.local_trust_row(session=session, user_id=endorser_id)
+
     statement = select(Endorsement).where(
         (Endorsement.endorser_id == endorser_id)
         & (Endorsement.endorsed_id == endorsed_id)
     )
     existing = session.exec(statement).first()
 
+    previous = None
     if existing:
+        previous = (existing.confidence, existing.updated_at)
         existing.confidence = confidence
         existing.updated_at = __import__("datetime").datetime.utcnow()
-        session.add(existing)
-        session.commit()
-        session.refresh(existing)
-        return existing
+        db_obj = existing
     else:
         endorsement_in = EndorsementCreate(endorsed_id=endorsed_id, confidence=confidence)
         db_obj = Endorsement.model_validate(endorsement_in, update={"endorser_id": endorser_id})
-        session.add(db_obj)
-        session.commit()
-        session.refresh(db_obj)
-        return db_obj
+    session.add(db_obj)
+    counters.adjust_counters(
+        session=session,
+        endorser_id=endorser_id,
+        endorsed_id=endorsed_id,
+        count=0 if previous else 1,
+        confidence=confidence - previous[0] if previous else confidence,
+    )
+    decay.record_endorsement(
+        session=session,
+        user_id=endorsed_id,
+        confidence=confidence,
+        at=db_obj.updated_at,
+        previous=previous,
+    )
+    adjacency.notify_endorsement(
+        session=session,
+        endorser_id=endorser_id,
+        endorsed_id=endorsed_id,
+        confidence=confidence,
+    )
+    update = None
+    if old_row is not None:
+        session.flush()
+        update = incremental.apply_endorsement_change(
+            session=session, endorser_id=endorser_id, old_row=old_row
+        )
+    if update is None:
+        # Not folded into the scores; an incremental update that was signals
+        # a recompute itself once its error bound exceeds the tolerance
+        worker.signal_dirty(session=session, reason="endorsement")
+    session.commit()
+    adjacency.adjacency.set_endorsement(endorser_id, endorsed_id, confidence)
+    session.refresh(db_obj)
+    return db_obj
 
 
 def get_endorsements_by_user(*, session: Session, endorser_id: uuid.UUID) -> list["Endorsement"]:
@@ -213,41 +518,43 @@ def get_endorsements_with_user_info(
     *, session: Session, endorser_id: uuid.UUID
 ) -> list[dict[str, Any]]:
     """Get all endorsements by a user with endorsed user info"""
-    from app.models import Endorsement, User
-
-    statement = (
-        select(Endorsement, User.email, User.full_name)
-        .join(User, Endorsement.endorsed_id == User.id)
-        .where(Endorsement.endorser_id == endorser_id)
-    )
-    results = session.exec(statement).all()
-    return [
-        {
-            "id": e.id,
-            "endorser_id": e.endorser_id,
-            "endorsed_id": e.endorsed_id,
-            "confidence": e.confidence,
-            "created_at": e.created_at,
-            "updated_at": e.updated_at,
-            "user_email": email,
-            "user_full_name": full_name,
-        }
-        for e, email, full_name in results
-    ]
+    statement = endorsements_with_user_info_statement(endorser_id=endorser_id)
+    return endorsement_rows_with_user_info(session.exec(statement).all())
 
 
 def get_endorsers_with_user_info(
     *, session: Session, endorsed_id: uuid.UUID
 ) -> list[dict[str, Any]]:
     """Get all endorsers of a user with endorser user info"""
+    statement = endorsements_with_user_info_statement(endorsed_id=endorsed_id)
+    return endorsement_rows_with_user_info(session.exec(statement).all())
+
+
+def endorsements_with_user_info_statement(
+    *, endorser_id: uuid.UUID | None = None, endorsed_id: uuid.UUID | None = None
+) -> Any:
+    """Endorsements made by ``endorser_id`` joined to the endorsed users, or
+    received by ``endorsed_id`` joined to the endorsers."""
     from app.models import Endorsement, User
 
-    statement = (
-        select(Endorsement, User.email, User.full_name)
-        .join(User, Endorsement.endorser_id == User.id)
-        .where(Endorsement.endorsed_id == endorsed_id)
+    if endorser_id is not None:
+        other, condition = Endorsement.endorsed_id, Endorsement.endorser_id == endorser_id
+    else:
+        other, condition = Endorsement.endorser_id, Endorsement.endorsed_id == endorsed_id
+    return (
+        select(
+            Endorsement,
+            User.email,
+            User.full_name,
+            User.endorsements_received,
+            User.confidence_received,
+        )
+        .join(User, other == User.id)
+        .where(condition)
     )
-    results = session.exec(statement).all()
+
+
+def endorsement_rows_with_user_info(results: Any) -> list[dict[str, Any]]:
     return [
         {
             "id": e.id,
@@ -258,7 +565,318 @@ def get_endorsers_with_user_info(
             "updated_at": e.updated_at,
             "user_email": email,
             "user_full_name": full_name,
+            "user_endorsements_received": received,
+            "user_confidence_received": confidence_received,
         }
-        for e, email, full_name in results
+        for e, email, full_name, received, confidence_received in results
     ]
 
+
+def get_endorsement_neighborhood(
+    *,
+    session: Session,
+    user_id: uuid.UUID,
+    depth: int,
+    max_fanout: int,
+    direction: str = "out",
+    max_edges: int | None = None,
+) -> "EndorsementNeighborhoodPublic":
+    """Endorsements up to ``depth`` hops from ``user_id`` in one recursive query.
+
+    Each visited user contributes at most ``max_fanout`` edges, its highest
+    confidence ones, read from the ``(user, confidence)`` indexes with a
+    ``LATERAL ... LIMIT``. The walk stops early after ``max_edges`` rows.
+    ``direction`` is ``"out"`` for endorsements made, ``"in"`` for received.
+    """
+    import sqlalchemy as sa
+
+    from app.models import Endorsement, EndorsementNeighborhoodPublic
+
+    max_edges = settings.ENDORSEMENT_NEIGHBORHOOD_MAX_EDGES if max_edges is None else max_edges
+    near, far = (
+        (Endorsement.endorser_id, Endorsement.endorsed_id)
+        if direction == "out"
+        else (Endorsement.endorsed_id, Endorsement.endorser_id)
+    )
+
+    def hop(frm: Any) -> Any:
+        return (
+            select(
+                near.label("near"),
+                far.label("far"),
+                Endorsement.confidence.label("confidence"),
+            )
+            .where(near == frm)
+            .order_by(Endorsement.confidence.desc())
+            .limit(max_fanout)
+        )
+
+    first = hop(user_id).subquery("first")
+    walk = select(first, sa.literal(1).label("depth")).cte("walk", recursive=True)
+    step = hop(walk.c.far).lateral("step")
+    walk = walk.union_all(
+        select(step, (walk.c.depth + 1).label("depth"))
+        .select_from(walk.join(step, sa.true()))
+        .where(walk.c.depth < depth)
+    )
+    # Users reached along several paths are expanded once per path; collapse
+    # the duplicates in SQL so each edge crosses the wire once. Ids come back
+    # as text and only distinct users are parsed into UUIDs.
+    limited = sa.select(walk).limit(max_edges + 1).subquery("limited")
+    statement = (
+        sa.select(
+            sa.cast(limited.c.near, sa.String),
+            sa.cast(limited.c.far, sa.String),
+            limited.c.confidence,
+            sa.func.min(limited.c.depth).label("depth"),
+            sa.func.sum(sa.func.count()).over().label("walked"),
+        )
+        .group_by(limited.c.near, limited.c.far, limited.c.confidence)
+        .order_by(sa.text("depth"), limited.c.confidence.desc())
+    )
+    rows = session.execute(statement).all()
+
+    nodes: dict[str, int] = {str(user_id): 0}
+    depths = [0]
+    edges: list[tuple[int, int, float]] = []
+    for near_id, far_id, confidence, hops, _ in rows:
+        for node, node_depth in ((near_id, hops - 1), (far_id, hops)):
+            if node not in nodes:
+                nodes[node] = len(nodes)
+                depths.append(node_depth)
+        src, dst = nodes[near_id], nodes[far_id]
+        edges.append((src, dst, confidence) if direction == "out" else (dst, src, confidence))
+    return EndorsementNeighborhoodPublic(
+        user_id=user_id,
+        direction=direction,
+        nodes=[uuid.UUID(node) for node in nodes],
+        depths=depths,
+        edges=edges,
+        truncated=bool(rows) and rows[0].walked > max_edges,
+    )
+
+
+def get_current_snapshot(*, session: Session) -> "ReputationSnapshot | None":
+    """The latest snapshot, if no score has changed since the run it holds.
+
+    Incremental updates and newer full runs move ``updated_at`` past the
+    snapshot's ``computed_at``, after which reads go to the database.
+    """
+    from app.models import ReputationState
+    from app.reputation.snapshot import snapshots
+
+    snapshot = snapshots.current()
+    if snapshot is None:
+        return None
+    updated_at = session.exec(
+        select(ReputationState.updated_at).where(ReputationState.id == 1)
+    ).first()
+    if updated_at is None or updated_at > snapshot.computed_at:
+        return None
+    return snapshot
+
+
+def get_reputation(*, session: Session, user_id: uuid.UUID) -> "ReputationPublic | None":
+    """Get a user's reputation, normalised by the running score total.
+
+    Served from the snapshot while it is current (see
+    :func:`get_current_snapshot`), otherwise from the stored scores.
+    """
+    from app.models import Reputation, ReputationPublic, ReputationState
+
+    snapshot = get_current_snapshot(session=session)
+    if snapshot is not None:
+        score = snapshot.lookup(user_id)
+        if score is None:
+            return None
+        return ReputationPublic(
+            user_id=user_id, score=score, computed_at=snapshot.computed_at
+        )
+    statement = (
+        select(
+            Reputation.user_id,
+            Reputation.score / ReputationState.estimate_total,
+            Reputation.computed_at,
+        )
+        .join(ReputationState, ReputationState.id == 1)
+        .where(Reputation.user_id == user_id)
+    )
+    row = session.exec(statement).first()
+    if not row:
+        return None
+    return ReputationPublic(user_id=row[0], score=row[1], computed_at=row[2])
+
+
+def get_collusion_clusters(
+    *, session: Session, skip: int = 0, limit: int = 100
+) -> "CollusionClustersPublic":
+    """Flagged clusters, newest first, each with its member ids."""
+    import sqlalchemy as sa
+
+    from app.models import (
+        CollusionCluster,
+        CollusionClusterPublic,
+        CollusionClustersPublic,
+        CollusionMember,
+    )
+
+    count = session.exec(
+        select(sa.func.count()).select_from(CollusionCluster)
+    ).one()
+    clusters = session.exec(
+        select(CollusionCluster)
+        .order_by(CollusionCluster.detected_at.desc(), CollusionCluster.id)
+        .offset(skip)
+        .limit(limit)
+    ).all()
+    members: dict[uuid.UUID, list[uuid.UUID]] = {c.id: [] for c in clusters}
+    if members:
+        rows = session.exec(
+            select(CollusionMember.cluster_id, CollusionMember.user_id)
+            .where(CollusionMember.cluster_id.in_(list(members)))
+            .order_by(CollusionMember.user_id)
+        ).all()
+        for cluster_id, user_id in rows:
+            members[cluster_id].append(user_id)
+    data = [
+        CollusionClusterPublic(
+            **cluster.model_dump(), member_ids=members[cluster.id]
+        )
+        for cluster in clusters
+    ]
+    return CollusionClustersPublic(data=data, count=count)
+
+
+def get_leaderboard(
+    *,
+    session: Session,
+    after_rank: int = 0,
+    limit: int = 100,
+    is_active: bool | None = None,
+) -> "LeaderboardPublic":
+    """Top users by precomputed rank, paged by keyset on ``rank``.
+
+    Each page is an index range scan starting after ``after_rank``, so deep
+    pages cost the same as the first one. Scores are the ones the ranks were
+    computed from, so incremental updates never put a page out of order.
+    """
+    from app.models import (
+        LeaderboardEntryPublic,
+        LeaderboardPublic,
+        Reputation,
+        User,
+    )
+
+    statement = (
+        select(
+            Reputation.rank,
+            Reputation.user_id,
+            User.full_name,
+            Reputation.ranked_score,
+        )
+        .join(User, User.id == Reputation.user_id)
+        .where(Reputation.rank > after_rank)
+        .order_by(Reputation.rank)
+        .limit(limit + 1)
+    )
+    if is_active is not None:
+        statement = statement.where(User.is_active == is_active)
+    rows = session.exec(statement).all()
+    data = [
+        LeaderboardEntryPublic(
+            rank=rank, user_id=user_id, full_name=full_name, score=score
+        )
+        for rank, user_id, full_name, score in rows[:limit]
+    ]
+    next_after_rank = data[-1].rank if len(rows) > limit else None
+    return LeaderboardPublic(data=data, next_after_rank=next_after_rank)
+
+
+def get_reputation_batch(
+    *, session: Session, user_ids: list[uuid.UUID]
+) -> list["UserReputationPublic"]:
+    """Get reputation, rating aggregates and endorsement counts for many users.
+
+    One query besides the snapshot check: ids are bound as a single array,
+    ratings come from the precomputed summaries and endorsement counts from
+    the user row. Scores
+    all come from one source, as in :func:`get_reputation`: the snapshot
+    while it is current, the stored scores otherwise. Unknown ids are left
+    out; the result keeps the order of ``user_ids``.
+    """
+    import sqlalchemy as sa
+    from sqlalchemy.dialects.postgresql import ARRAY
+
+    from app.models import (
+        RatingSummary,
+        Reputation,
+        ReputationState,
+        User,
+        UserReputationPublic,
+    )
+
+    ids = list(dict.fromkeys(user_ids))
+    snapshot = get_current_snapshot(session=session)
+    if snapshot is None:
+        estimate_total = (
+            select(ReputationState.estimate_total)
+            .where(ReputationState.id == 1)
+            .scalar_subquery()
+        )
+        score_columns = (Reputation.score / estimate_total, Reputation.computed_at)
+    else:
+        score_columns = (sa.null(), sa.null())
+    statement = (
+        select(
+            User.id,
+            *score_columns,
+            RatingSummary.count,
+            RatingSummary.total,
+            RatingSummary.bayesian_mean,
+            User.endorsements_received,
+            User.endorsements_given,
+        )
+        .outerjoin(RatingSummary, RatingSummary.user_id == User.id)
+        .where(
+            User.id
+            == sa.any_(sa.bindparam("ids", ids, type_=ARRAY(sa.Uuid(as_uuid=True))))
+        )
+    )
+    if snapshot is None:
+        statement = statement.outerjoin(Reputation, Reputation.user_id == User.id)
+    rows = {
+        user_id: UserReputationPublic(
+            user_id=user_id,
+            score=score,
+            computed_at=computed_at,
+            rating_count=count or 0,
+            rating_mean=total / count if count else None,
+            bayesian_mean=mean if count else bayesian_mean(count=0, total=0),
+            endorsements_received=endorsements_received,
+            endorsements_given=endorsements_given,
+        )
+        for (
+            user_id,
+            score,
+            computed_at,
+            count,
+            total,
+            mean,
+            endorsements_received,
+            endorsements_given,
+        ) in session.exec(statement).all()
+    }
+    if snapshot is not None:
+        for user_id, score in snapshot.lookup_many(list(rows)).items():
+            rows[user_id].score = score
+            rows[user_id].computed_at = snapshot.computed_at
+    return [rows[user_id] for user_id in ids if user_id in rows]
+
+
+def get_decayed_reputation(
+    *, session: Session, user_id: uuid.UUID
+) -> "DecayedReputationPublic":
+    """Get a user's time-decayed rating and endorsement scores as of now."""
+    from app.reputation import decay
+
+    return decay.get_decayed_reputation(session=session, user_id=user_id)
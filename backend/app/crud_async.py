@@ -0,0 +1,74 @@
+"""Async versions of the read-heavy queries in ``app.crud``.
+
+Each runs the statement of its ``app.crud`` namesake on an ``AsyncSession``,
+so async routes wait on the database without holding a threadpool thread.
+"""
+
+import uuid
+from typing import Any
+
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app import crud
+from app.models import Interaction, RatingWithRater, User
+from app.pagination import Cursor
+
+
+async def search_users(
+    *,
+    session: AsyncSession,
+    query: str,
+    limit: int = 10,
+    exclude_id: uuid.UUID | None = None,
+    prefix: bool = False,
+    reputation_boost: bool = False,
+) -> list[User]:
+    statement = crud.search_users_statement(
+        query=query,
+        limit=limit,
+        exclude_id=exclude_id,
+        prefix=prefix,
+        reputation_boost=reputation_boost,
+    )
+    return list((await session.exec(statement)).all())
+
+
+async def get_user_interactions(
+    *,
+    session: AsyncSession,
+    user_id: uuid.UUID,
+    role: str | None = None,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Cursor | None = None,
+) -> list[Interaction]:
+    statement = crud.user_interactions_statement(
+        user_id=user_id, role=role, skip=skip, limit=limit, cursor=cursor
+    )
+    return list((await session.exec(statement)).all())
+
+
+async def get_ratings_with_rater(
+    *,
+    session: AsyncSession,
+    interaction_ids: list[uuid.UUID],
+    viewer_id: uuid.UUID | None = None,
+) -> dict[uuid.UUID, list[RatingWithRater]]:
+    statement = crud.ratings_with_rater_statement(
+        interaction_ids=interaction_ids, viewer_id=viewer_id
+    )
+    return crud.group_ratings_with_rater((await session.exec(statement)).all())
+
+
+async def get_endorsements_with_user_info(
+    *, session: AsyncSession, endorser_id: uuid.UUID
+) -> list[dict[str, Any]]:
+    statement = crud.endorsements_with_user_info_statement(endorser_id=endorser_id)
+    return crud.endorsement_rows_with_user_info((await session.exec(statement)).all())
+
+
+async def get_endorsers_with_user_info(
+    *, session: AsyncSession, endorsed_id: uuid.UUID
+) -> list[dict[str, Any]]:
+    statement = crud.endorsements_with_user_info_statement(endorsed_id=endorsed_id)
+    return crud.endorsement_rows_with_user_info((await session.exec(statement)).all())
@@ -0,0 +1,100 @@
+"""Streaming export of the trust graph tables as NDJSON or CSV.
+
+Rows are read in primary-key order through a server-side cursor (psycopg
+named cursor via ``yield_per``), ``EXPORT_CHUNK_ROWS`` at a time, and each
+chunk is encoded and handed to the response before the next one is fetched,
+so memory stays flat however large the table is. A stream runs in a single
+read-only REPEATABLE READ transaction and therefore sees one consistent
+snapshot. An interrupted export resumes with ``after`` set to the ``id`` of
+the last row received.
+"""
+
+import csv
+import io
+import json
+import uuid
+from collections.abc import Iterator, Sequence
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import Engine, Table, select
+
+from app.core.config import settings
+from app.models import Endorsement, Interaction, Rating
+
+EXPORT_TABLES: dict[str, Table] = {
+    "endorsements": Endorsement.__table__,  # type: ignore[dict-item]
+    "interactions": Interaction.__table__,  # type: ignore[dict-item]
+    "ratings": Rating.__table__,  # type: ignore[dict-item]
+}
+
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+def stream_chunks(
+    db_engine: Engine,
+    table: Table,
+    *,
+    after: uuid.UUID | None = None,
+    chunk_size: int | None = None,
+) -> Iterator[Sequence[Any]]:
+    """Yield the rows of ``table`` with ``id > after``, one chunk at a time."""
+    chunk_size = chunk_size or settings.EXPORT_CHUNK_ROWS
+    statement = select(table).order_by(table.c.id)
+    if after is not None:
+        statement = statement.where(table.c.id > after)
+    with db_engine.connect() as connection:
+        connection = connection.execution_options(
+            isolation_level="REPEATABLE READ", postgresql_readonly=True
+        )
+        result = connection.execution_options(yield_per=chunk_size).execute(statement)
+        yield from result.partitions()
+
+
+def _json_default(value: Any) -> str:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def ndjson_lines(table: Table, chunks: Iterator[Sequence[Any]]) -> Iterator[str]:
+    names = list(table.c.keys())
+    for rows in chunks:
+        yield "".join(
+            json.dumps(dict(zip(names, row, strict=True)), default=_json_default) + "\n"
+            for row in rows
+        )
+
+
+def csv_lines(table: Table, chunks: Iterator[Sequence[Any]]) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(table.c.keys())
+    for rows in chunks:
+        writer.writerows(
+            [
+                value.isoformat() if isinstance(value, datetime) else value
+                for value in row
+            ]
+            for row in rows
+        )
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    # Header only, for an empty export
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def export_table(
+    db_engine: Engine,
+    name: str,
+    *,
+    format: str,
+    after: uuid.UUID | None = None,
+    chunk_size: int | None = None,
+) -> Iterator[str]:
+    table = EXPORT_TABLES[name]
+    chunks = stream_chunks(db_engine, table, after=after, chunk_size=chunk_size)
+    encode = csv_lines if format == "csv" else ndjson_lines
+    return encode(table, chunks)
@@ -1,3 +1,7 @@
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
 import sentry_sdk
 from fastapi import FastAPI
 from fastapi.routing import APIRoute
@@ -5,6 +9,9 @@ from starlette.middleware.cors import CORSMiddleware
 
 from app.api.main import api_router
 from app.core.config import settings
+from app.core.db import async_engine, engine
+from app.reputation.adjacency import adjacency, start_listener
+from app.reputation.worker import run_in_process
 
 
 def custom_generate_unique_id(route: APIRoute) -> str:
@@ -14,10 +21,26 @@ def custom_generate_unique_id(route: APIRoute) -> str:
 if settings.SENTRY_DSN and settings.ENVIRONMENT != "local":
     sentry_sdk.init(dsn=str(settings.SENTRY_DSN), enable_tracing=True)
 
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
+    if settings.ENDORSEMENT_INDEX_ENABLED:
+        start_listener(adjacency)
+    task = None
+    if settings.REPUTATION_WORKER_IN_PROCESS:
+        task = asyncio.create_task(run_in_process(engine))
+    yield
+    if task is not None:
+        task.cancel()
+    # Pooled async connections belong to this event loop
+    await async_engine.dispose()
+
+
 app = FastAPI(
     title=settings.PROJECT_NAME,
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
     generate_unique_id_function=custom_generate_unique_id,
+    lifespan=lifespan,
 )
 
 # Set all CORS enabled origins
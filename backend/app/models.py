@@ -1,6 +1,17 @@
 import uuid
 
 from pydantic import EmailStr
+from sqlalchemy import (
+    Column,
+    Computed,
+    Index,
+    Integer,
+    Text,
+    func,
+    literal_column,
+    text,
+)
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlmodel import Field, Relationship, SQLModel
 from datetime import datetime
 
@@ -45,16 +56,66 @@ class User(UserBase, table=True):
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     hashed_password: str
     items: list["Item"] = Relationship(back_populates="owner", cascade_delete=True)
+    created_at: datetime = Field(
+        default_factory=datetime.utcnow,
+        sa_column_kwargs={"server_default": text("timezone('utc', now())")},
+    )
+    # Denormalized endorsement counts and confidence sums, kept in step by
+    # create_or_update_endorsement and delete_user
+    endorsements_received: int = Field(default=0, sa_column_kwargs={"server_default": "0"})
+    endorsements_given: int = Field(default=0, sa_column_kwargs={"server_default": "0"})
+    confidence_received: float = Field(default=0.0, sa_column_kwargs={"server_default": "0"})
+    confidence_given: float = Field(default=0.0, sa_column_kwargs={"server_default": "0"})
+    # Lower-cased name and email, trigram-indexed for crud.search_users
+    search_text: str | None = Field(
+        default=None,
+        sa_column=Column(
+            Text,
+            Computed("lower(coalesce(full_name, '') || ' ' || email)", persisted=True),
+        ),
+    )
+
+    __table_args__ = (
+        # Keyset pagination and leaderboards by endorsement counts
+        Index("ix_user_created_at", "created_at", "id"),
+        Index("ix_user_endorsements_received", "endorsements_received", "id"),
+        Index("ix_user_confidence_received", "confidence_received", "id"),
+        # crud.search_users: substring match, and prefix match in "C" order
+        Index(
+            "ix_user_search_text_trgm",
+            "search_text",
+            postgresql_using="gin",
+            postgresql_ops={"search_text": "gin_trgm_ops"},
+        ),
+        # Index collations are not reflected, so autogenerate skips these two
+        Index(
+            "ix_user_full_name_prefix",
+            func.lower(literal_column("full_name")).collate("C"),
+            info={"skip_autogenerate": True},
+        ),
+        Index(
+            "ix_user_email_prefix",
+            func.lower(literal_column("email")).collate("C"),
+            info={"skip_autogenerate": True},
+        ),
+    )
 
 
 # Properties to return via API, id is always required
 class UserPublic(UserBase):
     id: uuid.UUID
+    endorsements_received: int = 0
+    endorsements_given: int = 0
+    confidence_received: float = 0.0
+    confidence_given: float = 0.0
 
 
 class UsersPublic(SQLModel):
     data: list[UserPublic]
-    count: int
+    # Estimated with count=estimate, None with count=none
+    count: int | None
+    # Pass as ``cursor`` to get the next page; None on the last page
+    next_cursor: str | None = None
 
 
 # Shared properties
@@ -80,6 +141,15 @@ class Item(ItemBase, table=True):
         foreign_key="user.id", nullable=False, ondelete="CASCADE"
     )
     owner: User | None = Relationship(back_populates="items")
+    created_at: datetime = Field(
+        default_factory=datetime.utcnow,
+        sa_column_kwargs={"server_default": text("timezone('utc', now())")},
+    )
+
+    __table_args__ = (
+        Index("ix_item_created_at", "created_at", "id"),
+        Index("ix_item_owner_created_at", "owner_id", "created_at", "id"),
+    )
 
 
 # Properties to return via API, id is always required
@@ -90,7 +160,8 @@ class ItemPublic(ItemBase):
 
 class ItemsPublic(SQLModel):
     data: list[ItemPublic]
-    count: int
+    count: int | None
+    next_cursor: str | None = None
 
 
 # Generic message
@@ -114,6 +185,29 @@ class NewPassword(SQLModel):
     new_password: str = Field(min_length=8, max_length=128)
 
 
+# Connection pool occupancy and checkout waits of one engine in this process
+class DatabasePoolPublic(SQLModel):
+    engine: str
+    size: int
+    max_overflow: int
+    checked_out: int
+    idle: int
+    saturation: float | None = None
+    peak_checked_out: int
+    checkouts: int
+    timeouts: int
+    wait_mean_ms: float
+    wait_p50_ms: float
+    wait_p95_ms: float
+    wait_p99_ms: float
+    wait_max_ms: float
+
+
+class DatabasePoolsPublic(SQLModel):
+    data: list[DatabasePoolPublic]
+    pgbouncer: bool
+
+
 # Interaction models
 class InteractionBase(SQLModel):
     message: str | None = Field(default=None, max_length=1024)
@@ -131,6 +225,11 @@ class InteractionPublic(InteractionBase):
     created_at: datetime = Field(default_factory=datetime.utcnow)
 
 
+class InteractionsPublic(SQLModel):
+    data: list[InteractionPublic]
+    next_cursor: str | None = None
+
+
 class Interaction(InteractionBase, table=True):
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     initiator_id: uuid.UUID = Field(foreign_key="user.id", nullable=False)
@@ -138,6 +237,19 @@ class Interaction(InteractionBase, table=True):
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
 
+    __table_args__ = (
+        # get_user_interactions: one range per side, newest first
+        Index("ix_interaction_initiator_created", "initiator_id", "created_at", "id"),
+        Index("ix_interaction_target_created", "target_id", "created_at", "id"),
+        # create_interaction: duplicate pending request check
+        Index(
+            "ix_interaction_pending_pair",
+            "initiator_id",
+            "target_id",
+            postgresql_where=text("status = 'pending'"),
+        ),
+    )
+
 
 # Rating models
 class RatingBase(SQLModel):
@@ -162,12 +274,59 @@ class RatingWithRater(RatingPublic):
     rater_full_name: str | None
 
 
+class InteractionRatingsBatch(SQLModel):
+    interaction_ids: list[uuid.UUID] = Field(min_length=1, max_length=1000)
+
+
+class InteractionRatingsPublic(SQLModel):
+    interaction_id: uuid.UUID
+    ratings: list[RatingWithRater]
+
+
+class InteractionsRatingsPublic(SQLModel):
+    data: list[InteractionRatingsPublic]
+    count: int
+
+
 class Rating(RatingBase, table=True):
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     interaction_id: uuid.UUID = Field(foreign_key="interaction.id", nullable=False)
     rater_id: uuid.UUID = Field(foreign_key="user.id", nullable=False)
     created_at: datetime = Field(default_factory=datetime.utcnow)
 
+    __table_args__ = (
+        # add_rating: duplicate rating check; also serves ratings by interaction
+        Index("ix_rating_interaction_rater", "interaction_id", "rater_id"),
+    )
+
+
+# Rating aggregates per rated user, maintained by crud.add_rating
+class RatingSummaryPublic(SQLModel):
+    user_id: uuid.UUID
+    count: int = 0
+    total: int = 0
+    sum_squares: int = 0
+    mean: float | None = None
+    stddev: float | None = None
+    bayesian_mean: float
+    # Number of ratings per value, index 0 is -5 and index 10 is 5
+    histogram: list[int] = Field(default_factory=lambda: [0] * 11)
+
+
+class RatingSummary(SQLModel, table=True):
+    user_id: uuid.UUID = Field(
+        foreign_key="user.id", primary_key=True, ondelete="CASCADE"
+    )
+    count: int = Field(default=0)
+    total: int = Field(default=0)
+    sum_squares: int = Field(default=0)
+    bayesian_mean: float = Field(default=0.0)
+    histogram: list[int] = Field(
+        default_factory=lambda: [0] * 11,
+        sa_column=Column(ARRAY(Integer), nullable=False),
+    )
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
 
 # Endorsement models
 class EndorsementBase(SQLModel):
@@ -190,6 +349,73 @@ class EndorsementWithUser(EndorsementPublic):
     """Endorsement with user information"""
     user_email: str
     user_full_name: str | None
+    # The other user's denormalized endorsement stats
+    user_endorsements_received: int = 0
+    user_confidence_received: float = 0.0
+
+
+class EndorsementNeighborhoodPublic(SQLModel):
+    """k-hop endorsement subgraph; edges are (endorser, endorsed, confidence)
+    triples indexing into nodes, and nodes[0] is the requested user"""
+    user_id: uuid.UUID
+    direction: str
+    nodes: list[uuid.UUID]
+    # Hop distance of each node from the requested user
+    depths: list[int]
+    edges: list[tuple[int, int, float]]
+    # True when the edge budget cut the walk short
+    truncated: bool = False
+
+
+class BulkImportRejectPublic(SQLModel):
+    # Record number in the input, starting at 1 after any CSV header
+    line: int
+    reason: str
+
+
+class BulkImportBatchPublic(SQLModel):
+    batch: int
+    rows: int
+    imported: int
+    rejected: int
+    seconds: float
+    rows_per_second: float
+
+
+class BulkImportPublic(SQLModel):
+    kind: str
+    rows: int = 0
+    imported: int = 0
+    rejected: int = 0
+    seconds: float = 0.0
+    batches: list[BulkImportBatchPublic] = []
+    # The first IMPORT_MAX_REJECTS_REPORTED rejected records
+    rejects: list[BulkImportRejectPublic] = []
+
+
+class TrustPathPublic(SQLModel):
+    """Strongest endorsement chain between two users; weight is the product
+    of the confidences along path"""
+    from_id: uuid.UUID
+    to_id: uuid.UUID
+    max_depth: int
+    # found, partial (time ran out), no_path (none within max_depth) or timeout
+    status: str
+    path: list[uuid.UUID] = []
+    # Confidence of each endorsement along path, one fewer than path
+    confidences: list[float] = []
+    weight: float = 0.0
+    # Users whose endorsements were looked up
+    explored: int = 0
+
+
+class PersonalizedTrustPublic(SQLModel):
+    """Approximate personalized PageRank of target_id as seen by source_id"""
+    source_id: uuid.UUID
+    target_id: uuid.UUID
+    score: float
+    error_bound: float
+    converged: bool
 
 
 class Endorsement(EndorsementBase, table=True):
@@ -200,4 +426,189 @@ class Endorsement(EndorsementBase, table=True):
     updated_at: datetime = Field(default_factory=datetime.utcnow)
     __table_args__ = (
         __import__("sqlalchemy").UniqueConstraint("endorser_id", "endorsed_id", name="uq_endorsement_endorser_endorsed"),
+        Index("ix_endorsement_endorser_id", "endorser_id"),
+        Index("ix_endorsement_endorsed_id", "endorsed_id"),
+        # Fan-out by confidence threshold, served index-only
+        Index("ix_endorsement_endorser_confidence", "endorser_id", "confidence"),
+        Index("ix_endorsement_endorsed_confidence", "endorsed_id", "confidence"),
+        # Incremental collusion checks: endorsements updated since the last one
+        Index("ix_endorsement_updated_at", "updated_at"),
+    )
+
+
+# Reputation models
+class ReputationPublic(SQLModel):
+    user_id: uuid.UUID
+    score: float
+    computed_at: datetime | None = None
+
+
+class SnapshotReputationPublic(ReputationPublic):
+    # Trust flow certification, None when the snapshot was built without it
+    certified: bool | None = None
+
+
+class ReputationRunPublic(SQLModel):
+    users: int
+    edges: int
+    iterations: int
+    residual: float
+    ranks_changed: int = 0
+    # Users certified by the trust flow metric, when enabled
+    certified: int | None = None
+    duration_seconds: float
+
+
+class UserReputationPublic(SQLModel):
+    user_id: uuid.UUID
+    score: float | None = None
+    computed_at: datetime | None = None
+    rating_count: int = 0
+    rating_mean: float | None = None
+    bayesian_mean: float | None = None
+    endorsements_received: int = 0
+    endorsements_given: int = 0
+
+
+class UserReputationBatch(SQLModel):
+    user_ids: list[uuid.UUID] = Field(min_length=1, max_length=5000)
+
+
+class UserReputationsPublic(SQLModel):
+    data: list[UserReputationPublic]
+    count: int
+
+
+class ReputationSnapshotPublic(SQLModel):
+    version: int
+    computed_at: datetime
+    users: int
+
+
+class ReputationWorkerStatusPublic(SQLModel):
+    queue_depth: int
+    oldest_signal_at: datetime | None = None
+    window_seconds: float
+    last_run_at: datetime | None = None
+    last_run_seconds: float | None = None
+
+
+class CollusionClusterPublic(SQLModel):
+    id: uuid.UUID
+    # "ring": strongly connected and endorsed mostly from inside;
+    # "reciprocal": dense cluster of mutual endorsements
+    kind: str
+    size: int
+    # Mutual high-confidence pairs over all possible pairs of members
+    density: float
+    # Share of the members' incoming high-confidence endorsement weight that
+    # comes from other members
+    internal_share: float
+    mean_confidence: float
+    detected_at: datetime
+    member_ids: list[uuid.UUID]
+
+
+class CollusionClustersPublic(SQLModel):
+    data: list[CollusionClusterPublic]
+    count: int
+
+
+class CollusionCheckPublic(SQLModel):
+    incremental: bool
+    users_checked: int
+    edges_checked: int
+    clusters_found: int
+    clusters_removed: int
+    duration_seconds: float
+
+
+class LeaderboardEntryPublic(SQLModel):
+    rank: int
+    user_id: uuid.UUID
+    full_name: str | None = None
+    score: float
+
+
+class LeaderboardPublic(SQLModel):
+    data: list[LeaderboardEntryPublic]
+    # Pass as after_rank to fetch the next page; None on the last page
+    next_after_rank: int | None = None
+
+
+class DecayedReputationPublic(SQLModel):
+    user_id: uuid.UUID
+    as_of: datetime
+    half_life_days: float
+    rating_mean: float | None = None
+    rating_weight: float = 0.0
+    endorsement_score: float = 0.0
+    endorsement_weight: float = 0.0
+
+
+class Reputation(SQLModel, table=True):
+    user_id: uuid.UUID = Field(
+        foreign_key="user.id", primary_key=True, ondelete="CASCADE"
+    )
+    score: float = Field(default=0.0)
+    # Unpushed PageRank residual left by incremental updates
+    residual: float = Field(default=0.0)
+    # Leaderboard position as of the last full recompute (1 = highest score)
+    rank: int | None = Field(default=None)
+    # Normalized score ``rank`` was computed from; incremental updates leave it
+    ranked_score: float | None = Field(default=None)
+    computed_at: datetime = Field(default_factory=datetime.utcnow)
+
+    __table_args__ = (Index("ix_reputation_rank", "rank"),)
+
+
+# Singleton row tracking the incremental reputation error budget
+class ReputationState(SQLModel, table=True):
+    id: int = Field(default=1, primary_key=True)
+    estimate_total: float = Field(default=1.0)
+    residual_l1: float = Field(default=0.0)
+    computed_at: datetime = Field(default_factory=datetime.utcnow)
+    # Last change to the stored scores, by a full run or an incremental update
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    last_run_seconds: float | None = Field(default=None)
+    # Endorsements updated after this are re-checked by the next collusion run
+    collusion_checked_at: datetime | None = Field(default=None)
+
+
+# Pending recompute requests, drained by the background worker
+class ReputationSignal(SQLModel, table=True):
+    id: int | None = Field(default=None, primary_key=True)
+    reason: str = Field(max_length=50)
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+# Exponentially decayed accumulators, all scaled to the row's landmark time
+class DecayedReputation(SQLModel, table=True):
+    user_id: uuid.UUID = Field(
+        foreign_key="user.id", primary_key=True, ondelete="CASCADE"
+    )
+    landmark: datetime = Field(default_factory=datetime.utcnow)
+    rating_sum: float = Field(default=0.0)
+    rating_weight: float = Field(default=0.0)
+    endorsement_sum: float = Field(default=0.0)
+    endorsement_weight: float = Field(default=0.0)
+
+
+# Suspected collusion clusters found by the batch detector
+class CollusionCluster(SQLModel, table=True):
+    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
+    kind: str = Field(max_length=16)
+    size: int
+    density: float
+    internal_share: float
+    mean_confidence: float
+    detected_at: datetime = Field(default_factory=datetime.utcnow, index=True)
+
+
+class CollusionMember(SQLModel, table=True):
+    cluster_id: uuid.UUID = Field(
+        foreign_key="collusioncluster.id", primary_key=True, ondelete="CASCADE"
+    )
+    user_id: uuid.UUID = Field(
+        foreign_key="user.id", primary_key=True, index=True, ondelete="CASCADE"
     )
@@ -0,0 +1,117 @@
+"""Opaque keyset cursors over ``(created_at, id)``, newest first.
+
+A cursor is the position of the last row of a page; the next page is the
+rows strictly before it in ``(created_at DESC, id DESC)`` order, which a
+``(..., created_at, id)`` index serves as a range scan however deep the page.
+
+The total returned with a page is counted as the client asks: ``exact`` scans
+every matching row, ``estimate`` takes the planner's row estimate (cached for
+``COUNT_ESTIMATE_TTL_SECONDS``) and only counts exactly below
+``COUNT_ESTIMATE_EXACT_BELOW``, ``none`` skips it.
+"""
+
+import base64
+import binascii
+import json
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import Sequence
+from datetime import datetime
+from typing import Any, Literal, TypeVar
+
+from sqlalchemy import tuple_
+from sqlmodel import Session, func, select
+from sqlmodel.sql.expression import SelectOfScalar
+
+from app.core.config import settings
+
+Cursor = tuple[datetime, uuid.UUID]
+CountMode = Literal["exact", "estimate", "none"]
+T = TypeVar("T")
+
+# Statements with cached estimates; every search term is its own entry
+ESTIMATE_CACHE_SIZE = 1024
+
+# Planner estimates by statement and parameters, with their expiry time, in
+# insertion (and so expiry) order
+_estimates: OrderedDict[tuple[str, str], tuple[float, int]] = OrderedDict()
+_estimates_lock = threading.Lock()
+
+
+def encode_cursor(created_at: datetime, id: uuid.UUID) -> str:
+    raw = json.dumps([created_at.isoformat(), str(id)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Cursor:
+    """Parse a cursor from ``encode_cursor``; ``ValueError`` if malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, id = json.loads(raw)
+        return datetime.fromisoformat(created_at), uuid.UUID(id)
+    except (binascii.Error, TypeError, UnicodeDecodeError, ValueError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def keyset(
+    statement: SelectOfScalar[T], model: Any, cursor: Cursor | None
+) -> SelectOfScalar[T]:
+    """Order newest first and start after ``cursor``."""
+    if cursor is not None:
+        statement = statement.where(tuple_(model.created_at, model.id) < cursor)
+    return statement.order_by(model.created_at.desc(), model.id.desc())
+
+
+def page(rows: Sequence[T], limit: int) -> tuple[list[T], str | None]:
+    """Split ``limit + 1`` rows into a page and the cursor of the next one
+    (``None`` on the last page)."""
+    data = list(rows[:limit])
+    if len(rows) <= limit:
+        return data, None
+    last: Any = data[-1]
+    return data, encode_cursor(last.created_at, last.id)
+
+
+def _estimate(session: Session, statement: SelectOfScalar[Any]) -> int:
+    compiled = statement.compile(session.get_bind())
+    key = (str(compiled), repr(sorted(compiled.params.items())))
+    now = time.monotonic()
+    with _estimates_lock:
+        cached = _estimates.get(key)
+    if cached is not None and cached[0] > now:
+        return cached[1]
+    (plan,) = (
+        session.connection()
+        .exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params)
+        .scalar_one()
+    )
+    estimate = int(plan["Plan"]["Plan Rows"])
+    with _estimates_lock:
+        _estimates.pop(key, None)
+        _estimates[key] = (now + settings.COUNT_ESTIMATE_TTL_SECONDS, estimate)
+        # Entries share one TTL, so the expired ones are all at the front
+        while _estimates and next(iter(_estimates.values()))[0] <= now:
+            _estimates.popitem(last=False)
+        while len(_estimates) > ESTIMATE_CACHE_SIZE:
+            _estimates.popitem(last=False)
+    return estimate
+
+
+def count_rows(
+    session: Session, statement: SelectOfScalar[Any], mode: CountMode
+) -> int | None:
+    """Count the rows ``statement`` selects, as ``mode`` asks.
+
+    Planning a statement costs the same at any table size, so an estimate
+    keeps list latency flat; small results, where the estimate is least
+    accurate and counting is cheap, are counted exactly.
+    """
+    if mode == "none":
+        return None
+    if mode == "estimate":
+        estimate = _estimate(session, statement)
+        if estimate >= settings.COUNT_ESTIMATE_EXACT_BELOW:
+            return estimate
+    return session.exec(select(func.count()).select_from(statement.subquery())).one()
@@ -0,0 +1,356 @@
+"""In-process CSR adjacency index of the endorsement graph.
+
+Users are numbered with dense int32 ids and the graph is held as forward
+(endorser -> endorsed) and reverse CSR arrays of int32 neighbours and
+float32 confidences: 8 bytes per edge and direction, instead of one ORM
+object per row.
+
+CSR arrays are immutable, so writes land in a small overlay of rewritten
+rows (copied out of the CSR the first time they change) plus a set of
+deleted users. Once the overlay grows past ``ENDORSEMENT_INDEX_COMPACT_EDGES``
+it is folded back into fresh CSR arrays with vectorised NumPy.
+
+Every API worker keeps its own copy. Writers apply their change locally after
+commit and send it with ``pg_notify`` inside the write transaction, so the
+other workers hear about committed changes only; a listener thread per
+process applies them (see :func:`start_listener`).
+"""
+
+import logging
+import threading
+import uuid
+from collections.abc import Sequence
+
+import numpy as np
+import psycopg
+import scipy.sparse as sp
+from sqlmodel import Session, func, select
+
+from app.core.config import settings
+from app.core.db import engine
+from app.reputation.engine import load_edges
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "endorsement_index"
+EMPTY_NEIGHBOURS = np.zeros(0, dtype=np.int32)
+EMPTY_WEIGHTS = np.zeros(0, dtype=np.float32)
+
+
+class _CSR:
+    """One direction of the graph as CSR arrays."""
+
+    def __init__(self, indptr: np.ndarray, neighbours: np.ndarray, weights: np.ndarray):
+        self.indptr = indptr
+        self.neighbours = neighbours
+        self.weights = weights
+
+    @classmethod
+    def build(
+        cls, size: int, rows: np.ndarray, cols: np.ndarray, weights: np.ndarray
+    ) -> "_CSR":
+        matrix = sp.csr_matrix(
+            (weights.astype(np.float32), (rows, cols)), shape=(size, size)
+        )
+        matrix.sort_indices()
+        return cls(
+            matrix.indptr.astype(np.int64),
+            matrix.indices.astype(np.int32),
+            matrix.data.astype(np.float32),
+        )
+
+    def row(self, i: int) -> tuple[np.ndarray, np.ndarray]:
+        if i >= len(self.indptr) - 1:
+            return EMPTY_NEIGHBOURS, EMPTY_WEIGHTS
+        start, end = self.indptr[i], self.indptr[i + 1]
+        return self.neighbours[start:end], self.weights[start:end]
+
+
+class AdjacencyView:
+    """A consistent read-only view of the index, used without its lock.
+
+    The CSR arrays are never modified and ``user_ids`` / ``index`` are only
+    appended to until a reload or compaction replaces them, so the view keeps
+    references to those and copies only the small overlay.
+    """
+
+    def __init__(
+        self,
+        user_ids: list[uuid.UUID],
+        index: dict[uuid.UUID, int],
+        forward: _CSR,
+        reverse: _CSR,
+        rows: tuple[dict[int, dict[int, float]], dict[int, dict[int, float]]],
+        deleted: set[int],
+    ) -> None:
+        self.user_ids = user_ids
+        self.index = index
+        # Users numbered after the view was taken are not part of it
+        self.count = len(user_ids)
+        self.forward = forward
+        self.reverse = reverse
+        self.rows = rows
+        self.deleted = deleted
+
+    def dense_id(self, user_id: uuid.UUID) -> int | None:
+        i = self.index.get(user_id)
+        return i if i is not None and i < self.count else None
+
+    def user_id(self, i: int) -> uuid.UUID:
+        return self.user_ids[i]
+
+    def neighbour_ids(
+        self, i: int, *, reverse: bool = False
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Dense ids and confidences adjacent to dense id ``i``."""
+        if i in self.deleted:
+            return EMPTY_NEIGHBOURS, EMPTY_WEIGHTS
+        row = self.rows[1 if reverse else 0].get(i)
+        if row is not None:
+            neighbours = np.fromiter(row.keys(), dtype=np.int32, count=len(row))
+            weights = np.fromiter(row.values(), dtype=np.float32, count=len(row))
+        else:
+            csr = self.reverse if reverse else self.forward
+            neighbours, weights = csr.row(i)
+        if self.deleted and len(neighbours):
+            keep = ~np.isin(neighbours, list(self.deleted))
+            neighbours, weights = neighbours[keep], weights[keep]
+        return neighbours, weights
+
+
+class AdjacencyIndex:
+    def __init__(self) -> None:
+        # Guards every mutation; readers holding dense ids across calls take a
+        # view() instead, so compaction cannot renumber users under them
+        self.lock = threading.RLock()
+        self.loaded = False
+        self._reset([])
+
+    def _reset(self, user_ids: Sequence[uuid.UUID]) -> None:
+        self.user_ids: list[uuid.UUID] = list(user_ids)
+        self.index: dict[uuid.UUID, int] = {u: i for i, u in enumerate(self.user_ids)}
+        empty = np.zeros(0, dtype=np.int32)
+        self._forward = _CSR.build(len(self.user_ids), empty, empty, EMPTY_WEIGHTS)
+        self._reverse = _CSR.build(len(self.user_ids), empty, empty, EMPTY_WEIGHTS)
+        self._rows: tuple[dict[int, dict[int, float]], dict[int, dict[int, float]]] = (
+            {},
+            {},
+        )
+        self._deleted: set[int] = set()
+        # Edges held in the overlay, compared against the compaction threshold
+        self._pending = 0
+
+    @property
+    def size(self) -> int:
+        return len(self.user_ids) - len(self._deleted)
+
+    def load(self, session: Session) -> None:
+        """Bulk-load every user and endorsement (see :func:`load_edges`)."""
+        edges = load_edges(session)
+        self.replace(edges.user_ids, edges.sources, edges.targets, edges.confidences)
+        logger.info(
+            "Loaded endorsement index: %d users, %d edges",
+            len(edges.user_ids),
+            len(edges.sources),
+        )
+
+    def replace(
+        self,
+        user_ids: Sequence[uuid.UUID],
+        sources: np.ndarray,
+        targets: np.ndarray,
+        confidences: np.ndarray,
+    ) -> None:
+        sources = np.asarray(sources, dtype=np.int32)
+        targets = np.asarray(targets, dtype=np.int32)
+        confidences = np.asarray(confidences, dtype=np.float32)
+        n = len(user_ids)
+        forward = _CSR.build(n, sources, targets, confidences)
+        reverse = _CSR.build(n, targets, sources, confidences)
+        with self.lock:
+            self._reset(user_ids)
+            self._forward, self._reverse = forward, reverse
+            self.loaded = True
+
+    def _id(self, user_id: uuid.UUID) -> int:
+        i = self.index.get(user_id)
+        if i is None:
+            i = len(self.user_ids)
+            self.user_ids.append(user_id)
+            self.index[user_id] = i
+        return i
+
+    def _row(self, direction: int, i: int) -> dict[int, float]:
+        rows = self._rows[direction]
+        if i not in rows:
+            csr = self._forward if direction == 0 else self._reverse
+            neighbours, weights = csr.row(i)
+            rows[i] = dict(zip(neighbours.tolist(), weights.tolist(), strict=True))
+            self._pending += len(neighbours)
+        return rows[i]
+
+    def set_endorsement(
+        self, endorser_id: uuid.UUID, endorsed_id: uuid.UUID, confidence: float
+    ) -> None:
+        with self.lock:
+            if not self.loaded:
+                return
+            u, v = self._id(endorser_id), self._id(endorsed_id)
+            self._row(0, u)[v] = confidence
+            self._row(1, v)[u] = confidence
+            self._pending += 1
+            self._maybe_compact()
+
+    def remove_user(self, user_id: uuid.UUID) -> None:
+        with self.lock:
+            i = self.index.get(user_id)
+            if not self.loaded or i is None or i in self._deleted:
+                return
+            self._deleted.add(i)
+            self._pending += 1
+            self._maybe_compact()
+
+    def _view(self, *, copy: bool) -> AdjacencyView:
+        rows = self._rows
+        deleted = self._deleted
+        if copy:
+            rows = (
+                {i: dict(row) for i, row in rows[0].items()},
+                {i: dict(row) for i, row in rows[1].items()},
+            )
+            deleted = set(deleted)
+        return AdjacencyView(
+            self.user_ids, self.index, self._forward, self._reverse, rows, deleted
+        )
+
+    def view(self) -> AdjacencyView:
+        """Snapshot for long reads, such as path searches, that must not block
+        writers, reloads or compaction while they run."""
+        with self.lock:
+            return self._view(copy=True)
+
+    def neighbour_ids(
+        self, i: int, *, reverse: bool = False
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Dense ids and confidences adjacent to dense id ``i``."""
+        with self.lock:
+            return self._view(copy=False).neighbour_ids(i, reverse=reverse)
+
+    def neighbours(
+        self, user_id: uuid.UUID, *, reverse: bool = False
+    ) -> dict[uuid.UUID, float]:
+        # Dense ids are only meaningful against the numbering they were read
+        # with, so translate them back before compaction can renumber
+        with self.lock:
+            i = self.index.get(user_id)
+            if i is None:
+                return {}
+            neighbours, weights = self.neighbour_ids(i, reverse=reverse)
+            return {
+                self.user_ids[j]: w
+                for j, w in zip(neighbours.tolist(), weights.tolist(), strict=True)
+            }
+
+    def _maybe_compact(self) -> None:
+        if self._pending >= settings.ENDORSEMENT_INDEX_COMPACT_EDGES:
+            self.compact()
+
+    def compact(self) -> None:
+        """Fold the overlay and deletions back into fresh CSR arrays."""
+        with self.lock:
+            rows = self._rows[0]
+            n_base = len(self._forward.indptr) - 1
+            counts = np.diff(self._forward.indptr)
+            sources = np.repeat(np.arange(n_base, dtype=np.int32), counts)
+            targets = self._forward.neighbours
+            weights = self._forward.weights
+            keep = ~np.isin(sources, list(rows))
+            extra = [(u, v, w) for u, row in rows.items() for v, w in row.items()]
+            extra_array = np.array(extra, dtype=np.float64).reshape(-1, 3)
+            sources = np.concatenate([sources[keep], extra_array[:, 0]]).astype(
+                np.int32
+            )
+            targets = np.concatenate([targets[keep], extra_array[:, 1]]).astype(
+                np.int32
+            )
+            weights = np.concatenate([weights[keep], extra_array[:, 2]])
+
+            alive = np.ones(len(self.user_ids), dtype=bool)
+            alive[list(self._deleted)] = False
+            renumber = np.cumsum(alive) - 1
+            edge_alive = alive[sources] & alive[targets]
+            user_ids = [u for u, a in zip(self.user_ids, alive, strict=True) if a]
+            self.replace(
+                user_ids,
+                renumber[sources[edge_alive]],
+                renumber[targets[edge_alive]],
+                weights[edge_alive],
+            )
+
+
+def _notify(session: Session, payload: str) -> None:
+    session.execute(select(func.pg_notify(CHANNEL, payload)))
+
+
+def notify_endorsement(
+    *,
+    session: Session,
+    endorser_id: uuid.UUID,
+    endorsed_id: uuid.UUID,
+    confidence: float,
+) -> None:
+    """Tell every worker about an endorsement write once it commits."""
+    _notify(session, f"e {endorser_id} {endorsed_id} {confidence!r}")
+
+
+def notify_user_deleted(*, session: Session, user_id: uuid.UUID) -> None:
+    _notify(session, f"d {user_id}")
+
+
+def notify_reload(*, session: Session) -> None:
+    """Tell every worker to reload, after writes too large to send one by one."""
+    _notify(session, "r")
+
+
+def apply_notification(target: AdjacencyIndex, payload: str) -> None:
+    kind, *args = payload.split()
+    if kind == "r":
+        with Session(engine) as session:
+            target.load(session)
+    elif kind == "e":
+        target.set_endorsement(uuid.UUID(args[0]), uuid.UUID(args[1]), float(args[2]))
+    elif kind == "d":
+        target.remove_user(uuid.UUID(args[0]))
+
+
+def start_listener(target: AdjacencyIndex) -> threading.Thread:
+    """Load ``target`` and keep applying changes committed by any worker.
+
+    The index is reloaded after every (re)connect, so notifications missed
+    while disconnected cannot leave it stale.
+    """
+    # LISTEN is session state, so it bypasses PgBouncer
+    dsn = str(settings.SQLALCHEMY_DIRECT_DATABASE_URI).replace(
+        "postgresql+psycopg", "postgresql"
+    )
+
+    def listen() -> None:
+        while True:
+            try:
+                with psycopg.connect(dsn, autocommit=True) as connection:
+                    connection.execute(f"LISTEN {CHANNEL}")
+                    # Anything committed before LISTEN took effect is in the reload
+                    with Session(engine) as session:
+                        target.load(session)
+                    for notification in connection.notifies():
+                        apply_notification(target, notification.payload)
+            except Exception:
+                logger.exception("Endorsement index listener failed, reconnecting")
+                threading.Event().wait(settings.ENDORSEMENT_INDEX_RECONNECT_SECONDS)
+
+    thread = threading.Thread(target=listen, name="endorsement-index", daemon=True)
+    thread.start()
+    return thread
+
+
+adjacency = AdjacencyIndex()
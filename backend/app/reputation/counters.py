@@ -0,0 +1,143 @@
+"""Denormalized endorsement counters on ``user``.
+
+Every user row carries how many endorsements it has received and given and
+the sums of their confidences. ``create_or_update_endorsement`` and
+``delete_user`` adjust them in the same transaction as the endorsement
+write, so reading them is free; ``reconcile_counters`` recomputes them from
+``endorsement`` in one statement and rewrites only the rows that drifted.
+
+Run from ``backend/`` as ``python -m app.reputation.counters``.
+"""
+
+import json
+import logging
+import sys
+import uuid
+
+from sqlalchemy import Connection, text, update
+from sqlmodel import Session
+
+from app.models import Endorsement, User
+
+logger = logging.getLogger(__name__)
+
+# Float sums drift by rounding on every increment; only repair real errors
+CONFIDENCE_TOLERANCE = 1e-6
+
+
+def adjust_counters(
+    *,
+    session: Session,
+    endorser_id: uuid.UUID,
+    endorsed_id: uuid.UUID,
+    count: int,
+    confidence: float,
+) -> None:
+    """Add ``count`` endorsements worth ``confidence`` between two users.
+
+    Increments are applied in SQL so concurrent writers never lose updates,
+    and in id order so two users endorsing each other cannot deadlock.
+    """
+    changes = {
+        endorser_id: {
+            User.endorsements_given: User.endorsements_given + count,
+            User.confidence_given: User.confidence_given + confidence,
+        },
+        endorsed_id: {
+            User.endorsements_received: User.endorsements_received + count,
+            User.confidence_received: User.confidence_received + confidence,
+        },
+    }
+    for user_id in sorted(changes):
+        session.execute(
+            update(User)
+            .where(User.id == user_id)  # type: ignore[arg-type]
+            .values(changes[user_id])
+        )
+
+
+def release_counters(*, session: Session, user_id: uuid.UUID) -> None:
+    """Take the endorsements of a user about to be deleted off the counters
+    of everyone on the other side of them."""
+    for own, other, count, total in (
+        (
+            Endorsement.endorser_id,
+            Endorsement.endorsed_id,
+            User.endorsements_received,
+            User.confidence_received,
+        ),
+        (
+            Endorsement.endorsed_id,
+            Endorsement.endorser_id,
+            User.endorsements_given,
+            User.confidence_given,
+        ),
+    ):
+        session.execute(
+            update(User)
+            .where(User.id == other, own == user_id)  # type: ignore[arg-type]
+            .values({count: count - 1, total: total - Endorsement.confidence})
+            .execution_options(synchronize_session=False)
+        )
+
+
+def reconcile_counters(connection: Connection, *, scope: str | None = None) -> int:
+    """Recompute the counters from ``endorsement`` and repair drifted rows.
+
+    ``scope`` is an optional ``SELECT`` of user ids to limit the repair to.
+    Returns the number of users whose counters were wrong. An endorsement
+    written while this runs can be repaired with a stale value; the next run
+    fixes it.
+    """
+    where = f"WHERE {{column}} IN ({scope})" if scope else ""
+    statement = f"""
+        WITH received AS (
+            SELECT endorsed_id AS id, count(*) AS n, sum(confidence) AS total
+            FROM endorsement {where.format(column="endorsed_id")}
+            GROUP BY endorsed_id
+        ), given AS (
+            SELECT endorser_id AS id, count(*) AS n, sum(confidence) AS total
+            FROM endorsement {where.format(column="endorser_id")}
+            GROUP BY endorser_id
+        ), actual AS (
+            SELECT
+                u.id,
+                coalesce(received.n, 0) AS endorsements_received,
+                coalesce(given.n, 0) AS endorsements_given,
+                coalesce(received.total, 0) AS confidence_received,
+                coalesce(given.total, 0) AS confidence_given
+            FROM "user" u
+            LEFT JOIN received ON received.id = u.id
+            LEFT JOIN given ON given.id = u.id
+            {where.format(column="u.id")}
+        )
+        UPDATE "user" u SET
+            endorsements_received = actual.endorsements_received,
+            endorsements_given = actual.endorsements_given,
+            confidence_received = actual.confidence_received,
+            confidence_given = actual.confidence_given
+        FROM actual
+        WHERE u.id = actual.id AND (
+            u.endorsements_received <> actual.endorsements_received
+            OR u.endorsements_given <> actual.endorsements_given
+            OR abs(u.confidence_received - actual.confidence_received) > :tolerance
+            OR abs(u.confidence_given - actual.confidence_given) > :tolerance
+        )
+    """
+    return connection.execute(
+        text(statement), {"tolerance": CONFIDENCE_TOLERANCE}
+    ).rowcount
+
+
+def main() -> None:
+    from app.core.db import engine
+
+    with engine.begin() as connection:
+        repaired = reconcile_counters(connection)
+    if repaired:
+        logger.warning("Repaired endorsement counters of %d users", repaired)
+    sys.stdout.write(json.dumps({"repaired": repaired}) + "\n")
+
+
+if __name__ == "__main__":
+    main()
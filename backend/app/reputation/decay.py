@@ -0,0 +1,130 @@
+"""Exponentially time-decayed rating and endorsement accumulators.
+
+Each user has one row of decayed sums anchored at a ``landmark`` time. A
+value ``v`` recorded at time ``t`` contributes ``v * 2^-((T - t) / half_life)``
+when read at time ``T``, so every write is a single upsert that rescales the
+row to the newer of the two landmarks and adds the new contribution, and
+every read rescales the row from its landmark to now. Nothing ever rescans
+the rating or endorsement tables to re-weight by age.
+"""
+
+import math
+import uuid
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import extract, func
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import Session
+
+from app.core.config import settings
+from app.models import DecayedReputation, DecayedReputationPublic
+
+ACCUMULATORS = ("rating_sum", "rating_weight", "endorsement_sum", "endorsement_weight")
+
+
+def decay_rate() -> float:
+    """Decay rate per second for the configured half-life."""
+    return math.log(2) / (settings.REPUTATION_HALF_LIFE_DAYS * 86400)
+
+
+def decay(*, since: datetime, until: datetime) -> float:
+    return math.exp(-decay_rate() * (until - since).total_seconds())
+
+
+def accumulate(
+    *, session: Session, user_id: uuid.UUID, at: datetime, **deltas: float
+) -> None:
+    """Add ``deltas`` (keyed by accumulator name) observed at ``at``.
+
+    O(1) and atomic: both the stored sums and the new values are decayed to
+    the later of the two landmarks inside one ``INSERT ... ON CONFLICT``.
+    """
+    values: dict[str, Any] = {name: deltas.get(name, 0.0) for name in ACCUMULATORS}
+    statement = insert(DecayedReputation).values(user_id=user_id, landmark=at, **values)
+    stored = DecayedReputation.__table__.c  # type: ignore[attr-defined]
+    new = statement.excluded
+    landmark = func.greatest(stored.landmark, new.landmark)
+    rate = decay_rate()
+    stored_decay = func.exp(-rate * extract("epoch", landmark - stored.landmark))
+    new_decay = func.exp(-rate * extract("epoch", landmark - new.landmark))
+    statement = statement.on_conflict_do_update(
+        index_elements=[stored.user_id],
+        set_={
+            "landmark": landmark,
+            **{
+                name: stored[name] * stored_decay + new[name] * new_decay
+                for name in ACCUMULATORS
+            },
+        },
+    )
+    session.execute(statement)
+
+
+def record_rating(
+    *, session: Session, user_id: uuid.UUID, rating: int, at: datetime
+) -> None:
+    accumulate(
+        session=session,
+        user_id=user_id,
+        at=at,
+        rating_sum=rating,
+        rating_weight=1.0,
+    )
+
+
+def record_endorsement(
+    *,
+    session: Session,
+    user_id: uuid.UUID,
+    confidence: float,
+    at: datetime,
+    previous: tuple[float, datetime] | None = None,
+) -> None:
+    """Record an endorsement of ``user_id``, replacing ``previous`` if given.
+
+    ``previous`` is the old ``(confidence, updated_at)`` of the same edge;
+    its decayed contribution is withdrawn so each edge counts once, at the
+    age of its latest update.
+    """
+    endorsement_sum = confidence
+    endorsement_weight = 1.0
+    if previous is not None:
+        old_confidence, old_at = previous
+        factor = decay(since=old_at, until=at)
+        endorsement_sum -= old_confidence * factor
+        endorsement_weight -= factor
+    accumulate(
+        session=session,
+        user_id=user_id,
+        at=at,
+        endorsement_sum=endorsement_sum,
+        endorsement_weight=endorsement_weight,
+    )
+
+
+def get_decayed_reputation(
+    *, session: Session, user_id: uuid.UUID, now: datetime | None = None
+) -> DecayedReputationPublic:
+    now = now or datetime.utcnow()
+    row = session.get(DecayedReputation, user_id)
+    sums = dict.fromkeys(ACCUMULATORS, 0.0)
+    if row:
+        factor = decay(since=row.landmark, until=now)
+        sums = {name: getattr(row, name) * factor for name in ACCUMULATORS}
+        # Withdrawn endorsements can leave tiny negative rounding residue
+        for name in ("rating_weight", "endorsement_sum", "endorsement_weight"):
+            sums[name] = max(sums[name], 0.0)
+    return DecayedReputationPublic(
+        user_id=user_id,
+        as_of=now,
+        half_life_days=settings.REPUTATION_HALF_LIFE_DAYS,
+        rating_weight=sums["rating_weight"],
+        rating_mean=(
+            sums["rating_sum"] / sums["rating_weight"]
+            if sums["rating_weight"] > 1e-9
+            else None
+        ),
+        endorsement_weight=sums["endorsement_weight"],
+        endorsement_score=sums["endorsement_sum"],
+    )
@@ -0,0 +1,356 @@
+"""Global reputation engine.
+
+Endorsements form a weighted directed graph: an edge ``i -> j`` with
+``confidence`` c means user ``i`` vouches for user ``j``. Each endorser's
+outgoing confidences are normalised into a row-stochastic local trust matrix
+``C`` and the global trust vector is the stationary distribution of
+
+    t = d * C^T t + (1 - d) * p
+
+(EigenTrust with a uniform pre-trust vector ``p``, i.e. PageRank). The whole
+graph is loaded once into a sparse matrix so each iteration is a single sparse
+mat-vec instead of per-user SQL.
+"""
+
+import logging
+import time
+import uuid
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import datetime
+
+import numpy as np
+import scipy.sparse as sp
+from sqlalchemy import update
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import Session, func, select
+
+from app.core.config import settings
+from app.models import (
+    Endorsement,
+    Reputation,
+    ReputationRunPublic,
+    ReputationState,
+    User,
+)
+from app.reputation.snapshot import write_snapshot
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class EndorsementGraph:
+    user_ids: list[uuid.UUID]
+    index: dict[uuid.UUID, int]
+    # Row-stochastic local trust matrix transposed (column i = endorser i)
+    trust_t: sp.csr_matrix
+    # Users without outgoing endorsements; their mass is redistributed via p
+    dangling: np.ndarray
+    edges: int
+    # Raw confidences, row = endorser (used by the trust flow metric)
+    confidences: sp.csr_matrix
+
+    @property
+    def size(self) -> int:
+        return len(self.user_ids)
+
+
+@dataclass
+class TrustResult:
+    scores: np.ndarray
+    iterations: int
+    residual: float
+
+
+def build_graph(
+    user_ids: Sequence[uuid.UUID],
+    sources: np.ndarray,
+    targets: np.ndarray,
+    confidences: np.ndarray,
+) -> EndorsementGraph:
+    """Build the graph from edges already expressed as dense user indices."""
+    ids = list(user_ids)
+    n = len(ids)
+    weights = np.asarray(confidences, dtype=np.float64)
+    keep = weights > 0
+    matrix = sp.csr_matrix(
+        (
+            weights[keep],
+            (
+                np.asarray(sources, dtype=np.int32)[keep],
+                np.asarray(targets, dtype=np.int32)[keep],
+            ),
+        ),
+        shape=(n, n),
+    )
+    out_weight = np.asarray(matrix.sum(axis=1)).ravel()
+    dangling = out_weight == 0
+    inv = np.divide(1.0, out_weight, out=np.zeros(n), where=~dangling)
+    trust_t = (sp.diags(inv) @ matrix).T.tocsr()
+    return EndorsementGraph(
+        user_ids=ids,
+        index={user_id: i for i, user_id in enumerate(ids)},
+        trust_t=trust_t,
+        dangling=dangling,
+        edges=matrix.nnz,
+        confidences=matrix,
+    )
+
+
+@dataclass
+class GraphEdges:
+    user_ids: list[uuid.UUID]
+    # Dense indices into user_ids, one entry per endorsement
+    sources: np.ndarray
+    targets: np.ndarray
+    confidences: np.ndarray
+
+
+def load_edges(
+    session: Session,
+    *,
+    min_confidence: float | None = None,
+    chunk_size: int | None = None,
+) -> GraphEdges:
+    """Load every user and endorsement with UUIDs mapped to dense indices in SQL.
+
+    Users are numbered by ``row_number() OVER (ORDER BY id)`` so the edge
+    query returns plain integers and no per-edge UUID hashing happens in
+    Python. Edges are streamed through a server-side cursor, ``chunk_size``
+    rows at a time, into arrays preallocated from a count. Everything runs in
+    one read-only REPEATABLE READ transaction, so the count, the user ids and
+    the numbering the edges use all agree. With ``min_confidence`` only
+    endorsements at least that strong are loaded.
+    """
+    chunk_size = chunk_size or settings.REPUTATION_LOAD_CHUNK_ROWS
+    numbered = select(
+        User.id, (func.row_number().over(order_by=User.id) - 1).label("idx")
+    ).cte("numbered")
+    source = numbered.alias("source")
+    target = numbered.alias("target")
+    statement = (
+        select(source.c.idx, target.c.idx, Endorsement.confidence)
+        .select_from(Endorsement)
+        .join(source, source.c.id == Endorsement.endorser_id)
+        .join(target, target.c.id == Endorsement.endorsed_id)
+    )
+    count_statement = select(func.count()).select_from(Endorsement)
+    if min_confidence is not None:
+        statement = statement.where(Endorsement.confidence >= min_confidence)
+        count_statement = count_statement.where(
+            Endorsement.confidence >= min_confidence
+        )
+    with session.get_bind().connect() as connection:
+        connection = connection.execution_options(
+            isolation_level="REPEATABLE READ", postgresql_readonly=True
+        )
+        user_ids = list(connection.execute(select(User.id).order_by(User.id)).scalars())
+        count = connection.execute(count_statement).scalar_one()
+        sources = np.empty(count, dtype=np.int32)
+        targets = np.empty(count, dtype=np.int32)
+        confidences = np.empty(count, dtype=np.float64)
+        loaded = 0
+        result = connection.execution_options(yield_per=chunk_size).execute(statement)
+        for rows in result.partitions():
+            chunk = np.array(rows, dtype=np.float64).reshape(-1, 3)
+            end = loaded + len(chunk)
+            sources[loaded:end] = chunk[:, 0]
+            targets[loaded:end] = chunk[:, 1]
+            confidences[loaded:end] = chunk[:, 2]
+            loaded = end
+    return GraphEdges(
+        user_ids=user_ids,
+        sources=sources[:loaded],
+        targets=targets[:loaded],
+        confidences=confidences[:loaded],
+    )
+
+
+def load_graph(session: Session) -> EndorsementGraph:
+    """Load the endorsement graph for a full run (see :func:`load_edges`)."""
+    edges = load_edges(session)
+    return build_graph(edges.user_ids, edges.sources, edges.targets, edges.confidences)
+
+
+def compute_global_trust(
+    graph: EndorsementGraph,
+    *,
+    damping: float | None = None,
+    tol: float | None = None,
+    max_iter: int | None = None,
+    pretrust: np.ndarray | None = None,
+    start: np.ndarray | None = None,
+) -> TrustResult:
+    """Run the power iteration until the L1 change drops below ``tol``."""
+    damping = settings.REPUTATION_DAMPING_FACTOR if damping is None else damping
+    tol = settings.REPUTATION_TOLERANCE if tol is None else tol
+    max_iter = settings.REPUTATION_MAX_ITERATIONS if max_iter is None else max_iter
+
+    n = graph.size
+    if n == 0:
+        return TrustResult(scores=np.zeros(0), iterations=0, residual=0.0)
+    p = np.full(n, 1.0 / n) if pretrust is None else pretrust / pretrust.sum()
+    t = p.copy() if start is None else start / start.sum()
+
+    residual = np.inf
+    iterations = 0
+    while residual >= tol and iterations < max_iter:
+        leaked = t[graph.dangling].sum()
+        nxt = damping * (graph.trust_t @ t) + (damping * leaked + 1 - damping) * p
+        residual = float(np.abs(nxt - t).sum())
+        t = nxt
+        iterations += 1
+    if residual >= tol:
+        logger.warning(
+            "Reputation did not converge after %d iterations (residual %.3g)",
+            iterations,
+            residual,
+        )
+    return TrustResult(scores=t, iterations=iterations, residual=residual)
+
+
+def load_scores(*, session: Session, graph: EndorsementGraph) -> np.ndarray | None:
+    """Previously stored scores aligned to ``graph``, for warm starts."""
+    rows = session.exec(select(Reputation.user_id, Reputation.score)).all()
+    if not rows:
+        return None
+    scores = np.zeros(graph.size)
+    for user_id, score in rows:
+        i = graph.index.get(user_id)
+        if i is not None:
+            scores[i] = max(score, 0.0)
+    # Users that joined since the last run start from the uniform share
+    scores[scores == 0] = 1.0 / max(graph.size, 1)
+    return scores
+
+
+def update_ranks(session: Session) -> int:
+    """Renumber leaderboard ranks by score, writing only rows that moved.
+
+    Returns the number of rows whose rank changed. Ties are broken by user
+    id so ranks are unique and stable between runs.
+    """
+    ranked = select(
+        Reputation.user_id,
+        func.row_number()
+        .over(order_by=(Reputation.score.desc(), Reputation.user_id))
+        .label("new_rank"),
+    ).subquery()
+    statement = (
+        update(Reputation)
+        .where(Reputation.user_id == ranked.c.user_id)
+        .where(Reputation.rank.is_distinct_from(ranked.c.new_rank))
+        .values(rank=ranked.c.new_rank)
+    )
+    return session.execute(statement).rowcount
+
+
+def store_scores(
+    *,
+    session: Session,
+    graph: EndorsementGraph,
+    scores: np.ndarray,
+    computed_at: datetime,
+) -> int:
+    """Persist a full result and reset the incremental residuals.
+
+    Returns the number of users whose leaderboard rank changed.
+    """
+    total = float(scores.sum())
+    rows = [
+        {
+            "user_id": user_id,
+            "score": float(score),
+            "ranked_score": float(score) / total if total > 0 else float(score),
+            "residual": 0.0,
+            "computed_at": computed_at,
+        }
+        for user_id, score in zip(graph.user_ids, scores, strict=True)
+    ]
+    if rows:
+        statement = insert(Reputation)
+        statement = statement.on_conflict_do_update(
+            index_elements=[Reputation.user_id],
+            set_={
+                "score": statement.excluded.score,
+                "ranked_score": statement.excluded.ranked_score,
+                "residual": statement.excluded.residual,
+                "computed_at": statement.excluded.computed_at,
+            },
+        )
+        session.execute(statement, rows)
+    state = session.get(ReputationState, 1) or ReputationState(id=1)
+    state.estimate_total = total
+    state.residual_l1 = 0.0
+    state.computed_at = computed_at
+    state.updated_at = computed_at
+    session.add(state)
+    moved = update_ranks(session)
+    session.commit()
+    return moved
+
+
+def publish_snapshot(
+    *, graph: EndorsementGraph, arrays: dict[str, np.ndarray], computed_at: datetime
+) -> int | None:
+    """Publish per-user arrays as a memory-mapped snapshot for all workers.
+
+    ``computed_at`` is the run's, so readers can tell whether scores have
+    changed since. Failing to write a snapshot does not fail the recompute;
+    readers keep serving the previous version.
+    """
+    try:
+        return write_snapshot(graph.user_ids, arrays, computed_at=computed_at)
+    except OSError:
+        logger.exception("Could not write reputation snapshot")
+        return None
+
+
+def recompute_reputation(
+    *, session: Session, warm_start: bool = True
+) -> ReputationRunPublic:
+    """Recompute global trust for every user and persist the scores.
+
+    With ``warm_start`` the iteration starts from the stored scores, which
+    after small graph changes converges in a handful of iterations.
+    """
+    started = time.perf_counter()
+    graph = load_graph(session)
+    start = load_scores(session=session, graph=graph) if warm_start else None
+    result = compute_global_trust(graph, start=start)
+    computed_at = datetime.utcnow()
+    moved = store_scores(
+        session=session, graph=graph, scores=result.scores, computed_at=computed_at
+    )
+    total = result.scores.sum()
+    arrays = {"score": result.scores / total if total > 0 else result.scores}
+    certified = None
+    if settings.TRUST_FLOW_ENABLED:
+        from app.reputation.trustflow import compute_trust_flow, seed_indices
+
+        flow = compute_trust_flow(graph, seed_indices(session=session, graph=graph))
+        arrays["certified"] = flow.certified.astype(np.int8)
+        certified = int(flow.certified.sum())
+    publish_snapshot(graph=graph, arrays=arrays, computed_at=computed_at)
+    duration = time.perf_counter() - started
+    state = session.get(ReputationState, 1)
+    if state is not None:
+        state.last_run_seconds = duration
+        session.add(state)
+        session.commit()
+    run = ReputationRunPublic(
+        users=graph.size,
+        edges=graph.edges,
+        iterations=result.iterations,
+        residual=result.residual,
+        ranks_changed=moved,
+        certified=certified,
+        duration_seconds=duration,
+    )
+    logger.info(
+        "Recomputed reputation for %d users over %d edges in %.2fs",
+        run.users,
+        run.edges,
+        run.duration_seconds,
+    )
+    return run
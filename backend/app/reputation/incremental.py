@@ -0,0 +1,245 @@
+"""Incremental reputation updates on endorsement writes.
+
+Rather than recomputing global trust after every slider change, each write
+applies a localised forward-push update (Ohsaka et al., "Efficient PageRank
+tracking in evolving networks"). The stored scores ``x`` and per-user
+residuals ``r`` keep the invariant
+
+    x + (I - d C^T)^-1 r = global trust (up to normalisation)
+
+where users without endorsements absorb their mass instead of teleporting
+it, which is why stored scores are divided by their running total on read.
+Changing endorser ``u``'s outgoing row only moves residual onto ``u``'s
+neighbours: ``r[w] += d * x[u] * (C'[u, w] - C[u, w])``. Residual is then
+pushed largest-first until the L1 error bound is back under
+``REPUTATION_INCREMENTAL_TOLERANCE`` or the per-write push budget runs out.
+A write never recomputes inline: when the bound is still exceeded, the
+remaining residuals are left in place and the background worker is signalled
+to run a warm-started full recompute. Creating or deleting a user changes
+every user's teleport share ``(1 - d) / n``, which the error bound does not
+cover, so those writes always signal a recompute as well.
+"""
+
+import logging
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+
+from sqlalchemy import update
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import Session, col, func, select
+
+from app.core.config import settings
+from app.models import Endorsement, Reputation, ReputationState
+from app.reputation import worker
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class IncrementalUpdate:
+    pushes: int
+    edges_touched: int
+    error_bound: float
+    # The bound stayed above tolerance and a full recompute was queued
+    recompute_signalled: bool
+
+
+def local_trust_rows(
+    *, session: Session, user_ids: set[uuid.UUID]
+) -> dict[uuid.UUID, dict[uuid.UUID, float]]:
+    """Normalised outgoing trust of each of ``user_ids`` in one query."""
+    statement = select(
+        Endorsement.endorser_id, Endorsement.endorsed_id, Endorsement.confidence
+    ).where(col(Endorsement.endorser_id).in_(user_ids), Endorsement.confidence > 0)
+    raw: dict[uuid.UUID, dict[uuid.UUID, float]] = {u: {} for u in user_ids}
+    for endorser_id, endorsed_id, confidence in session.exec(statement).all():
+        raw[endorser_id][endorsed_id] = confidence
+    rows = {}
+    for endorser_id, row in raw.items():
+        total = sum(row.values())
+        rows[endorser_id] = {w: c / total for w, c in row.items()}
+    return rows
+
+
+def local_trust_row(*, session: Session, user_id: uuid.UUID) -> dict[uuid.UUID, float]:
+    """Normalised outgoing trust of ``user_id`` (one row of ``C``)."""
+    return local_trust_rows(session=session, user_ids={user_id})[user_id]
+
+
+class _Residuals:
+    """Scores and residuals of the users touched by one update.
+
+    Every change is also kept as a delta, and :meth:`flush` adds the deltas
+    to the stored rows rather than overwriting them. A push of any amount
+    keeps the invariant, so concurrent updates that touch the same users
+    compose without locking them up front.
+    """
+
+    def __init__(self, session: Session, state: ReputationState) -> None:
+        self.session = session
+        self.state = state
+        self.score: dict[uuid.UUID, float] = {}
+        self.residual: dict[uuid.UUID, float] = {}
+        self.score_delta: dict[uuid.UUID, float] = {}
+        self.residual_delta: dict[uuid.UUID, float] = {}
+        self.residual_l1_delta = 0.0
+        self.estimate_total_delta = 0.0
+
+    def load(self, user_ids: set[uuid.UUID]) -> None:
+        missing = user_ids - self.score.keys()
+        if not missing:
+            return
+        statement = select(
+            Reputation.user_id, Reputation.score, Reputation.residual
+        ).where(col(Reputation.user_id).in_(missing))
+        for user_id, score, residual in self.session.exec(statement).all():
+            self.score[user_id] = score
+            self.residual[user_id] = residual
+        for user_id in missing - self.score.keys():
+            # Joined after the last full run: no score yet
+            self.score[user_id] = 0.0
+            self.residual[user_id] = 0.0
+
+    def add_residual(self, user_id: uuid.UUID, delta: float) -> None:
+        old = self.residual[user_id]
+        self.residual[user_id] = old + delta
+        self.residual_delta[user_id] = self.residual_delta.get(user_id, 0.0) + delta
+        self.residual_l1_delta += abs(old + delta) - abs(old)
+
+    def push(self, user_id: uuid.UUID) -> float:
+        amount = self.residual[user_id]
+        self.score[user_id] += amount
+        self.score_delta[user_id] = self.score_delta.get(user_id, 0.0) + amount
+        self.add_residual(user_id, -amount)
+        self.estimate_total_delta += amount
+        return amount
+
+    def frontier(self) -> list[uuid.UUID]:
+        """Users holding at least half the largest residual, largest first."""
+        pending = [u for u, r in self.residual.items() if r != 0]
+        if not pending:
+            return []
+        pending.sort(key=lambda u: abs(self.residual[u]), reverse=True)
+        cutoff = abs(self.residual[pending[0]]) / 2
+        return [u for u in pending if abs(self.residual[u]) >= cutoff]
+
+    def error_bound(self) -> float:
+        # Stored scores are divided by their total T on read. With
+        # R = ||r||_1 / (1 - d) bounding the unpushed mass, the normalised
+        # scores are within 2R / (T - R) of a full recompute in L1.
+        d = settings.REPUTATION_DAMPING_FACTOR
+        residual_l1 = max(self.state.residual_l1 + self.residual_l1_delta, 0.0)
+        total = self.state.estimate_total + self.estimate_total_delta
+        unpushed = residual_l1 / (1 - d)
+        return 2 * unpushed / max(total - unpushed, 1e-12)
+
+    def flush(self) -> None:
+        now = datetime.utcnow()
+        # Sorted so concurrent updates lock shared rows in the same order
+        user_ids = sorted(self.score_delta.keys() | self.residual_delta.keys())
+        rows = [
+            {
+                "user_id": user_id,
+                "score": self.score_delta.get(user_id, 0.0),
+                "residual": self.residual_delta.get(user_id, 0.0),
+                "computed_at": now,
+            }
+            for user_id in user_ids
+        ]
+        if rows:
+            statement = insert(Reputation)
+            statement = statement.on_conflict_do_update(
+                index_elements=[Reputation.user_id],
+                set_={
+                    "score": Reputation.score + statement.excluded.score,
+                    "residual": Reputation.residual + statement.excluded.residual,
+                    "computed_at": statement.excluded.computed_at,
+                },
+            )
+            self.session.execute(statement, rows)
+        self.session.execute(
+            update(ReputationState)
+            .where(col(ReputationState.id) == self.state.id)
+            .values(
+                residual_l1=func.greatest(
+                    ReputationState.residual_l1 + self.residual_l1_delta, 0.0
+                ),
+                estimate_total=ReputationState.estimate_total
+                + self.estimate_total_delta,
+                updated_at=now,
+            )
+        )
+        self.session.expire(self.state)
+
+
+def apply_endorsement_change(
+    *,
+    session: Session,
+    endorser_id: uuid.UUID,
+    old_row: dict[uuid.UUID, float],
+) -> IncrementalUpdate | None:
+    """Fold a change of ``endorser_id``'s outgoing endorsements into the scores.
+
+    ``old_row`` is :func:`local_trust_row` taken before the write; the new
+    edge must already be flushed. Runs inside the caller's transaction.
+    Nothing is locked while pushing: the touched rows and the running totals
+    are updated with relative ``x = x + delta`` writes at the end, so
+    concurrent writes only wait on each other for rows they share, from the
+    flush until commit. Returns ``None`` when no full run has happened yet.
+    """
+    state = session.exec(
+        select(ReputationState).execution_options(populate_existing=True)
+    ).first()
+    if state is None:
+        return None
+    d = settings.REPUTATION_DAMPING_FACTOR
+    tolerance = settings.REPUTATION_INCREMENTAL_TOLERANCE
+    budget = settings.REPUTATION_INCREMENTAL_PUSH_BUDGET
+
+    new_row = local_trust_row(session=session, user_id=endorser_id)
+    touched = old_row.keys() | new_row.keys()
+    residuals = _Residuals(session, state)
+    residuals.load(touched | {endorser_id})
+    source_score = residuals.score[endorser_id]
+    for user_id in touched:
+        change = new_row.get(user_id, 0.0) - old_row.get(user_id, 0.0)
+        residuals.add_residual(user_id, d * source_score * change)
+
+    pushes = 0
+    edges_touched = len(touched)
+    while residuals.error_bound() > tolerance / 2 and edges_touched < budget:
+        frontier = residuals.frontier()
+        if not frontier:
+            break
+        # One round trip for the rows of the whole frontier and one for
+        # their neighbours' scores, instead of two per push
+        rows = local_trust_rows(session=session, user_ids=set(frontier))
+        residuals.load({w for row in rows.values() for w in row})
+        for user_id in frontier:
+            if edges_touched >= budget:
+                break
+            amount = residuals.push(user_id)
+            row = rows[user_id]
+            for neighbour, weight in row.items():
+                residuals.add_residual(neighbour, d * amount * weight)
+            pushes += 1
+            edges_touched += len(row) + 1
+    residuals.flush()
+
+    error_bound = residuals.error_bound()
+    recompute_signalled = error_bound > tolerance
+    if recompute_signalled:
+        logger.info(
+            "Incremental reputation error bound %.3g exceeds %.3g, "
+            "queueing a recompute",
+            error_bound,
+            tolerance,
+        )
+        worker.signal_dirty(session=session, reason="incremental")
+    return IncrementalUpdate(
+        pushes=pushes,
+        edges_touched=edges_touched,
+        error_bound=error_bound,
+        recompute_signalled=recompute_signalled,
+    )
@@ -0,0 +1,312 @@
+"""Strongest endorsement chain between two users.
+
+The weight of a path is the product of the confidences along it, so the
+strongest path within ``max_depth`` hops is a hop-limited max-product path.
+It is found with a layered bidirectional search: layer ``k`` of the forward
+side holds the best weight reaching each user in exactly ``k`` endorsements
+from the source, the backward side does the same over reverse edges from the
+target, and every new layer is joined against the opposite side's layers
+whose depths still fit under the cap. The side with the smaller frontier is
+expanded next.
+
+Two bounds keep the frontiers small: a user is only re-entered with a
+strictly higher weight than it was reached with before (so no cycles, since
+confidences are at most 1), and no partial path weighing less than the best
+complete path found so far is extended. Layers are NumPy arrays over dense
+user ids and are expanded strongest-first in chunks, so a hub with millions
+of endorsers costs a few array operations, and the deadline is checked
+between chunks. When it passes, the best path found so far is returned as a
+partial answer.
+"""
+
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Protocol
+
+import numpy as np
+from sqlmodel import Session, col, select
+
+from app.core.config import settings
+from app.models import Endorsement
+from app.reputation.adjacency import AdjacencyView
+
+# Frontier users expanded per deadline check
+CHUNK = 1024
+
+FOUND = "found"
+PARTIAL = "partial"
+NO_PATH = "no_path"
+TIMEOUT = "timeout"
+
+
+@dataclass
+class TrustPath:
+    # FOUND: strongest path within the depth cap; PARTIAL: best path found
+    # before the deadline; NO_PATH: none within the cap; TIMEOUT: none found
+    # before the deadline
+    status: str
+    path: list[uuid.UUID] = field(default_factory=list)
+    confidences: list[float] = field(default_factory=list)
+    weight: float = 0.0
+    explored: int = 0
+
+
+class EdgeSource(Protocol):
+    """Endorsements over dense user ids."""
+
+    def dense_id(self, user_id: uuid.UUID) -> int | None: ...
+
+    def user_id(self, i: int) -> uuid.UUID: ...
+
+    def rows(
+        self, ids: np.ndarray, *, reverse: bool
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(position in ``ids``, neighbour, confidence) of every edge."""
+        ...
+
+
+class IndexEdges:
+    """Edges served from a view of the in-memory adjacency index, whose dense
+    ids stay stable for the whole search without holding the index lock."""
+
+    def __init__(self, view: AdjacencyView) -> None:
+        self.view = view
+
+    def dense_id(self, user_id: uuid.UUID) -> int | None:
+        return self.view.dense_id(user_id)
+
+    def user_id(self, i: int) -> uuid.UUID:
+        return self.view.user_id(i)
+
+    def rows(
+        self, ids: np.ndarray, *, reverse: bool
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        rows = [self.view.neighbour_ids(int(i), reverse=reverse) for i in ids]
+        counts = [len(neighbours) for neighbours, _ in rows]
+        if not sum(counts):
+            return _EMPTY_ROWS
+        return (
+            np.repeat(np.arange(len(ids)), counts),
+            np.concatenate([neighbours for neighbours, _ in rows]),
+            np.concatenate([weights for _, weights in rows]).astype(np.float64),
+        )
+
+
+class SqlEdges:
+    """Edges fetched with one ``IN (...)`` query per frontier chunk, numbering
+    users as they are first seen."""
+
+    def __init__(self, session: Session) -> None:
+        self.session = session
+        self.user_ids: list[uuid.UUID] = []
+        self.index: dict[uuid.UUID, int] = {}
+
+    def _number(self, user_id: uuid.UUID) -> int:
+        i = self.index.get(user_id)
+        if i is None:
+            i = self.index[user_id] = len(self.user_ids)
+            self.user_ids.append(user_id)
+        return i
+
+    def dense_id(self, user_id: uuid.UUID) -> int | None:
+        return self._number(user_id)
+
+    def user_id(self, i: int) -> uuid.UUID:
+        return self.user_ids[i]
+
+    def rows(
+        self, ids: np.ndarray, *, reverse: bool
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        near, far = (
+            (Endorsement.endorsed_id, Endorsement.endorser_id)
+            if reverse
+            else (Endorsement.endorser_id, Endorsement.endorsed_id)
+        )
+        position = {self.user_ids[i]: p for p, i in enumerate(ids.tolist())}
+        statement = select(near, far, Endorsement.confidence).where(
+            col(near).in_(list(position)), Endorsement.confidence > 0
+        )
+        edges = [
+            (position[u], self._number(v), c)
+            for u, v, c in self.session.exec(statement).all()
+        ]
+        if not edges:
+            return _EMPTY_ROWS
+        array = np.array(edges, dtype=np.float64)
+        return (
+            array[:, 0].astype(np.int64),
+            array[:, 1].astype(np.int64),
+            array[:, 2],
+        )
+
+
+_EMPTY_ROWS = (
+    np.zeros(0, dtype=np.int64),
+    np.zeros(0, dtype=np.int64),
+    np.zeros(0, dtype=np.float64),
+)
+
+
+@dataclass
+class _Layer:
+    """Users reached in exactly k hops, strongest first; ``parents`` are in
+    layer k - 1 and ``confidences`` are of the edge joining the two."""
+
+    users: np.ndarray
+    weights: np.ndarray
+    parents: np.ndarray
+    confidences: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.users)
+
+
+class _Side:
+    def __init__(self, root: int, *, reverse: bool) -> None:
+        self.reverse = reverse
+        self.layers = [
+            _Layer(
+                users=np.array([root]),
+                weights=np.ones(1),
+                parents=np.array([-1]),
+                confidences=np.ones(1),
+            )
+        ]
+        # Best weight each dense id has been reached with on this side
+        self.best = np.zeros(max(root + 1, 1024))
+        self.best[root] = 1.0
+
+    @property
+    def depth(self) -> int:
+        return len(self.layers) - 1
+
+    @property
+    def frontier(self) -> _Layer:
+        return self.layers[-1]
+
+    def grow(self, size: int) -> None:
+        if size > len(self.best):
+            best = np.zeros(max(size, 2 * len(self.best)))
+            best[: len(self.best)] = self.best
+            self.best = best
+
+    def chain(self, user: int, depth: int) -> list[tuple[int, float]]:
+        """Users from ``user`` back to the root, with the confidence of the
+        edge joining each one to the next."""
+        chain = []
+        for layer in reversed(self.layers[: depth + 1]):
+            position = int(np.flatnonzero(layer.users == user)[0])
+            chain.append((user, float(layer.confidences[position])))
+            user = int(layer.parents[position])
+        return chain
+
+
+def strongest_path(
+    source_id: uuid.UUID,
+    target_id: uuid.UUID,
+    edges: EdgeSource,
+    *,
+    max_depth: int | None = None,
+    time_budget_ms: float | None = None,
+) -> TrustPath:
+    max_depth = settings.TRUST_PATH_MAX_DEPTH if max_depth is None else max_depth
+    time_budget_ms = (
+        settings.TRUST_PATH_TIME_BUDGET_MS if time_budget_ms is None else time_budget_ms
+    )
+    deadline = time.perf_counter() + time_budget_ms / 1000
+
+    source, target = edges.dense_id(source_id), edges.dense_id(target_id)
+    if source is None or target is None:
+        return TrustPath(status=NO_PATH)
+    forward = _Side(source, reverse=False)
+    backward = _Side(target, reverse=True)
+    # Best meeting so far: (weight, dense id, forward depth, backward depth)
+    meeting: tuple[float, int, int, int] | None = None
+    explored = 0
+    timed_out = False
+
+    while forward.depth + backward.depth < max_depth:
+        candidates = [side for side in (forward, backward) if len(side.frontier)]
+        if not candidates:
+            break
+        side = min(candidates, key=lambda s: len(s.frontier))
+        other = backward if side is forward else forward
+        bound = meeting[0] if meeting else 0.0
+
+        frontier = side.frontier
+        found: list[tuple[np.ndarray, ...]] = []
+        for start in range(0, len(frontier), CHUNK):
+            if time.perf_counter() >= deadline:
+                timed_out = True
+                break
+            users = frontier.users[start : start + CHUNK]
+            positions, neighbours, confidences = edges.rows(users, reverse=side.reverse)
+            explored += len(users)
+            if not len(neighbours):
+                continue
+            side.grow(int(neighbours.max()) + 1)
+            reached = frontier.weights[start : start + CHUNK][positions] * confidences
+            keep = (reached > bound) & (reached > side.best[neighbours])
+            found.append(
+                (
+                    neighbours[keep],
+                    reached[keep],
+                    users[positions[keep]],
+                    confidences[keep],
+                )
+            )
+
+        layer = _reduce(found)
+        side.layers.append(layer)
+        side.best[layer.users] = layer.weights
+
+        for other_depth, other_layer in enumerate(other.layers):
+            if side.depth + other_depth > max_depth:
+                break
+            common, mine, theirs = np.intersect1d(
+                layer.users, other_layer.users, assume_unique=True, return_indices=True
+            )
+            if not len(common):
+                continue
+            weights = layer.weights[mine] * other_layer.weights[theirs]
+            best = int(np.argmax(weights))
+            if meeting is None or weights[best] > meeting[0]:
+                depths = (
+                    (side.depth, other_depth)
+                    if side is forward
+                    else (other_depth, side.depth)
+                )
+                meeting = (float(weights[best]), int(common[best]), *depths)
+        if timed_out:
+            break
+
+    if meeting is None:
+        return TrustPath(status=TIMEOUT if timed_out else NO_PATH, explored=explored)
+
+    weight, user, forward_depth, backward_depth = meeting
+    head = forward.chain(user, forward_depth)[::-1]
+    tail = backward.chain(user, backward_depth)
+    return TrustPath(
+        status=PARTIAL if timed_out else FOUND,
+        path=[edges.user_id(u) for u, _ in head + tail[1:]],
+        confidences=[c for _, c in head[1:]] + [c for _, c in tail[:-1]],
+        weight=weight,
+        explored=explored,
+    )
+
+
+def _reduce(found: list[tuple[np.ndarray, ...]]) -> _Layer:
+    """Keep the strongest arrival at each user, ordered strongest first."""
+    if not found:
+        empty = np.zeros(0, dtype=np.int64)
+        return _Layer(empty, np.zeros(0), empty, np.zeros(0))
+    users, weights, parents, confidences = (
+        np.concatenate(c) for c in zip(*found, strict=True)
+    )
+    order = np.lexsort((-weights, users))
+    first = np.ones(len(order), dtype=bool)
+    first[1:] = users[order][1:] != users[order][:-1]
+    order = order[first]
+    order = order[np.argsort(-weights[order], kind="stable")]
+    return _Layer(users[order], weights[order], parents[order], confidences[order])
@@ -0,0 +1,129 @@
+"""Personalized trust: approximate personalized PageRank from one viewer.
+
+Uses forward push (Andersen, Chung & Lang) from the viewer. Every pushed
+user keeps ``1 - d`` of its residual as settled trust and passes the rest
+along its normalised endorsements. The unsettled residual mass bounds the
+error of every estimate, so callers trade accuracy for latency through
+``epsilon`` (no user with more residual than this is left unpushed) and a
+hard time budget, checked every ``PUSH_CHECK_INTERVAL`` pushes so a single
+wide round cannot overrun it.
+
+Push rounds are synchronous: all users over the threshold are pushed
+together so each round costs one neighbourhood lookup.
+"""
+
+import time
+import uuid
+from collections.abc import Callable, Collection
+from dataclasses import dataclass
+
+from sqlmodel import Session, col, select
+
+from app.core.config import settings
+from app.models import Endorsement
+from app.reputation.adjacency import AdjacencyIndex
+
+PUSH_CHECK_INTERVAL = 64
+
+# Maps endorsers to their normalised outgoing trust rows
+NeighbourLookup = Callable[
+    [Collection[uuid.UUID]], dict[uuid.UUID, dict[uuid.UUID, float]]
+]
+
+
+@dataclass
+class PersonalizedTrust:
+    scores: dict[uuid.UUID, float]
+    # Unsettled residual mass; no estimate is off by more than this
+    error_bound: float
+    converged: bool
+    rounds: int
+
+
+def sql_neighbours(session: Session) -> NeighbourLookup:
+    """Neighbour lookup issuing one ``endorser_id IN (...)`` query per round."""
+
+    def lookup(
+        user_ids: Collection[uuid.UUID],
+    ) -> dict[uuid.UUID, dict[uuid.UUID, float]]:
+        statement = select(
+            Endorsement.endorser_id, Endorsement.endorsed_id, Endorsement.confidence
+        ).where(
+            col(Endorsement.endorser_id).in_(list(user_ids)),
+            Endorsement.confidence > 0,
+        )
+        rows: dict[uuid.UUID, dict[uuid.UUID, float]] = {u: {} for u in user_ids}
+        for endorser_id, endorsed_id, confidence in session.exec(statement).all():
+            rows[endorser_id][endorsed_id] = confidence
+        for row in rows.values():
+            total = sum(row.values())
+            for endorsed_id in row:
+                row[endorsed_id] /= total
+        return rows
+
+    return lookup
+
+
+def index_neighbours(index: AdjacencyIndex) -> NeighbourLookup:
+    """Neighbour lookup served from the in-memory adjacency index."""
+
+    def lookup(
+        user_ids: Collection[uuid.UUID],
+    ) -> dict[uuid.UUID, dict[uuid.UUID, float]]:
+        rows: dict[uuid.UUID, dict[uuid.UUID, float]] = {}
+        for user_id in user_ids:
+            row = {v: c for v, c in index.neighbours(user_id).items() if c > 0}
+            total = sum(row.values())
+            rows[user_id] = {v: c / total for v, c in row.items()}
+        return rows
+
+    return lookup
+
+
+def forward_push(
+    source_id: uuid.UUID,
+    neighbours: NeighbourLookup,
+    *,
+    epsilon: float | None = None,
+    time_budget_ms: float | None = None,
+    damping: float | None = None,
+) -> PersonalizedTrust:
+    epsilon = settings.PERSONALIZED_TRUST_EPSILON if epsilon is None else epsilon
+    time_budget_ms = (
+        settings.PERSONALIZED_TRUST_TIME_BUDGET_MS
+        if time_budget_ms is None
+        else time_budget_ms
+    )
+    damping = settings.REPUTATION_DAMPING_FACTOR if damping is None else damping
+    deadline = time.perf_counter() + time_budget_ms / 1000
+
+    scores: dict[uuid.UUID, float] = {}
+    residual: dict[uuid.UUID, float] = {source_id: 1.0}
+    cache: dict[uuid.UUID, dict[uuid.UUID, float]] = {}
+    rounds = 0
+    timed_out = False
+    while not timed_out:
+        frontier = [u for u, r in residual.items() if r > epsilon]
+        if not frontier or time.perf_counter() >= deadline:
+            break
+        missing = [u for u in frontier if u not in cache]
+        if missing:
+            cache.update(neighbours(missing))
+        for pushed, user_id in enumerate(frontier):
+            # Unpushed users keep their residual, so the bound stays valid
+            if pushed % PUSH_CHECK_INTERVAL == 0 and time.perf_counter() >= deadline:
+                timed_out = True
+                break
+            amount = residual.pop(user_id)
+            scores[user_id] = scores.get(user_id, 0.0) + (1 - damping) * amount
+            for neighbour, weight in cache[user_id].items():
+                residual[neighbour] = (
+                    residual.get(neighbour, 0.0) + damping * amount * weight
+                )
+        rounds += 1
+    return PersonalizedTrust(
+        scores=scores,
+        error_bound=sum(residual.values()),
+        converged=not frontier,
+        rounds=rounds,
+    )
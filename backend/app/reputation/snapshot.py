@@ -0,0 +1,179 @@
+"""Versioned, memory-mapped reputation snapshots shared by worker processes.
+
+Each full recompute writes a new version directory of plain ``.npy`` files:
+
+    <REPUTATION_SNAPSHOT_DIR>/
+        CURRENT                       name of the live version
+        01760700000000000000/
+            meta.json                 version, computed_at, users
+            ids.npy                   sorted UUID bytes (dtype V16)
+            score.npy                 normalised scores aligned with ids
+
+Arrays are opened with ``np.load(mmap_mode="r")`` so every worker on a host
+maps the same page-cache pages instead of holding its own copy. A version is
+written to a temporary directory, renamed into place and only then published
+by atomically replacing ``CURRENT``; readers notice the new inode on their
+next lookup and swap without restarting. Old versions are unlinked once
+superseded, which is safe while a worker still maps them.
+"""
+
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+import uuid
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+CURRENT = "CURRENT"
+IDS = "ids"
+
+
+def uuid_keys(user_ids: Sequence[uuid.UUID]) -> np.ndarray:
+    """UUIDs as fixed-width bytes, ordered like PostgreSQL orders ``uuid``."""
+    return np.frombuffer(b"".join(u.bytes for u in user_ids), dtype="V16")
+
+
+@dataclass
+class ReputationSnapshot:
+    version: int
+    computed_at: datetime
+    path: Path
+    ids: np.ndarray
+    arrays: dict[str, np.ndarray]
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def index(self, user_id: uuid.UUID) -> int | None:
+        """Position of ``user_id`` in the arrays, by binary search."""
+        key = np.void(user_id.bytes)
+        i = int(np.searchsorted(self.ids, key))
+        if i < len(self.ids) and self.ids[i] == key:
+            return i
+        return None
+
+    def lookup(self, user_id: uuid.UUID, name: str = "score") -> float | None:
+        """Value of array ``name`` for ``user_id``; None if either is missing."""
+        i = self.index(user_id)
+        if i is None or name not in self.arrays:
+            return None
+        return float(self.arrays[name][i])
+
+    def lookup_many(
+        self, user_ids: Sequence[uuid.UUID], name: str = "score"
+    ) -> dict[uuid.UUID, float]:
+        """Values of array ``name`` for the ``user_ids`` in the snapshot."""
+        if not user_ids or name not in self.arrays or not len(self.ids):
+            return {}
+        keys = uuid_keys(user_ids)
+        positions = np.searchsorted(self.ids, keys)
+        clipped = np.minimum(positions, len(self.ids) - 1)
+        found = self.ids[clipped] == keys
+        values = self.arrays[name][clipped[found]].tolist()
+        hits = [u for u, hit in zip(user_ids, found.tolist(), strict=True) if hit]
+        return dict(zip(hits, values, strict=True))
+
+
+def write_snapshot(
+    user_ids: Sequence[uuid.UUID],
+    arrays: Mapping[str, np.ndarray],
+    *,
+    computed_at: datetime,
+    directory: str | None = None,
+    keep: int | None = None,
+) -> int:
+    """Write and publish a new snapshot version; returns its version number."""
+    root = Path(directory or settings.REPUTATION_SNAPSHOT_DIR)
+    keep = settings.REPUTATION_SNAPSHOT_KEEP if keep is None else keep
+    root.mkdir(parents=True, exist_ok=True)
+    version = time.time_ns()
+    name = f"{version:020d}"
+
+    ids = uuid_keys(user_ids)
+    order = np.argsort(ids, kind="stable")
+    staging = root / f".{name}.tmp"
+    staging.mkdir()
+    np.save(staging / f"{IDS}.npy", ids[order])
+    for array_name, values in arrays.items():
+        np.save(staging / f"{array_name}.npy", np.asarray(values)[order])
+    meta = {"version": version, "computed_at": computed_at.isoformat()}
+    (staging / "meta.json").write_text(json.dumps({**meta, "users": len(ids)}))
+    staging.rename(root / name)
+
+    pointer = root / f".{CURRENT}.{name}.tmp"
+    pointer.write_text(name)
+    os.replace(pointer, root / CURRENT)
+    _prune(root, keep=keep)
+    return version
+
+
+def _prune(root: Path, *, keep: int) -> None:
+    versions = sorted(p for p in root.iterdir() if p.is_dir() and p.name.isdigit())
+    for path in versions[: max(len(versions) - keep, 0)]:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def open_snapshot(path: Path) -> ReputationSnapshot:
+    meta = json.loads((path / "meta.json").read_text())
+    arrays = {
+        p.stem: np.load(p, mmap_mode="r") for p in path.glob("*.npy") if p.stem != IDS
+    }
+    return ReputationSnapshot(
+        version=meta["version"],
+        computed_at=datetime.fromisoformat(meta["computed_at"]),
+        path=path,
+        ids=np.load(path / f"{IDS}.npy", mmap_mode="r"),
+        arrays=arrays,
+    )
+
+
+class SnapshotReader:
+    """Per-process handle on the latest snapshot.
+
+    ``current()`` costs one ``stat`` of ``CURRENT`` when nothing changed, and
+    remaps only when the pointer file has been replaced.
+    """
+
+    def __init__(self, directory: str | None = None) -> None:
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._stamp: tuple[int, int] | None = None
+        self._snapshot: ReputationSnapshot | None = None
+
+    @property
+    def root(self) -> Path:
+        return Path(self.directory or settings.REPUTATION_SNAPSHOT_DIR)
+
+    def current(self) -> ReputationSnapshot | None:
+        try:
+            stat = (self.root / CURRENT).stat()
+        except FileNotFoundError:
+            return None
+        stamp = (stat.st_ino, stat.st_mtime_ns)
+        if stamp == self._stamp:
+            return self._snapshot
+        with self._lock:
+            if stamp != self._stamp:
+                try:
+                    name = (self.root / CURRENT).read_text().strip()
+                    self._snapshot = open_snapshot(self.root / name)
+                    self._stamp = stamp
+                except FileNotFoundError:
+                    # Pruned between reading the pointer and opening it; the
+                    # next call sees the newer pointer
+                    logger.warning("Reputation snapshot in %s vanished", self.root)
+        return self._snapshot
+
+
+snapshots = SnapshotReader()
@@ -0,0 +1,118 @@
+"""Debounced background reputation recompute.
+
+Endorsement and rating writes insert a row into ``reputationsignal`` in
+their own transaction instead of recomputing. The worker polls the queue
+and, once the oldest pending signal is ``REPUTATION_RECOMPUTE_WINDOW_SECONDS``
+old, claims every signal up to the newest one and runs a single recompute
+for the whole burst. A PostgreSQL advisory lock keeps one recompute running
+at a time, so the standalone worker and any number of in-process workers can
+run side by side. The lock is held by a connection of ``direct_engine``:
+session-level locks taken through PgBouncer transaction pooling would stay
+behind on whichever server connection ran the statement.
+"""
+
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import Engine, delete
+from sqlmodel import Session, col, func, select
+
+from app.core.config import settings
+from app.core.db import direct_engine
+from app.models import (
+    ReputationRunPublic,
+    ReputationSignal,
+    ReputationState,
+    ReputationWorkerStatusPublic,
+)
+from app.reputation.engine import recompute_reputation
+
+logger = logging.getLogger(__name__)
+
+# Arbitrary application-wide key for pg_try_advisory_lock
+ADVISORY_LOCK_KEY = 0x52455055
+
+
+def signal_dirty(*, session: Session, reason: str) -> None:
+    """Queue a recompute; committed together with the caller's write."""
+    session.add(ReputationSignal(reason=reason))
+
+
+def worker_status(*, session: Session) -> ReputationWorkerStatusPublic:
+    depth, oldest = session.exec(
+        select(func.count(), func.min(ReputationSignal.created_at))
+    ).one()
+    state = session.get(ReputationState, 1)
+    return ReputationWorkerStatusPublic(
+        queue_depth=depth,
+        oldest_signal_at=oldest,
+        window_seconds=settings.REPUTATION_RECOMPUTE_WINDOW_SECONDS,
+        last_run_at=state.computed_at if state else None,
+        last_run_seconds=state.last_run_seconds if state else None,
+    )
+
+
+def run_once(db_engine: Engine, *, force: bool = False) -> ReputationRunPublic | None:
+    """Recompute if the oldest signal has waited a full window.
+
+    Returns ``None`` when there was nothing due or another process holds
+    the recompute lock.
+    """
+    with direct_engine.connect() as lock_connection:
+        locked = lock_connection.scalar(
+            select(func.pg_try_advisory_lock(ADVISORY_LOCK_KEY))
+        )
+        lock_connection.commit()
+        if not locked:
+            return None
+        try:
+            with Session(db_engine) as session:
+                oldest, newest_id = session.exec(
+                    select(
+                        func.min(ReputationSignal.created_at),
+                        func.max(ReputationSignal.id),
+                    )
+                ).one()
+                window = timedelta(seconds=settings.REPUTATION_RECOMPUTE_WINDOW_SECONDS)
+                if oldest is None or (
+                    not force and datetime.utcnow() - oldest < window
+                ):
+                    return None
+                # Signals arriving from here on belong to the next window
+                session.execute(
+                    delete(ReputationSignal).where(
+                        col(ReputationSignal.id) <= newest_id
+                    )
+                )
+                return recompute_reputation(session=session)
+        finally:
+            lock_connection.scalar(select(func.pg_advisory_unlock(ADVISORY_LOCK_KEY)))
+            lock_connection.commit()
+
+
+def run_forever(db_engine: Engine) -> None:
+    poll = settings.REPUTATION_WORKER_POLL_SECONDS
+    logger.info(
+        "Reputation worker polling every %ss, window %ss",
+        poll,
+        settings.REPUTATION_RECOMPUTE_WINDOW_SECONDS,
+    )
+    while True:
+        try:
+            run_once(db_engine)
+        except Exception:
+            logger.exception("Reputation recompute failed")
+        time.sleep(poll)
+
+
+async def run_in_process(db_engine: Engine) -> None:
+    """Asyncio variant for small deployments, started from the app lifespan."""
+    poll = settings.REPUTATION_WORKER_POLL_SECONDS
+    while True:
+        try:
+            await asyncio.to_thread(run_once, db_engine)
+        except Exception:
+            logger.exception("Reputation recompute failed")
+        await asyncio.sleep(poll)
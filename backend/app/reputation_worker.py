@@ -0,0 +1,16 @@
+import logging
+
+from app.core.db import engine
+from app.reputation.worker import run_forever
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def main() -> None:
+    logger.info("Starting reputation worker")
+    run_forever(engine)
+
+
+if __name__ == "__main__":
+    main()
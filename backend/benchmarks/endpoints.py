@@ -0,0 +1,337 @@
+"""Concurrent benchmark of the endorsement, interaction, search and login
+endpoints.
+
+Generate users first with ``benchmarks.workload`` (same ``--seed`` and
+``--password``), start the API, then run from ``backend/``:
+
+    python -m benchmarks.endpoints --base-url http://localhost:8000 \\
+        --concurrency 50 --duration 60 --output results.json
+
+``--in-process`` drives the ASGI app directly instead of a server. Each
+client loops over a weighted mix of scenarios (``--mix``) as one of the
+generated users. Per scenario the report holds request and error counts,
+throughput and p50/p95/p99 latency, plus the commit the run was made on.
+With ``--baseline`` an earlier report is compared and every scenario whose
+p95 grew by more than ``--tolerance`` is listed under ``regressions``.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import random
+import subprocess
+import sys
+import time
+import uuid
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any
+
+import httpx
+import numpy as np
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.core.db import engine
+from benchmarks.workload import FIRST_NAMES, email_prefix
+
+API = settings.API_V1_STR
+
+
+@dataclass
+class Account:
+    user_id: uuid.UUID
+    email: str
+    headers: dict[str, str] = field(default_factory=dict)
+
+
+@dataclass
+class Context:
+    client: httpx.AsyncClient
+    accounts: list[Account]
+    password: str
+    rng: random.Random
+
+    def other(self, account: Account) -> Account:
+        while (other := self.rng.choice(self.accounts)) is account:
+            pass
+        return other
+
+
+Scenario = Callable[[Context, Account], Awaitable[httpx.Response]]
+
+
+async def login(ctx: Context, account: Account) -> httpx.Response:
+    return await ctx.client.post(
+        f"{API}/login/access-token",
+        data={"username": account.email, "password": ctx.password},
+    )
+
+
+async def search(ctx: Context, account: Account) -> httpx.Response:
+    query = ctx.rng.choice(FIRST_NAMES)[: ctx.rng.randint(2, 5)]
+    return await ctx.client.get(
+        f"{API}/users/search",
+        params={"query": query, "limit": 20},
+        headers=account.headers,
+    )
+
+
+async def endorse(ctx: Context, account: Account) -> httpx.Response:
+    return await ctx.client.post(
+        f"{API}/endorsements/",
+        json={
+            "endorsed_id": str(ctx.other(account).user_id),
+            "confidence": round(ctx.rng.random(), 3),
+        },
+        headers=account.headers,
+    )
+
+
+async def read_endorsers(ctx: Context, account: Account) -> httpx.Response:
+    return await ctx.client.get(
+        f"{API}/endorsements/{ctx.other(account).user_id}/endorsers",
+        headers=account.headers,
+    )
+
+
+async def interact(ctx: Context, account: Account) -> httpx.Response:
+    return await ctx.client.post(
+        f"{API}/interactions/",
+        json={"target_id": str(ctx.other(account).user_id), "message": "benchmark"},
+        headers=account.headers,
+    )
+
+
+async def read_interactions(ctx: Context, account: Account) -> httpx.Response:
+    return await ctx.client.get(
+        f"{API}/interactions/users/{account.user_id}",
+        params={"limit": 50},
+        headers=account.headers,
+    )
+
+
+SCENARIOS: dict[str, Scenario] = {
+    "login": login,
+    "search": search,
+    "endorse": endorse,
+    "read_endorsers": read_endorsers,
+    "interact": interact,
+    "read_interactions": read_interactions,
+}
+DEFAULT_MIX = (
+    "login=1,search=4,endorse=2,read_endorsers=4,interact=1,read_interactions=3"
+)
+
+
+def parse_mix(value: str) -> dict[str, float]:
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        if name not in SCENARIOS:
+            raise argparse.ArgumentTypeError(f"unknown scenario {name!r}")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def load_accounts(seed: int, count: int) -> list[Account]:
+    with engine.connect() as connection:
+        rows = connection.execute(
+            text(
+                'SELECT id, email FROM "user" WHERE email LIKE :pattern'
+                " ORDER BY random() LIMIT :count"
+            ),
+            {"pattern": f"{email_prefix(seed)}%", "count": count},
+        ).all()
+    if len(rows) < 2:
+        raise SystemExit(
+            f"No generated users for seed {seed}; run benchmarks.workload first"
+        )
+    return [Account(user_id=user_id, email=email) for user_id, email in rows]
+
+
+async def authenticate(ctx: Context, concurrency: int) -> None:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(account: Account) -> None:
+        async with semaphore:
+            response = await login(ctx, account)
+            response.raise_for_status()
+            token = response.json()["access_token"]
+            account.headers = {"Authorization": f"Bearer {token}"}
+
+    await asyncio.gather(*(one(account) for account in ctx.accounts))
+
+
+async def drive(
+    ctx: Context,
+    mix: dict[str, float],
+    *,
+    concurrency: int,
+    duration: float,
+    warmup: float,
+) -> tuple[dict[str, list[float]], dict[str, int], float]:
+    latencies: dict[str, list[float]] = {name: [] for name in mix}
+    errors: dict[str, int] = dict.fromkeys(mix, 0)
+    names, weights = list(mix), list(mix.values())
+    started = time.perf_counter()
+    measure_from = started + warmup
+    deadline = measure_from + duration
+
+    async def client(n: int) -> None:
+        rng = random.Random(n)
+        while (now := time.perf_counter()) < deadline:
+            name = rng.choices(names, weights)[0]
+            account = rng.choice(ctx.accounts)
+            try:
+                response = await SCENARIOS[name](ctx, account)
+                failed = response.status_code >= 400
+            except httpx.HTTPError:
+                failed = True
+            elapsed = time.perf_counter() - now
+            if now >= measure_from:
+                latencies[name].append(elapsed)
+                errors[name] += failed
+
+    await asyncio.gather(*(client(n) for n in range(concurrency)))
+    return latencies, errors, time.perf_counter() - measure_from
+
+
+def summarize(samples: list[float], errors: int, seconds: float) -> dict[str, Any]:
+    if not samples:
+        return {"requests": 0, "errors": errors, "throughput": 0.0}
+    ms = np.asarray(samples) * 1000
+    p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+    return {
+        "requests": len(samples),
+        "errors": errors,
+        "throughput": round(len(samples) / seconds, 2),
+        "mean_ms": round(float(ms.mean()), 2),
+        "p50_ms": round(float(p50), 2),
+        "p95_ms": round(float(p95), 2),
+        "p99_ms": round(float(p99), 2),
+        "max_ms": round(float(ms.max()), 2),
+    }
+
+
+def compare(
+    report: dict[str, Any], baseline: dict[str, Any], *, tolerance: float
+) -> list[dict[str, Any]]:
+    regressions = []
+    for name, current in report["scenarios"].items():
+        before = baseline.get("scenarios", {}).get(name)
+        if not before or "p95_ms" not in before or "p95_ms" not in current:
+            continue
+        change = current["p95_ms"] / before["p95_ms"] - 1 if before["p95_ms"] else 0.0
+        if change > tolerance:
+            regressions.append(
+                {
+                    "scenario": name,
+                    "metric": "p95_ms",
+                    "baseline": before["p95_ms"],
+                    "current": current["p95_ms"],
+                    "change": round(change, 3),
+                    "baseline_commit": baseline.get("commit"),
+                }
+            )
+    return regressions
+
+
+def current_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run(args: argparse.Namespace) -> dict[str, Any]:
+    if args.in_process:
+        from app.main import app
+
+        # Count app exceptions (e.g. pool timeouts) as 500s, as a server would
+        transport: httpx.AsyncBaseTransport = httpx.ASGITransport(
+            app=app, raise_app_exceptions=False
+        )
+        base_url = "http://benchmark"
+    else:
+        transport = httpx.AsyncHTTPTransport(retries=0)
+        base_url = args.base_url
+    limits = httpx.Limits(max_connections=args.concurrency)
+    async with httpx.AsyncClient(
+        transport=transport, base_url=base_url, limits=limits, timeout=args.timeout
+    ) as client:
+        ctx = Context(
+            client=client,
+            accounts=load_accounts(args.seed, args.accounts),
+            password=args.password,
+            rng=random.Random(args.seed),
+        )
+        await authenticate(ctx, args.concurrency)
+        latencies, errors, seconds = await drive(
+            ctx,
+            args.mix,
+            concurrency=args.concurrency,
+            duration=args.duration,
+            warmup=args.warmup,
+        )
+    scenarios = {
+        name: summarize(latencies[name], errors[name], seconds) for name in args.mix
+    }
+    everything = [sample for samples in latencies.values() for sample in samples]
+    return {
+        "commit": current_commit(),
+        "started_at": datetime.now(timezone.utc).isoformat(),
+        "config": {
+            "base_url": None if args.in_process else args.base_url,
+            "in_process": args.in_process,
+            "concurrency": args.concurrency,
+            "duration": args.duration,
+            "warmup": args.warmup,
+            "accounts": len(ctx.accounts),
+            "seed": args.seed,
+            "mix": args.mix,
+        },
+        "scenarios": scenarios,
+        "total": summarize(everything, sum(errors.values()), seconds),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--in-process", action="store_true")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--warmup", type=float, default=5.0)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--accounts", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--password", default="loadtest-password")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix(DEFAULT_MIX))
+    parser.add_argument("--output", help="Write the JSON report here too")
+    parser.add_argument("--baseline", help="Earlier JSON report to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args()
+
+    # One log line per request would swamp the report
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    report = asyncio.run(run(args))
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        report["regressions"] = compare(report, baseline, tolerance=args.tolerance)
+    output = json.dumps(report, indent=2) + "\n"
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+    sys.stdout.write(output)
+    if report.get("regressions"):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,300 @@
+"""Seeded synthetic TRMS workload: users, interactions, ratings, endorsements.
+
+Run from ``backend/`` against the configured database:
+
+    python -m benchmarks.workload --users 100000 --interactions 1000000 \\
+        --endorsements 1000000 --seed 0
+
+Activity follows a Zipf-like power law (a few users initiate, rate and
+endorse most of the time) and timestamps are spread over the last year.
+Rows are written with ``COPY`` straight into the tables, then the rating
+summaries and decayed reputation of the generated users are rebuilt in one
+pass, as a bulk import would. Every generated user has the email
+``load<seed>-<n>@example.com`` and the password given by ``--password``, so
+the endpoint benchmark can log in as them; ``--cleanup`` deletes them again.
+
+Prints row counts and timings as JSON.
+"""
+
+import argparse
+import json
+import sys
+import time
+import uuid
+from collections.abc import Iterable, Sequence
+from datetime import datetime, timedelta
+from typing import Any
+
+import numpy as np
+from sqlalchemy import Connection, text
+
+from app.bulk_import import TOUCHED, rebuild_aggregates
+from app.core.db import engine
+from app.core.security import get_password_hash
+from benchmarks.trust_flow import power_law_edges
+
+FIRST_NAMES = [
+    "Alice", "Bob", "Carol", "Dave", "Erin", "Frank", "Grace", "Heidi", "Ivan",
+    "Judy", "Mallory", "Niaj", "Olivia", "Peggy", "Rupert", "Sybil", "Trent",
+    "Uma", "Victor", "Walter",
+]  # fmt: skip
+LAST_NAMES = [
+    "Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller",
+    "Davis", "Martinez", "Lopez", "Wilson", "Anderson", "Thomas", "Taylor",
+    "Moore", "Jackson", "Martin", "Lee", "Thompson", "White",
+]  # fmt: skip
+# Share of interactions per status, and ratings per value from -5 to 5
+STATUSES = {"accepted": 0.7, "pending": 0.2, "denied": 0.1}
+RATING_WEIGHTS = np.array([1, 1, 1, 1, 2, 4, 6, 10, 16, 20, 14], dtype=float)
+
+
+def email_prefix(seed: int) -> str:
+    return f"load{seed}-"
+
+
+def _copy(
+    connection: Connection, table: str, columns: Sequence[str], rows: Iterable[Any]
+) -> None:
+    raw = connection.connection.driver_connection
+    assert raw is not None
+    with raw.cursor() as cursor:
+        with cursor.copy(f'COPY "{table}" ({", ".join(columns)}) FROM STDIN') as copy:
+            for row in rows:
+                copy.write_row(row)
+
+
+def _timestamps(rng: np.random.Generator, size: int, now: datetime) -> list[datetime]:
+    seconds = rng.uniform(0, 365 * 86400, size=size)
+    return [now - timedelta(seconds=float(s)) for s in seconds]
+
+
+def _unique_pairs(
+    sources: np.ndarray, targets: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    pairs = np.unique(np.stack([sources, targets], axis=1), axis=0)
+    return pairs[:, 0], pairs[:, 1]
+
+
+def generate(
+    *,
+    users: int,
+    interactions: int,
+    endorsements: int,
+    seed: int,
+    exponent: float,
+    password: str,
+) -> dict[str, Any]:
+    rng = np.random.default_rng(seed)
+    now = datetime.utcnow()
+    timings: dict[str, float] = {}
+    counts: dict[str, int] = {}
+    started = time.perf_counter()
+
+    user_ids = [uuid.UUID(bytes=rng.bytes(16), version=4) for _ in range(users)]
+    names = zip(
+        rng.choice(FIRST_NAMES, size=users),
+        rng.choice(LAST_NAMES, size=users),
+        strict=True,
+    )
+    hashed_password = get_password_hash(password)
+    prefix = email_prefix(seed)
+
+    with engine.connect() as connection:
+        _copy(
+            connection,
+            "user",
+            (
+                "id",
+                "email",
+                "full_name",
+                "is_active",
+                "is_superuser",
+                "hashed_password",
+            ),
+            (
+                (user_id, f"{prefix}{i}@example.com", f"{first} {last}", True, False)
+                + (hashed_password,)
+                for i, (user_id, (first, last)) in enumerate(
+                    zip(user_ids, names, strict=True)
+                )
+            ),
+        )
+        counts["users"] = users
+        timings["users"] = time.perf_counter() - started
+
+        mark = time.perf_counter()
+        initiators, targets, _ = power_law_edges(
+            users, interactions, exponent=exponent, rng=rng
+        )
+        initiators, targets = _unique_pairs(initiators, targets)
+        n = len(initiators)
+        statuses = rng.choice(list(STATUSES), size=n, p=list(STATUSES.values()))
+        created = _timestamps(rng, n, now)
+        interaction_ids = [uuid.UUID(bytes=rng.bytes(16), version=4) for _ in range(n)]
+        _copy(
+            connection,
+            "interaction",
+            ("id", "initiator_id", "target_id", "status", "created_at", "updated_at"),
+            (
+                (
+                    interaction_ids[k],
+                    user_ids[initiators[k]],
+                    user_ids[targets[k]],
+                    statuses[k],
+                    created[k],
+                    created[k],
+                )
+                for k in range(n)
+            ),
+        )
+        counts["interactions"] = n
+        timings["interactions"] = time.perf_counter() - mark
+
+        # Each side of an accepted interaction rates it with some probability
+        mark = time.perf_counter()
+        accepted = np.flatnonzero(statuses == "accepted")
+        by_initiator = accepted[rng.random(len(accepted)) < 0.8]
+        by_target = accepted[rng.random(len(accepted)) < 0.6]
+        rated = np.concatenate([by_initiator, by_target])
+        raters = np.concatenate([initiators[by_initiator], targets[by_target]])
+        values = rng.choice(
+            np.arange(-5, 6), size=len(rated), p=RATING_WEIGHTS / RATING_WEIGHTS.sum()
+        )
+        delays = rng.uniform(0, 7 * 86400, size=len(rated))
+        _copy(
+            connection,
+            "rating",
+            ("id", "interaction_id", "rater_id", "rating", "created_at"),
+            (
+                (
+                    uuid.UUID(bytes=rng.bytes(16), version=4),
+                    interaction_ids[rated[k]],
+                    user_ids[raters[k]],
+                    int(values[k]),
+                    min(created[rated[k]] + timedelta(seconds=float(delays[k])), now),
+                )
+                for k in range(len(rated))
+            ),
+        )
+        counts["ratings"] = len(rated)
+        timings["ratings"] = time.perf_counter() - mark
+
+        mark = time.perf_counter()
+        endorsers, endorsed, _ = power_law_edges(
+            users, endorsements, exponent=exponent, rng=rng
+        )
+        endorsers, endorsed = _unique_pairs(endorsers, endorsed)
+        confidences = rng.beta(5, 2, size=len(endorsers))
+        updated = _timestamps(rng, len(endorsers), now)
+        _copy(
+            connection,
+            "endorsement",
+            (
+                "id",
+                "endorser_id",
+                "endorsed_id",
+                "confidence",
+                "created_at",
+                "updated_at",
+            ),
+            (
+                (
+                    uuid.UUID(bytes=rng.bytes(16), version=4),
+                    user_ids[endorsers[k]],
+                    user_ids[endorsed[k]],
+                    float(confidences[k]),
+                    updated[k],
+                    updated[k],
+                )
+                for k in range(len(endorsers))
+            ),
+        )
+        counts["endorsements"] = len(endorsers)
+        timings["endorsements"] = time.perf_counter() - mark
+        connection.commit()
+
+        mark = time.perf_counter()
+        connection.execute(text(f"DROP TABLE IF EXISTS {TOUCHED}"))
+        connection.execute(
+            text(
+                f"CREATE TEMP TABLE {TOUCHED} AS SELECT id AS user_id FROM"
+                ' "user" WHERE email LIKE :pattern'
+            ),
+            {"pattern": f"{prefix}%"},
+        )
+        connection.execute(text(f"ANALYZE {TOUCHED}"))
+        rebuild_aggregates(connection)
+        connection.execute(text(f"DROP TABLE {TOUCHED}"))
+        connection.execute(text("ANALYZE"))
+        connection.commit()
+        timings["aggregates"] = time.perf_counter() - mark
+
+    return {
+        "seed": seed,
+        "counts": counts,
+        "seconds": {name: round(value, 3) for name, value in timings.items()},
+        "total_seconds": round(time.perf_counter() - started, 3),
+    }
+
+
+def cleanup(seed: int) -> dict[str, Any]:
+    """Delete the users generated with ``seed`` and everything they touched."""
+    users = 'SELECT id FROM "user" WHERE email LIKE :pattern'
+    params = {"pattern": f"{email_prefix(seed)}%"}
+    with engine.begin() as connection:
+        interactions = (
+            "SELECT id FROM interaction"
+            f" WHERE initiator_id IN ({users}) OR target_id IN ({users})"
+        )
+        ratings = connection.execute(
+            text(
+                f"DELETE FROM rating WHERE interaction_id IN ({interactions})"
+                f" OR rater_id IN ({users})"
+            ),
+            params,
+        ).rowcount
+        deleted_interactions = connection.execute(
+            text(f"DELETE FROM interaction WHERE id IN ({interactions})"), params
+        ).rowcount
+        deleted_users = connection.execute(
+            text(f'DELETE FROM "user" WHERE id IN ({users})'), params
+        ).rowcount
+    return {
+        "seed": seed,
+        "deleted": {
+            "users": deleted_users,
+            "interactions": deleted_interactions,
+            "ratings": ratings,
+        },
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--interactions", type=int, default=100_000)
+    parser.add_argument("--endorsements", type=int, default=100_000)
+    parser.add_argument("--exponent", type=float, default=0.8)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--password", default="loadtest-password")
+    parser.add_argument(
+        "--cleanup", action="store_true", help="Delete the users of --seed instead"
+    )
+    args = parser.parse_args()
+
+    if args.cleanup:
+        result = cleanup(args.seed)
+    else:
+        result = generate(
+            users=args.users,
+            interactions=args.interactions,
+            endorsements=args.endorsements,
+            seed=args.seed,
+            exponent=args.exponent,
+            password=args.password,
+        )
+    sys.stdout.write(json.dumps(result, indent=2) + "\n")
+
+
+if __name__ == "__main__":
+    main()
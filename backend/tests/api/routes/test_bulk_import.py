@@ -0,0 +1,161 @@
+import json
+import uuid
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session, select
+
+from app import crud
+from app.bulk_import import run_import
+from app.core.config import settings
+from app.core.db import engine
+from app.models import Endorsement, Interaction, Rating
+from tests.utils.user import create_random_user
+
+
+def test_import_endorsements_csv(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    a, b, c = (create_random_user(db) for _ in range(3))
+    rows = [
+        f"{a.id},{b.id},0.5",
+        f"{a.id},{c.id},0.9",
+        f"{a.id},{a.id},0.9",
+        f"{a.id},{uuid.uuid4()},0.9",
+        f"{b.id},{c.id},1.5",
+        f"{b.id},not-a-uuid,0.5",
+        f"{a.id},{b.id},0.25",
+    ]
+    body = "endorser_id,endorsed_id,confidence\n" + "\n".join(rows) + "\n"
+    response = client.post(
+        f"{settings.API_V1_STR}/import/endorsements",
+        headers=superuser_token_headers,
+        files={"file": ("endorsements.csv", body, "text/csv")},
+    )
+    assert response.status_code == 200
+    report = response.json()
+    assert (report["rows"], report["imported"], report["rejected"]) == (7, 2, 5)
+    assert report["batches"][0]["rows_per_second"] > 0
+    assert {(r["line"], r["reason"]) for r in report["rejects"]} == {
+        (1, "duplicate in batch"),
+        (3, "cannot endorse yourself"),
+        (4, "unknown endorsed_id"),
+        (5, "confidence out of range"),
+        (6, "invalid endorsed_id"),
+    }
+    confidences = dict(
+        db.exec(
+            select(Endorsement.endorsed_id, Endorsement.confidence).where(
+                Endorsement.endorser_id == a.id
+            )
+        ).all()
+    )
+    assert confidences == {b.id: 0.25, c.id: 0.9}
+    decayed = crud.get_decayed_reputation(session=db, user_id=b.id)
+    assert decayed.endorsement_weight > 0
+
+
+def test_import_interactions_and_ratings_ndjson(db: Session) -> None:
+    a, b = create_random_user(db), create_random_user(db)
+    accepted, pending = uuid.uuid4(), uuid.uuid4()
+    interactions = [
+        {
+            "id": str(accepted),
+            "initiator_id": str(a.id),
+            "target_id": str(b.id),
+            "status": "accepted",
+        },
+        {"id": str(pending), "initiator_id": str(b.id), "target_id": str(a.id)},
+    ]
+    report = run_import(engine, "interactions", interactions, batch_size=1)
+    assert (report.imported, report.rejected, len(report.batches)) == (2, 0, 2)
+
+    ratings = [
+        {"interaction_id": str(accepted), "rater_id": str(a.id), "rating": 4},
+        {"interaction_id": str(accepted), "rater_id": str(b.id), "rating": "-2"},
+        {"interaction_id": str(pending), "rater_id": str(a.id), "rating": 3},
+        {"interaction_id": str(accepted), "rater_id": str(a.id), "rating": 1},
+        {"interaction_id": str(accepted), "rater_id": str(b.id), "rating": 9},
+    ]
+    report = run_import(engine, "ratings", ratings, batch_size=3)
+    assert [r.reason for r in report.rejects] == [
+        "can only rate an accepted interaction",
+        "user has already rated this interaction",
+        "rating out of range",
+    ]
+    assert report.imported == 2
+    assert (
+        len(db.exec(select(Rating).where(Rating.interaction_id == accepted)).all()) == 2
+    )
+    summary = crud.get_rating_summary(session=db, user_id=b.id)
+    assert (summary.count, summary.total) == (1, 4)
+
+
+def test_import_interactions_keep_pending_and_status_rules(db: Session) -> None:
+    a, b = create_random_user(db), create_random_user(db)
+    accepted = uuid.uuid4()
+    interactions = [
+        {"initiator_id": str(a.id), "target_id": str(b.id)},
+        {"initiator_id": str(a.id), "target_id": str(b.id), "status": "pending"},
+        {
+            "id": str(accepted),
+            "initiator_id": str(b.id),
+            "target_id": str(a.id),
+            "status": "accepted",
+        },
+    ]
+    report = run_import(engine, "interactions", interactions)
+    assert [(r.line, r.reason) for r in report.rejects] == [
+        (2, "a pending interaction already exists")
+    ]
+    pending = db.exec(
+        select(Interaction).where(
+            Interaction.initiator_id == a.id, Interaction.status == "pending"
+        )
+    ).all()
+    assert len(pending) == 1
+
+    # Re-importing an interaction updates its message but not its status
+    interactions[2].update(status="denied", message="updated")
+    report = run_import(engine, "interactions", interactions[2:])
+    assert report.imported == 1
+    existing = db.get(Interaction, accepted)
+    assert existing is not None
+    db.refresh(existing)
+    assert (existing.status, existing.message) == ("accepted", "updated")
+
+
+def test_import_rejects_unreadable_records(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    a, b = create_random_user(db), create_random_user(db)
+    valid = {"endorser_id": str(a.id), "endorsed_id": str(b.id), "confidence": 0.5}
+    lines = [
+        b'{"endorser_id": ',
+        b"[1, 2]",
+        b'{"endorser_id": "\xff\xfe"}',
+        json.dumps(valid).encode(),
+    ]
+    response = client.post(
+        f"{settings.API_V1_STR}/import/endorsements",
+        headers=superuser_token_headers,
+        files={"file": ("endorsements.ndjson", b"\n".join(lines), "text/plain")},
+    )
+    assert response.status_code == 200
+    report = response.json()
+    assert (report["rows"], report["imported"], report["rejected"]) == (4, 1, 3)
+    assert [(r["line"], r["reason"]) for r in report["rejects"]] == [
+        (1, "invalid JSON"),
+        (2, "record is not an object"),
+        (3, "invalid UTF-8"),
+    ]
+
+
+def test_import_requires_superuser(
+    client: TestClient, normal_user_token_headers: dict[str, str]
+) -> None:
+    response = client.post(
+        f"{settings.API_V1_STR}/import/ratings",
+        headers=normal_user_token_headers,
+        files={"file": ("ratings.csv", "interaction_id,rater_id,rating\n", "text/csv")},
+    )
+    assert response.status_code == 403
@@ -0,0 +1,165 @@
+import uuid
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app import crud
+from app.core.config import settings
+from tests.utils.user import create_random_user
+
+
+def test_get_trust_from_me(
+    client: TestClient, normal_user_token_headers: dict[str, str], db: Session
+) -> None:
+    me = crud.get_user_by_email(session=db, email=settings.EMAIL_TEST_USER)
+    assert me
+    friend = create_random_user(db)
+    friend_of_friend = create_random_user(db)
+    crud.create_or_update_endorsement(
+        session=db, endorser_id=me.id, endorsed_id=friend.id, confidence=1.0
+    )
+    crud.create_or_update_endorsement(
+        session=db,
+        endorser_id=friend.id,
+        endorsed_id=friend_of_friend.id,
+        confidence=0.5,
+    )
+    r = client.get(
+        f"{settings.API_V1_STR}/endorsements/{friend_of_friend.id}/trust-from-me",
+        headers=normal_user_token_headers,
+        params={"epsilon": 1e-6},
+    )
+    assert r.status_code == 200
+    trust = r.json()
+    assert trust["source_id"] == str(me.id)
+    assert trust["target_id"] == str(friend_of_friend.id)
+    assert trust["score"] > 0
+    assert trust["error_bound"] >= 0
+
+    r = client.get(
+        f"{settings.API_V1_STR}/endorsements/{friend.id}/trust-from-me",
+        headers=normal_user_token_headers,
+        params={"epsilon": 1e-6},
+    )
+    assert r.json()["score"] > trust["score"]
+
+
+def test_get_trust_from_me_user_not_found(
+    client: TestClient, normal_user_token_headers: dict[str, str]
+) -> None:
+    r = client.get(
+        f"{settings.API_V1_STR}/endorsements/{uuid.uuid4()}/trust-from-me",
+        headers=normal_user_token_headers,
+    )
+    assert r.status_code == 404
+
+
+def test_get_neighborhood(
+    client: TestClient, normal_user_token_headers: dict[str, str], db: Session
+) -> None:
+    a, b, c, d, e = (create_random_user(db) for _ in range(5))
+    for endorser, endorsed, confidence in (
+        (a, b, 0.9),
+        (a, c, 0.4),
+        (b, d, 0.8),
+        (c, d, 0.5),
+        (d, e, 0.7),
+    ):
+        crud.create_or_update_endorsement(
+            session=db,
+            endorser_id=endorser.id,
+            endorsed_id=endorsed.id,
+            confidence=confidence,
+        )
+    r = client.get(
+        f"{settings.API_V1_STR}/endorsements/{a.id}/neighborhood",
+        headers=normal_user_token_headers,
+        params={"depth": 2},
+    )
+    assert r.status_code == 200
+    result = r.json()
+    nodes = result["nodes"]
+    assert nodes[0] == str(a.id)
+    assert set(nodes) == {str(a.id), str(b.id), str(c.id), str(d.id)}
+    assert result["depths"][nodes.index(str(d.id))] == 2
+    edges = {(nodes[src], nodes[dst]): conf for src, dst, conf in result["edges"]}
+    assert edges == {
+        (str(a.id), str(b.id)): 0.9,
+        (str(a.id), str(c.id)): 0.4,
+        (str(b.id), str(d.id)): 0.8,
+        (str(c.id), str(d.id)): 0.5,
+    }
+    assert result["truncated"] is False
+
+    # Only the strongest endorsement per user is followed
+    r = client.get(
+        f"{settings.API_V1_STR}/endorsements/{a.id}/neighborhood",
+        headers=normal_user_token_headers,
+        params={"depth": 3, "max_fanout": 1},
+    )
+    nodes = r.json()["nodes"]
+    assert nodes == [str(a.id), str(b.id), str(d.id), str(e.id)]
+
+    # Received endorsements, edges still point endorser -> endorsed
+    r = client.get(
+        f"{settings.API_V1_STR}/endorsements/{d.id}/neighborhood",
+        headers=normal_user_token_headers,
+        params={"depth": 1, "direction": "in"},
+    )
+    result = r.json()
+    nodes = result["nodes"]
+    assert {(nodes[src], nodes[dst]) for src, dst, _ in result["edges"]} == {
+        (str(b.id), str(d.id)),
+        (str(c.id), str(d.id)),
+    }
+
+
+def test_get_neighborhood_user_not_found(
+    client: TestClient, normal_user_token_headers: dict[str, str]
+) -> None:
+    r = client.get(
+        f"{settings.API_V1_STR}/endorsements/{uuid.uuid4()}/neighborhood",
+        headers=normal_user_token_headers,
+    )
+    assert r.status_code == 404
+
+
+def test_get_trust_path(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    a, b, c = (create_random_user(db) for _ in range(3))
+    for endorser, endorsed in ((a, b), (b, c)):
+        crud.create_or_update_endorsement(
+            session=db, endorser_id=endorser.id, endorsed_id=endorsed.id, confidence=0.5
+        )
+    response = client.get(
+        f"{settings.API_V1_STR}/endorsements/path",
+        headers=superuser_token_headers,
+        params={"from": str(a.id), "to": str(c.id)},
+    )
+    assert response.status_code == 200
+    content = response.json()
+    assert content["status"] == "found"
+    assert content["path"] == [str(a.id), str(b.id), str(c.id)]
+    assert content["weight"] == 0.25
+
+    response = client.get(
+        f"{settings.API_V1_STR}/endorsements/path",
+        headers=superuser_token_headers,
+        params={"from": str(c.id), "to": str(a.id), "max_depth": 2},
+    )
+    assert response.status_code == 200
+    assert response.json()["status"] == "no_path"
+
+
+def test_get_trust_path_user_not_found(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    user = create_random_user(db)
+    response = client.get(
+        f"{settings.API_V1_STR}/endorsements/path",
+        headers=superuser_token_headers,
+        params={"from": str(user.id), "to": str(uuid.uuid4())},
+    )
+    assert response.status_code == 404
+    assert response.json()["detail"] == "User not found"
@@ -0,0 +1,62 @@
+import csv
+import io
+import json
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app import crud
+from app.core.config import settings
+from app.core.db import engine
+from app.export import export_table
+from tests.utils.user import create_random_user
+
+
+def test_export_endorsements_ndjson_and_resume(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    users = [create_random_user(db) for _ in range(3)]
+    for endorsed in users[1:]:
+        crud.create_or_update_endorsement(
+            session=db, endorser_id=users[0].id, endorsed_id=endorsed.id, confidence=0.5
+        )
+    response = client.get(
+        f"{settings.API_V1_STR}/export/endorsements",
+        headers=superuser_token_headers,
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    ids = [row["id"] for row in rows]
+    assert ids == sorted(ids)
+    mine = [row for row in rows if row["endorser_id"] == str(users[0].id)]
+    assert {row["endorsed_id"] for row in mine} == {str(u.id) for u in users[1:]}
+
+    response = client.get(
+        f"{settings.API_V1_STR}/export/endorsements",
+        headers=superuser_token_headers,
+        params={"after": ids[0]},
+    )
+    assert [json.loads(line)["id"] for line in response.text.splitlines()] == ids[1:]
+
+
+def test_export_csv_in_chunks(db: Session) -> None:
+    users = [create_random_user(db) for _ in range(3)]
+    for endorsed in users[1:]:
+        crud.create_or_update_endorsement(
+            session=db, endorser_id=users[0].id, endorsed_id=endorsed.id, confidence=0.5
+        )
+    chunks = list(export_table(engine, "endorsements", format="csv", chunk_size=1))
+    assert len(chunks) > 2
+    rows = list(csv.DictReader(io.StringIO("".join(chunks))))
+    assert {"id", "endorser_id", "endorsed_id", "confidence"} <= set(rows[0])
+    assert len({row["id"] for row in rows}) == len(rows)
+
+
+def test_export_requires_superuser(
+    client: TestClient, normal_user_token_headers: dict[str, str]
+) -> None:
+    response = client.get(
+        f"{settings.API_V1_STR}/export/ratings", headers=normal_user_token_headers
+    )
+    assert response.status_code == 403
@@ -0,0 +1,127 @@
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app import crud
+from app.core.config import settings
+from tests.utils.interaction import create_accepted_interaction
+from tests.utils.user import create_random_user
+
+
+def test_list_ratings_for_interaction(
+    client: TestClient, normal_user_token_headers: dict[str, str], db: Session
+) -> None:
+    user = crud.get_user_by_email(session=db, email=settings.EMAIL_TEST_USER)
+    assert user
+    other = create_random_user(db)
+    interaction = create_accepted_interaction(db, user, other)
+    crud.add_rating(
+        session=db,
+        interaction_id=interaction.id,
+        rater_id=other.id,
+        rating=4,
+        comment="great",
+    )
+    r = client.get(
+        f"{settings.API_V1_STR}/interactions/{interaction.id}/ratings",
+        headers=normal_user_token_headers,
+    )
+    assert r.status_code == 200
+    (rating,) = r.json()
+    assert rating["rating"] == 4
+    assert rating["comment"] == "great"
+    assert rating["rater_id"] == str(other.id)
+    assert rating["rater_email"] == other.email
+
+
+def test_list_ratings_for_interactions_batch(
+    client: TestClient, normal_user_token_headers: dict[str, str], db: Session
+) -> None:
+    user = crud.get_user_by_email(session=db, email=settings.EMAIL_TEST_USER)
+    assert user
+    rated = create_accepted_interaction(db, user, create_random_user(db))
+    unrated = create_accepted_interaction(db, create_random_user(db), user)
+    hidden = create_accepted_interaction(
+        db, create_random_user(db), create_random_user(db)
+    )
+    crud.add_rating(session=db, interaction_id=rated.id, rater_id=user.id, rating=-2)
+    crud.add_rating(
+        session=db, interaction_id=rated.id, rater_id=rated.target_id, rating=5
+    )
+    r = client.post(
+        f"{settings.API_V1_STR}/interactions/ratings",
+        headers=normal_user_token_headers,
+        json={"interaction_ids": [str(rated.id), str(unrated.id), str(hidden.id)]},
+    )
+    assert r.status_code == 200
+    content = r.json()
+    assert content["count"] == 2
+    by_id = {item["interaction_id"]: item["ratings"] for item in content["data"]}
+    assert set(by_id) == {str(rated.id), str(unrated.id)}
+    assert by_id[str(unrated.id)] == []
+    assert [rating["rating"] for rating in by_id[str(rated.id)]] == [-2, 5]
+    assert by_id[str(rated.id)][0]["rater_email"] == user.email
+
+
+def test_list_ratings_for_interactions_batch_superuser(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    interaction = create_accepted_interaction(
+        db, create_random_user(db), create_random_user(db)
+    )
+    r = client.post(
+        f"{settings.API_V1_STR}/interactions/ratings",
+        headers=superuser_token_headers,
+        json={"interaction_ids": [str(interaction.id)]},
+    )
+    assert r.status_code == 200
+    assert r.json()["data"] == [{"interaction_id": str(interaction.id), "ratings": []}]
+
+
+def test_page_user_interactions(
+    client: TestClient, normal_user_token_headers: dict[str, str], db: Session
+) -> None:
+    user = crud.get_user_by_email(session=db, email=settings.EMAIL_TEST_USER)
+    assert user
+    for _ in range(2):
+        create_accepted_interaction(db, user, create_random_user(db))
+        create_accepted_interaction(db, create_random_user(db), user)
+    expected = [
+        str(interaction.id)
+        for interaction in crud.get_user_interactions(
+            session=db, user_id=user.id, limit=1000
+        )
+    ]
+    seen: list[str] = []
+    params: dict[str, str | int] = {"limit": 3}
+    while True:
+        r = client.get(
+            f"{settings.API_V1_STR}/interactions/users/{user.id}/page",
+            headers=normal_user_token_headers,
+            params=params,
+        )
+        assert r.status_code == 200
+        content = r.json()
+        seen.extend(interaction["id"] for interaction in content["data"])
+        if content["next_cursor"] is None:
+            break
+        params["cursor"] = content["next_cursor"]
+    assert seen == expected
+    assert len(seen) >= 4
+
+    r = client.get(
+        f"{settings.API_V1_STR}/interactions/users/{user.id}/page",
+        headers=normal_user_token_headers,
+        params={"role": "target", "limit": 1000},
+    )
+    assert all(i["target_id"] == str(user.id) for i in r.json()["data"])
+
+
+def test_page_user_interactions_other_user(
+    client: TestClient, normal_user_token_headers: dict[str, str], db: Session
+) -> None:
+    other = create_random_user(db)
+    r = client.get(
+        f"{settings.API_V1_STR}/interactions/users/{other.id}/page",
+        headers=normal_user_token_headers,
+    )
+    assert r.status_code == 403
@@ -0,0 +1,374 @@
+import uuid
+from typing import Any
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app import crud
+from app.core.config import settings
+from app.models import UserUpdate
+from tests.utils.interaction import create_accepted_interaction
+from tests.utils.user import create_random_user
+
+
+def test_recompute_reputation(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    endorser = create_random_user(db)
+    endorsed = create_random_user(db)
+    crud.create_or_update_endorsement(
+        session=db, endorser_id=endorser.id, endorsed_id=endorsed.id, confidence=0.9
+    )
+    r = client.post(
+        f"{settings.API_V1_STR}/reputation/recompute",
+        headers=superuser_token_headers,
+    )
+    assert r.status_code == 200
+    run = r.json()
+    assert run["users"] >= 2
+    assert run["edges"] >= 1
+
+    r = client.get(
+        f"{settings.API_V1_STR}/users/{endorsed.id}/reputation",
+        headers=superuser_token_headers,
+    )
+    assert r.status_code == 200
+    endorsed_reputation = r.json()
+    assert endorsed_reputation["user_id"] == str(endorsed.id)
+    assert endorsed_reputation["computed_at"] is not None
+
+    r = client.get(
+        f"{settings.API_V1_STR}/users/{endorser.id}/reputation",
+        headers=superuser_token_headers,
+    )
+    assert endorsed_reputation["score"] > r.json()["score"]
+
+
+def test_recompute_reputation_normal_user(
+    client: TestClient, normal_user_token_headers: dict[str, str]
+) -> None:
+    r = client.post(
+        f"{settings.API_V1_STR}/reputation/recompute",
+        headers=normal_user_token_headers,
+    )
+    assert r.status_code == 403
+
+
+def test_read_reputation_not_scored_yet(
+    client: TestClient, normal_user_token_headers: dict[str, str], db: Session
+) -> None:
+    user = create_random_user(db)
+    r = client.get(
+        f"{settings.API_V1_STR}/users/{user.id}/reputation",
+        headers=normal_user_token_headers,
+    )
+    assert r.status_code == 200
+    assert r.json() == {"user_id": str(user.id), "score": 0.0, "computed_at": None}
+
+
+def test_read_reputation_user_not_found(
+    client: TestClient, normal_user_token_headers: dict[str, str]
+) -> None:
+    r = client.get(
+        f"{settings.API_V1_STR}/users/{uuid.uuid4()}/reputation",
+        headers=normal_user_token_headers,
+    )
+    assert r.status_code == 404
+    assert r.json()["detail"] == "User not found"
+
+
+def test_read_reputation_batch(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    endorser = create_random_user(db)
+    endorsed = create_random_user(db)
+    unrated = create_random_user(db)
+    crud.create_or_update_endorsement(
+        session=db, endorser_id=endorser.id, endorsed_id=endorsed.id, confidence=0.7
+    )
+    interaction = create_accepted_interaction(db, endorser, endorsed)
+    crud.add_rating(
+        session=db, interaction_id=interaction.id, rater_id=endorser.id, rating=3
+    )
+    client.post(
+        f"{settings.API_V1_STR}/reputation/recompute",
+        headers=superuser_token_headers,
+    )
+    user_ids = [str(endorsed.id), str(uuid.uuid4()), str(unrated.id), str(endorsed.id)]
+    r = client.post(
+        f"{settings.API_V1_STR}/users/reputation:batch",
+        headers=superuser_token_headers,
+        json={"user_ids": user_ids},
+    )
+    assert r.status_code == 200
+    result = r.json()
+    assert result["count"] == 2
+    first, second = result["data"]
+    assert first["user_id"] == str(endorsed.id)
+    assert first["score"] > second["score"]
+    assert first["rating_count"] == 1
+    assert first["rating_mean"] == 3
+    assert first["endorsements_received"] == 1
+    assert first["endorsements_given"] == 0
+    assert second["user_id"] == str(unrated.id)
+    assert second["rating_count"] == 0
+    assert second["rating_mean"] is None
+    assert second["endorsements_received"] == 0
+
+
+def test_read_reputation_batch_too_many_ids(
+    client: TestClient, normal_user_token_headers: dict[str, str]
+) -> None:
+    r = client.post(
+        f"{settings.API_V1_STR}/users/reputation:batch",
+        headers=normal_user_token_headers,
+        json={"user_ids": [str(uuid.uuid4()) for _ in range(5001)]},
+    )
+    assert r.status_code == 422
+
+
+def test_read_leaderboard_pages(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    endorser = create_random_user(db)
+    endorsed = create_random_user(db)
+    crud.create_or_update_endorsement(
+        session=db, endorser_id=endorser.id, endorsed_id=endorsed.id, confidence=1.0
+    )
+    r = client.post(
+        f"{settings.API_V1_STR}/reputation/recompute",
+        headers=superuser_token_headers,
+    )
+    users = r.json()["users"]
+
+    seen: list[dict[str, Any]] = []
+    after_rank = 0
+    while True:
+        r = client.get(
+            f"{settings.API_V1_STR}/reputation/leaderboard",
+            headers=superuser_token_headers,
+            params={"after_rank": after_rank, "limit": 2},
+        )
+        assert r.status_code == 200
+        page = r.json()
+        seen.extend(page["data"])
+        if page["next_after_rank"] is None:
+            break
+        after_rank = page["next_after_rank"]
+    assert [entry["rank"] for entry in seen] == list(range(1, users + 1))
+    scores = [entry["score"] for entry in seen]
+    assert scores == sorted(scores, reverse=True)
+    ranks = {entry["user_id"]: entry["rank"] for entry in seen}
+    assert ranks[str(endorsed.id)] < ranks[str(endorser.id)]
+
+    # Nothing changed, so a second run moves no ranks
+    r = client.post(
+        f"{settings.API_V1_STR}/reputation/recompute",
+        headers=superuser_token_headers,
+    )
+    assert r.json()["ranks_changed"] == 0
+
+
+def test_leaderboard_scores_match_ranks_after_incremental_update(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    endorser = create_random_user(db)
+    endorsed = create_random_user(db)
+    crud.create_or_update_endorsement(
+        session=db, endorser_id=endorser.id, endorsed_id=endorsed.id, confidence=1.0
+    )
+    client.post(
+        f"{settings.API_V1_STR}/reputation/recompute",
+        headers=superuser_token_headers,
+    )
+    params = {"limit": 1000}
+    url = f"{settings.API_V1_STR}/reputation/leaderboard"
+    before = client.get(url, headers=superuser_token_headers, params=params).json()
+
+    # Folded in incrementally; ranks only move on the next full run
+    crud.create_or_update_endorsement(
+        session=db, endorser_id=endorsed.id, endorsed_id=endorser.id, confidence=1.0
+    )
+    crud.create_or_update_endorsement(
+        session=db, endorser_id=endorser.id, endorsed_id=endorsed.id, confidence=0.1
+    )
+    after = client.get(url, headers=superuser_token_headers, params=params).json()
+    assert after == before
+    scores = [entry["score"] for entry in after["data"]]
+    assert scores == sorted(scores, reverse=True)
+
+
+def test_read_leaderboard_is_active_filter(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    inactive = create_random_user(db)
+    crud.update_user(session=db, db_user=inactive, user_in=UserUpdate(is_active=False))
+    client.post(
+        f"{settings.API_V1_STR}/reputation/recompute",
+        headers=superuser_token_headers,
+    )
+    r = client.get(
+        f"{settings.API_V1_STR}/reputation/leaderboard",
+        headers=superuser_token_headers,
+        params={"is_active": True, "limit": 1000},
+    )
+    assert r.status_code == 200
+    user_ids = {entry["user_id"] for entry in r.json()["data"]}
+    assert str(inactive.id) not in user_ids
+
+
+def test_read_snapshot_score(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    endorser = create_random_user(db)
+    endorsed = create_random_user(db)
+    crud.create_or_update_endorsement(
+        session=db, endorser_id=endorser.id, endorsed_id=endorsed.id, confidence=0.9
+    )
+    client.post(
+        f"{settings.API_V1_STR}/reputation/recompute",
+        headers=superuser_token_headers,
+    )
+    r = client.get(
+        f"{settings.API_V1_STR}/reputation/snapshot",
+        headers=superuser_token_headers,
+    )
+    assert r.status_code == 200
+    assert r.json()["users"] >= 2
+
+    r = client.get(
+        f"{settings.API_V1_STR}/reputation/snapshot/{endorsed.id}",
+        headers=superuser_token_headers,
+    )
+    assert r.status_code == 200
+    snapshot_score = r.json()["score"]
+    r = client.get(
+        f"{settings.API_V1_STR}/users/{endorsed.id}/reputation",
+        headers=superuser_token_headers,
+    )
+    assert snapshot_score == pytest.approx(r.json()["score"])
+
+    r = client.get(
+        f"{settings.API_V1_STR}/reputation/snapshot/{uuid.uuid4()}",
+        headers=superuser_token_headers,
+    )
+    assert r.status_code == 404
+
+
+def test_reputation_reads_follow_snapshot(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    endorser = create_random_user(db)
+    endorsed = create_random_user(db)
+    crud.create_or_update_endorsement(
+        session=db, endorser_id=endorser.id, endorsed_id=endorsed.id, confidence=0.9
+    )
+    client.post(
+        f"{settings.API_V1_STR}/reputation/recompute",
+        headers=superuser_token_headers,
+    )
+    snapshot = client.get(
+        f"{settings.API_V1_STR}/reputation/snapshot/{endorsed.id}",
+        headers=superuser_token_headers,
+    ).json()
+
+    def read() -> tuple[dict[str, Any], list[dict[str, Any]]]:
+        single = client.get(
+            f"{settings.API_V1_STR}/users/{endorsed.id}/reputation",
+            headers=superuser_token_headers,
+        ).json()
+        batch = client.post(
+            f"{settings.API_V1_STR}/users/reputation:batch",
+            headers=superuser_token_headers,
+            json={"user_ids": [str(endorsed.id), str(newcomer.id)]},
+        ).json()["data"]
+        return single, batch
+
+    newcomer = create_random_user(db)
+    single, (first, second) = read()
+    assert single["score"] == first["score"] == snapshot["score"]
+    assert single["computed_at"] == first["computed_at"] == snapshot["computed_at"]
+    assert second["score"] is None
+
+    # An incremental update is newer than the snapshot: every score is read
+    # from the stored table until the next full run
+    crud.create_or_update_endorsement(
+        session=db, endorser_id=endorsed.id, endorsed_id=newcomer.id, confidence=1.0
+    )
+    single, (first, second) = read()
+    assert single["score"] == pytest.approx(first["score"])
+    assert single["computed_at"] == first["computed_at"]
+    assert second["score"] > 0
+    assert second["computed_at"] != snapshot["computed_at"]
+
+
+def test_read_snapshot_trust_flow(
+    client: TestClient,
+    superuser_token_headers: dict[str, str],
+    db: Session,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(settings, "TRUST_FLOW_ENABLED", True)
+    superuser = crud.get_user_by_email(session=db, email=settings.FIRST_SUPERUSER)
+    assert superuser
+    vouched = create_random_user(db)
+    stranger = create_random_user(db)
+    crud.create_or_update_endorsement(
+        session=db, endorser_id=superuser.id, endorsed_id=vouched.id, confidence=1.0
+    )
+    r = client.post(
+        f"{settings.API_V1_STR}/reputation/recompute",
+        headers=superuser_token_headers,
+    )
+    assert r.json()["certified"] >= 2
+
+    for user, certified in ((superuser, True), (vouched, True), (stranger, False)):
+        r = client.get(
+            f"{settings.API_V1_STR}/reputation/snapshot/{user.id}",
+            headers=superuser_token_headers,
+        )
+        assert r.json()["certified"] is certified
+
+
+def test_collusion_check_and_list(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    users = [create_random_user(db) for _ in range(3)]
+    for i, user in enumerate(users):
+        crud.create_or_update_endorsement(
+            session=db,
+            endorser_id=user.id,
+            endorsed_id=users[(i + 1) % 3].id,
+            confidence=1.0,
+        )
+    r = client.post(
+        f"{settings.API_V1_STR}/reputation/collusion/check",
+        headers=superuser_token_headers,
+        params={"full": True},
+    )
+    assert r.status_code == 200
+    assert r.json()["clusters_found"] >= 1
+
+    r = client.get(
+        f"{settings.API_V1_STR}/reputation/collusion",
+        headers=superuser_token_headers,
+        params={"limit": 1000},
+    )
+    assert r.status_code == 200
+    content = r.json()
+    ids = {str(user.id) for user in users}
+    (cluster,) = [c for c in content["data"] if set(c["member_ids"]) == ids]
+    assert cluster["kind"] == "ring"
+    assert cluster["size"] == 3
+    assert content["count"] >= 1
+
+
+def test_collusion_normal_user(
+    client: TestClient, normal_user_token_headers: dict[str, str]
+) -> None:
+    r = client.get(
+        f"{settings.API_V1_STR}/reputation/collusion",
+        headers=normal_user_token_headers,
+    )
+    assert r.status_code == 403
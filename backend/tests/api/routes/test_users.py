@@ -1,13 +1,17 @@
 import uuid
+from collections import OrderedDict
 from unittest.mock import patch
 
+import pytest
 from fastapi.testclient import TestClient
 from sqlmodel import Session, select
 
-from app import crud
+from app import crud, pagination
 from app.core.config import settings
 from app.core.security import verify_password
 from app.models import User, UserCreate
+from tests.utils.interaction import create_accepted_interaction
+from tests.utils.user import authentication_token_from_email, create_random_user
 from tests.utils.utils import random_email, random_lower_string
 
 
@@ -168,6 +172,133 @@ def test_retrieve_users(
         assert "email" in item
 
 
+def test_retrieve_users_by_endorsements(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    endorsed = crud.create_user(
+        session=db,
+        user_create=UserCreate(email=random_email(), password=random_lower_string()),
+    )
+    for _ in range(3):
+        endorser = crud.create_user(
+            session=db,
+            user_create=UserCreate(
+                email=random_email(), password=random_lower_string()
+            ),
+        )
+        crud.create_or_update_endorsement(
+            session=db, endorser_id=endorser.id, endorsed_id=endorsed.id, confidence=1.0
+        )
+
+    r = client.get(
+        f"{settings.API_V1_STR}/users/",
+        headers=superuser_token_headers,
+        params={"order_by": "endorsements_received", "limit": 1000},
+    )
+    assert r.status_code == 200
+    data = r.json()["data"]
+    received = [item["endorsements_received"] for item in data]
+    assert received == sorted(received, reverse=True)
+    (item,) = [item for item in data if item["id"] == str(endorsed.id)]
+    assert item["endorsements_received"] == 3
+    assert item["confidence_received"] == 3.0
+
+
+def test_retrieve_users_count_modes(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    create_random_user(db)
+    counts = {}
+    for mode in ("exact", "estimate", "none"):
+        r = client.get(
+            f"{settings.API_V1_STR}/users/",
+            headers=superuser_token_headers,
+            params={"limit": 1, "count": mode},
+        )
+        assert r.status_code == 200
+        assert len(r.json()["data"]) == 1
+        counts[mode] = r.json()["count"]
+    # Few enough users that the estimate is replaced by an exact count
+    assert counts["estimate"] == counts["exact"] > 0
+    assert counts["none"] is None
+
+
+def test_retrieve_users_count_estimate_cached(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    def estimate() -> int:
+        r = client.get(
+            f"{settings.API_V1_STR}/users/",
+            headers=superuser_token_headers,
+            params={"limit": 1, "count": "estimate"},
+        )
+        assert r.status_code == 200
+        count = r.json()["count"]
+        assert isinstance(count, int)
+        return count
+
+    with patch.object(settings, "COUNT_ESTIMATE_EXACT_BELOW", 0):
+        first = estimate()
+        create_random_user(db)
+        assert estimate() == first
+
+
+def test_count_estimate_cache_is_bounded(db: Session) -> None:
+    statements = [select(User).where(User.email == random_email()) for _ in range(3)]
+    with patch.object(pagination, "_estimates", OrderedDict()) as estimates:
+        with patch.object(pagination, "ESTIMATE_CACHE_SIZE", 2):
+            for statement in statements:
+                pagination.count_rows(db, statement, "estimate")
+            assert len(estimates) == 2
+        estimates.clear()
+        # Expired entries are dropped whenever an estimate is cached
+        with patch.object(settings, "COUNT_ESTIMATE_TTL_SECONDS", 0):
+            for statement in statements:
+                pagination.count_rows(db, statement, "estimate")
+        assert len(estimates) == 0
+
+
+def test_retrieve_users_cursor_pages(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    for _ in range(3):
+        crud.create_user(
+            session=db,
+            user_create=UserCreate(
+                email=random_email(), password=random_lower_string()
+            ),
+        )
+    r = client.get(
+        f"{settings.API_V1_STR}/users/",
+        headers=superuser_token_headers,
+        params={"limit": 2},
+    )
+    first = r.json()
+    assert len(first["data"]) == 2
+    assert first["next_cursor"]
+    r = client.get(
+        f"{settings.API_V1_STR}/users/",
+        headers=superuser_token_headers,
+        params={"limit": 2, "cursor": first["next_cursor"]},
+    )
+    second = r.json()
+    # Same rows as the equivalent offset page
+    r = client.get(
+        f"{settings.API_V1_STR}/users/",
+        headers=superuser_token_headers,
+        params={"limit": 2, "skip": 2},
+    )
+    assert [u["id"] for u in second["data"]] == [u["id"] for u in r.json()["data"]]
+    assert not {u["id"] for u in first["data"]} & {u["id"] for u in second["data"]}
+
+    r = client.get(
+        f"{settings.API_V1_STR}/users/",
+        headers=superuser_token_headers,
+        params={"cursor": first["next_cursor"], "order_by": "endorsements_received"},
+    )
+    assert r.status_code == 400
+
+
 def test_update_user_me(
     client: TestClient, normal_user_token_headers: dict[str, str], db: Session
 ) -> None:
@@ -484,3 +615,160 @@ def test_delete_user_without_privileges(
     )
     assert r.status_code == 403
     assert r.json()["detail"] == "The user doesn't have enough privileges"
+
+
+def test_read_user_rating_summary(
+    client: TestClient, normal_user_token_headers: dict[str, str], db: Session
+) -> None:
+    rater = create_random_user(db)
+    rated = create_random_user(db)
+    for value in (5, 3, -1):
+        interaction = create_accepted_interaction(db, rater, rated)
+        crud.add_rating(
+            session=db, interaction_id=interaction.id, rater_id=rater.id, rating=value
+        )
+    r = client.get(
+        f"{settings.API_V1_STR}/users/{rated.id}/rating-summary",
+        headers=normal_user_token_headers,
+    )
+    assert r.status_code == 200
+    summary = r.json()
+    assert summary["count"] == 3
+    assert summary["total"] == 7
+    assert summary["sum_squares"] == 35
+    assert summary["histogram"][10] == 1
+    assert summary["histogram"][8] == 1
+    assert summary["histogram"][4] == 1
+    assert summary["bayesian_mean"] == 7 / (settings.RATING_PRIOR_WEIGHT + 3)
+
+
+def test_read_user_rating_summary_no_ratings(
+    client: TestClient, normal_user_token_headers: dict[str, str], db: Session
+) -> None:
+    user = create_random_user(db)
+    r = client.get(
+        f"{settings.API_V1_STR}/users/{user.id}/rating-summary",
+        headers=normal_user_token_headers,
+    )
+    assert r.status_code == 200
+    summary = r.json()
+    assert summary["count"] == 0
+    assert summary["mean"] is None
+    assert summary["histogram"] == [0] * 11
+
+
+def test_read_user_rating_summary_user_not_found(
+    client: TestClient, normal_user_token_headers: dict[str, str]
+) -> None:
+    r = client.get(
+        f"{settings.API_V1_STR}/users/{uuid.uuid4()}/rating-summary",
+        headers=normal_user_token_headers,
+    )
+    assert r.status_code == 404
+
+
+def test_read_user_decayed_reputation(
+    client: TestClient, normal_user_token_headers: dict[str, str], db: Session
+) -> None:
+    rater = create_random_user(db)
+    rated = create_random_user(db)
+    interaction = create_accepted_interaction(db, rater, rated)
+    crud.add_rating(
+        session=db, interaction_id=interaction.id, rater_id=rater.id, rating=4
+    )
+    crud.create_or_update_endorsement(
+        session=db, endorser_id=rater.id, endorsed_id=rated.id, confidence=0.5
+    )
+    crud.create_or_update_endorsement(
+        session=db, endorser_id=rater.id, endorsed_id=rated.id, confidence=0.9
+    )
+    r = client.get(
+        f"{settings.API_V1_STR}/users/{rated.id}/decayed-reputation",
+        headers=normal_user_token_headers,
+    )
+    assert r.status_code == 200
+    result = r.json()
+    assert result["half_life_days"] == settings.REPUTATION_HALF_LIFE_DAYS
+    assert result["rating_mean"] == pytest.approx(4, rel=1e-3)
+    assert result["endorsement_weight"] == pytest.approx(1, rel=1e-3)
+    assert result["endorsement_score"] == pytest.approx(0.9, rel=1e-3)
+
+
+def test_read_user_decayed_reputation_user_not_found(
+    client: TestClient, normal_user_token_headers: dict[str, str]
+) -> None:
+    r = client.get(
+        f"{settings.API_V1_STR}/users/{uuid.uuid4()}/decayed-reputation",
+        headers=normal_user_token_headers,
+    )
+    assert r.status_code == 404
+
+
+def _named_user(db: Session, full_name: str) -> User:
+    user_in = UserCreate(
+        email=random_email(), password=random_lower_string(), full_name=full_name
+    )
+    return crud.create_user(session=db, user_create=user_in)
+
+
+def test_search_users_fuzzy_ranking(
+    client: TestClient, normal_user_token_headers: dict[str, str], db: Session
+) -> None:
+    word = random_lower_string()[:12]
+    exact = _named_user(db, f"{word} Exact")
+    misspelt = _named_user(db, f"{word[:-1]}x Misspelt")
+    r = client.get(
+        f"{settings.API_V1_STR}/users/search",
+        headers=normal_user_token_headers,
+        params={"query": word},
+    )
+    assert r.status_code == 200
+    ids = [user["id"] for user in r.json()["data"]]
+    assert ids[:2] == [str(exact.id), str(misspelt.id)]
+
+
+def test_search_users_prefix(
+    client: TestClient, normal_user_token_headers: dict[str, str], db: Session
+) -> None:
+    word = random_lower_string()[:12]
+    second = _named_user(db, f"{word}b")
+    first = _named_user(db, f"{word}a")
+    _named_user(db, f"x{word}")
+    r = client.get(
+        f"{settings.API_V1_STR}/users/search",
+        headers=normal_user_token_headers,
+        params={"query": word.upper(), "mode": "prefix"},
+    )
+    assert r.status_code == 200
+    assert [user["id"] for user in r.json()["data"]] == [
+        str(first.id),
+        str(second.id),
+    ]
+
+
+def test_search_users_excludes_current_user(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    user = create_random_user(db)
+    headers = authentication_token_from_email(client=client, email=user.email, db=db)
+    for token_headers, found in ((headers, False), (superuser_token_headers, True)):
+        for mode in ("fuzzy", "prefix"):
+            r = client.get(
+                f"{settings.API_V1_STR}/users/search",
+                headers=token_headers,
+                params={"query": user.email, "mode": mode},
+            )
+            assert r.status_code == 200
+            ids = [found_user["id"] for found_user in r.json()["data"]]
+            assert (str(user.id) in ids) is found
+
+
+def test_search_users_limit_bounds(
+    client: TestClient, normal_user_token_headers: dict[str, str]
+) -> None:
+    r = client.get(
+        f"{settings.API_V1_STR}/users/search",
+        headers=normal_user_token_headers,
+        params={"query": "a", "limit": 1000},
+    )
+    assert r.status_code == 422
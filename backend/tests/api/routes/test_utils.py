@@ -0,0 +1,31 @@
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+
+
+def test_read_db_pool(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    r = client.get(
+        f"{settings.API_V1_STR}/utils/db-pool/", headers=superuser_token_headers
+    )
+    assert r.status_code == 200
+    content = r.json()
+    assert content["pgbouncer"] == settings.POSTGRES_PGBOUNCER
+    pools = {pool["engine"]: pool for pool in content["data"]}
+    # The direct pool only exists separately behind PgBouncer
+    assert set(pools) - {"direct"} == {"sync", "async"}
+    assert ("direct" in pools) == settings.POSTGRES_PGBOUNCER
+    # This request's own user lookup checked out a connection
+    assert pools["sync"]["checkouts"] > 0
+    assert pools["sync"]["size"] == settings.POSTGRES_POOL_SIZE
+    assert 0 <= pools["sync"]["saturation"] <= 1
+
+
+def test_read_db_pool_normal_user(
+    client: TestClient, normal_user_token_headers: dict[str, str]
+) -> None:
+    r = client.get(
+        f"{settings.API_V1_STR}/utils/db-pool/", headers=normal_user_token_headers
+    )
+    assert r.status_code == 403
@@ -0,0 +1,49 @@
+import pytest
+from sqlalchemy import exc, text
+from sqlmodel import create_engine
+
+from app.core.config import settings
+from app.core.db import engine_options
+from app.core.pool import InstrumentedQueuePool
+
+
+def test_pool_metrics_saturation_and_timeouts() -> None:
+    engine = create_engine(
+        str(settings.SQLALCHEMY_DATABASE_URI),
+        poolclass=InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.05,
+    )
+    pool = engine.pool
+    try:
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+            stats = pool.stats()  # type: ignore[attr-defined]
+            assert stats["checked_out"] == 1
+            assert stats["saturation"] == 1.0
+            with pytest.raises(exc.TimeoutError):
+                engine.connect()
+        stats = pool.stats()  # type: ignore[attr-defined]
+        assert stats["checked_out"] == 0
+        assert stats["checkouts"] == 1
+        assert stats["timeouts"] == 1
+        assert stats["peak_checked_out"] == 1
+        assert stats["wait_max_ms"] > 0
+
+        engine.dispose()
+        assert engine.pool is not pool
+        assert engine.pool.stats()["timeouts"] == 1  # type: ignore[attr-defined]
+    finally:
+        engine.dispose()
+
+
+def test_direct_options_skip_pgbouncer_workarounds(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(settings, "POSTGRES_PGBOUNCER", True)
+    monkeypatch.setattr(settings, "POSTGRES_STATEMENT_TIMEOUT_MS", 5000)
+    assert engine_options()["connect_args"] == {"prepare_threshold": None}
+    assert engine_options(direct=True)["connect_args"] == {
+        "options": "-c statement_timeout=5000"
+    }
@@ -0,0 +1,72 @@
+import asyncio
+from typing import Any
+
+from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app import crud, crud_async
+from app.core.db import async_engine
+from app.models import UserCreate
+from tests.utils.interaction import create_accepted_interaction
+from tests.utils.user import create_random_user
+from tests.utils.utils import random_email, random_lower_string
+
+
+def run_async(read: Any) -> Any:
+    async def main() -> Any:
+        try:
+            async with AsyncSession(async_engine) as session:
+                return await read(session)
+        finally:
+            # Its connections are bound to this event loop
+            await async_engine.dispose()
+
+    return asyncio.run(main())
+
+
+def test_async_reads_match_sync(db: Session) -> None:
+    word = random_lower_string()[:12]
+    endorser = crud.create_user(
+        session=db,
+        user_create=UserCreate(
+            email=random_email(), password=random_lower_string(), full_name=word
+        ),
+    )
+    endorsed = create_random_user(db)
+    crud.create_or_update_endorsement(
+        session=db, endorser_id=endorser.id, endorsed_id=endorsed.id, confidence=0.8
+    )
+    interaction = create_accepted_interaction(db, endorser, endorsed)
+    crud.add_rating(
+        session=db, interaction_id=interaction.id, rater_id=endorser.id, rating=4
+    )
+
+    async def read(session: AsyncSession) -> list[Any]:
+        return [
+            await crud_async.get_endorsements_with_user_info(
+                session=session, endorser_id=endorser.id
+            ),
+            await crud_async.get_endorsers_with_user_info(
+                session=session, endorsed_id=endorsed.id
+            ),
+            await crud_async.get_user_interactions(
+                session=session, user_id=endorser.id
+            ),
+            await crud_async.get_ratings_with_rater(
+                session=session, interaction_ids=[interaction.id]
+            ),
+            await crud_async.search_users(session=session, query=word),
+        ]
+
+    endorsements, endorsers, interactions, ratings, found = run_async(read)
+    assert endorsements == crud.get_endorsements_with_user_info(
+        session=db, endorser_id=endorser.id
+    )
+    assert endorsers == crud.get_endorsers_with_user_info(
+        session=db, endorsed_id=endorsed.id
+    )
+    assert [i.id for i in interactions] == [interaction.id]
+    assert ratings == crud.get_ratings_with_rater(
+        session=db, interaction_ids=[interaction.id]
+    )
+    assert [u.id for u in found] == [endorser.id]
@@ -0,0 +1,134 @@
+import sys
+import threading
+import uuid
+
+import numpy as np
+import pytest
+from sqlmodel import Session
+
+from app import crud
+from app.core.config import settings
+from app.reputation.adjacency import AdjacencyIndex, apply_notification
+from app.reputation.engine import load_edges
+from tests.utils.user import create_random_user
+
+
+def _index(size: int, edges: list[tuple[int, int, float]]) -> AdjacencyIndex:
+    index = AdjacencyIndex()
+    array = np.array(edges, dtype=np.float64).reshape(-1, 3)
+    index.replace(
+        [uuid.uuid4() for _ in range(size)], array[:, 0], array[:, 1], array[:, 2]
+    )
+    return index
+
+
+def test_forward_and_reverse_rows() -> None:
+    index = _index(3, [(0, 1, 0.5), (0, 2, 0.25), (2, 1, 1.0)])
+    a, b, c = index.user_ids
+    assert index.neighbours(a) == {b: 0.5, c: 0.25}
+    assert index.neighbours(b, reverse=True) == {a: 0.5, c: 1.0}
+    assert index.neighbours(b) == {}
+    neighbours, weights = index.neighbour_ids(0)
+    assert neighbours.dtype == np.int32
+    assert weights.dtype == np.float32
+
+
+def test_writes_and_deletes_before_and_after_compaction(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    index = _index(3, [(0, 1, 0.5), (1, 2, 0.5)])
+    a, b, c = index.user_ids
+    newcomer = uuid.uuid4()
+    index.set_endorsement(a, b, 0.75)
+    index.set_endorsement(newcomer, a, 1.0)
+    index.remove_user(c)
+
+    def check() -> None:
+        assert index.neighbours(a) == {b: 0.75}
+        assert index.neighbours(a, reverse=True) == {newcomer: 1.0}
+        assert index.neighbours(b) == {}
+        assert index.neighbours(c) == {}
+        assert index.size == 3
+
+    check()
+    index.compact()
+    assert c not in index.index
+    check()
+
+    # Reaching the threshold compacts on its own
+    monkeypatch.setattr(settings, "ENDORSEMENT_INDEX_COMPACT_EDGES", 1)
+    index.set_endorsement(b, a, 0.5)
+    assert index._pending == 0
+    assert index.neighbours(b) == {a: 0.5}
+
+
+def test_neighbours_consistent_while_renumbering() -> None:
+    index = _index(3, [(1, 2, 0.5)])
+    _, b, c = index.user_ids
+    done = threading.Event()
+
+    def churn() -> None:
+        # Alternate between numberings with b and c at different dense ids
+        while not done.is_set():
+            index.replace([uuid.uuid4(), b, c], [1], [2], [0.5])
+            index.replace([b, c], [0], [1], [0.5])
+
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    thread = threading.Thread(target=churn)
+    thread.start()
+    try:
+        for _ in range(20000):
+            assert index.neighbours(b) == {c: 0.5}
+    finally:
+        done.set()
+        thread.join()
+        sys.setswitchinterval(interval)
+
+
+def test_apply_notification() -> None:
+    index = _index(2, [])
+    a, b = index.user_ids
+    apply_notification(index, f"e {a} {b} 0.3")
+    assert index.neighbours(b, reverse=True) == {a: pytest.approx(0.3)}
+    apply_notification(index, f"d {a}")
+    assert index.neighbours(b, reverse=True) == {}
+
+
+def test_load_and_crud_hooks(db: Session, monkeypatch: pytest.MonkeyPatch) -> None:
+    endorser = create_random_user(db)
+    endorsed = create_random_user(db)
+    crud.create_or_update_endorsement(
+        session=db, endorser_id=endorser.id, endorsed_id=endorsed.id, confidence=0.5
+    )
+    index = AdjacencyIndex()
+    index.load(db)
+    assert index.neighbours(endorser.id) == {endorsed.id: 0.5}
+
+    monkeypatch.setattr("app.reputation.adjacency.adjacency", index)
+    crud.create_or_update_endorsement(
+        session=db, endorser_id=endorsed.id, endorsed_id=endorser.id, confidence=0.25
+    )
+    assert index.neighbours(endorser.id, reverse=True) == {endorsed.id: 0.25}
+    crud.delete_user(session=db, db_user=endorsed)
+    assert index.neighbours(endorser.id) == {}
+
+
+def test_load_streams_edges_in_chunks(db: Session) -> None:
+    users = [create_random_user(db) for _ in range(3)]
+    for endorser, endorsed in [(0, 1), (1, 2), (2, 0)]:
+        crud.create_or_update_endorsement(
+            session=db,
+            endorser_id=users[endorser].id,
+            endorsed_id=users[endorsed].id,
+            confidence=0.5,
+        )
+    whole = load_edges(db)
+    chunked = load_edges(db, chunk_size=2)
+    assert chunked.user_ids == whole.user_ids
+    edges = sorted(zip(whole.sources, whole.targets, whole.confidences, strict=True))
+    assert len(edges) >= 3
+    assert (
+        sorted(zip(chunked.sources, chunked.targets, chunked.confidences, strict=True))
+        == edges
+    )
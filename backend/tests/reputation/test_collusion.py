@@ -0,0 +1,117 @@
+import numpy as np
+import scipy.sparse as sp
+from sqlmodel import Session, select
+
+from app import crud
+from app.models import CollusionMember, ReputationState
+from app.reputation.collusion import RECIPROCAL, RING, check_collusion, detect_clusters
+from app.reputation.engine import recompute_reputation
+from tests.utils.user import create_random_user
+
+
+def _matrix(edges: list[tuple[int, int, float]], n: int) -> sp.csr_matrix:
+    array = np.array(edges, dtype=np.float64)
+    return sp.csr_matrix(
+        (array[:, 2], (array[:, 0].astype(int), array[:, 1].astype(int))),
+        shape=(n, n),
+    )
+
+
+def test_detect_isolated_ring() -> None:
+    # 0 -> 1 -> 2 -> 0 only vouch for each other; 3 -> 4 -> 5 is a chain
+    matrix = _matrix(
+        [(0, 1, 0.9), (1, 2, 0.9), (2, 0, 0.8), (3, 4, 0.9), (4, 5, 0.9)], 6
+    )
+    clusters = detect_clusters(matrix, min_size=3)
+    assert len(clusters) == 1
+    assert clusters[0].kind == RING
+    assert clusters[0].members.tolist() == [0, 1, 2]
+    assert clusters[0].internal_share == 1.0
+    assert clusters[0].density == 0.0
+
+
+def test_detect_reciprocal_clique_with_outside_endorsers() -> None:
+    # 0..3 all endorse each other, and 4..9 endorse them from outside
+    clique = [(i, j, 0.9) for i in range(4) for j in range(4) if i != j]
+    outside = [(k, k % 4, 1.0) for k in range(4, 10)] * 3
+    matrix = _matrix(clique + outside, 10)
+    clusters = detect_clusters(
+        matrix, min_size=3, min_internal_share=0.9, min_reciprocal=2, min_density=0.5
+    )
+    assert len(clusters) == 1
+    assert clusters[0].kind == RECIPROCAL
+    assert clusters[0].members.tolist() == [0, 1, 2, 3]
+    assert clusters[0].density == 1.0
+    assert clusters[0].internal_share < 0.9
+
+
+def test_detect_nothing_in_sparse_graph() -> None:
+    matrix = _matrix([(0, 1, 0.9), (1, 0, 0.9), (1, 2, 0.9), (3, 2, 0.9)], 4)
+    assert detect_clusters(matrix, min_size=3) == []
+    assert detect_clusters(sp.csr_matrix((0, 0))) == []
+
+
+def _ring(db: Session, size: int) -> list:
+    users = [create_random_user(db) for _ in range(size)]
+    for i, user in enumerate(users):
+        crud.create_or_update_endorsement(
+            session=db,
+            endorser_id=user.id,
+            endorsed_id=users[(i + 1) % size].id,
+            confidence=0.95,
+        )
+    return [user.id for user in users]
+
+
+def _clusters_of(db: Session, user_ids: list) -> set:
+    return set(
+        db.exec(
+            select(CollusionMember.cluster_id).where(
+                CollusionMember.user_id.in_(user_ids)  # type: ignore[attr-defined]
+            )
+        ).all()
+    )
+
+
+def test_check_collusion_incremental(db: Session) -> None:
+    # Checks are recorded on the state row a full recompute creates
+    recompute_reputation(session=db)
+    first = _ring(db, 3)
+    full = check_collusion(session=db, full=True)
+    assert not full.incremental
+    (first_cluster,) = _clusters_of(db, first)
+
+    second = _ring(db, 4)
+    result = check_collusion(session=db)
+    assert result.incremental
+    # Only the new ring's component is re-checked
+    assert result.users_checked == 4
+    assert result.clusters_found == 1
+    assert _clusters_of(db, first) == {first_cluster}
+    assert len(_clusters_of(db, second)) == 1
+
+    # Weakening one endorsement breaks the ring on the next check
+    crud.create_or_update_endorsement(
+        session=db, endorser_id=second[0], endorsed_id=second[1], confidence=0.1
+    )
+    result = check_collusion(session=db)
+    assert result.clusters_removed == 1
+    assert _clusters_of(db, second) == set()
+    assert _clusters_of(db, first) == {first_cluster}
+
+
+def test_check_collusion_does_not_create_state_row(db: Session) -> None:
+    state = db.get(ReputationState, 1)
+    saved = state.model_dump() if state is not None else None
+    if state is not None:
+        db.delete(state)
+        db.commit()
+    try:
+        result = check_collusion(session=db)
+        # Nothing records a previous check, so the whole graph is checked
+        assert not result.incremental
+        assert db.get(ReputationState, 1) is None
+    finally:
+        if saved is not None:
+            db.add(ReputationState(**saved))
+            db.commit()
@@ -0,0 +1,58 @@
+import pytest
+from sqlalchemy import update
+from sqlmodel import Session
+
+from app import crud
+from app.models import User
+from app.reputation.counters import reconcile_counters
+from tests.utils.user import create_random_user
+
+
+def test_counters_follow_endorsement_writes(db: Session) -> None:
+    alice, bob, carol = (create_random_user(db) for _ in range(3))
+    crud.create_or_update_endorsement(
+        session=db, endorser_id=alice.id, endorsed_id=bob.id, confidence=0.5
+    )
+    crud.create_or_update_endorsement(
+        session=db, endorser_id=carol.id, endorsed_id=bob.id, confidence=0.75
+    )
+    # Updating an existing endorsement only moves the sums
+    crud.create_or_update_endorsement(
+        session=db, endorser_id=alice.id, endorsed_id=bob.id, confidence=0.9
+    )
+    crud.create_or_update_endorsement(
+        session=db, endorser_id=bob.id, endorsed_id=alice.id, confidence=0.2
+    )
+    for user in (alice, bob, carol):
+        db.refresh(user)
+    assert (bob.endorsements_received, bob.endorsements_given) == (2, 1)
+    assert bob.confidence_received == pytest.approx(1.65)
+    assert bob.confidence_given == pytest.approx(0.2)
+    assert (alice.endorsements_received, alice.endorsements_given) == (1, 1)
+    assert alice.confidence_given == pytest.approx(0.9)
+
+    crud.delete_user(session=db, db_user=carol)
+    db.refresh(bob)
+    assert bob.endorsements_received == 1
+    assert bob.confidence_received == pytest.approx(0.9)
+    scope = f"SELECT id FROM \"user\" WHERE id IN ('{alice.id}', '{bob.id}')"
+    assert reconcile_counters(db.connection(), scope=scope) == 0
+    db.commit()
+
+
+def test_reconcile_repairs_drift(db: Session) -> None:
+    endorser, endorsed = create_random_user(db), create_random_user(db)
+    crud.create_or_update_endorsement(
+        session=db, endorser_id=endorser.id, endorsed_id=endorsed.id, confidence=0.4
+    )
+    db.execute(
+        update(User)
+        .where(User.id == endorsed.id)  # type: ignore[arg-type]
+        .values(endorsements_received=7, confidence_received=3.0)
+    )
+    db.commit()
+    assert reconcile_counters(db.connection()) >= 1
+    db.commit()
+    db.refresh(endorsed)
+    assert endorsed.endorsements_received == 1
+    assert endorsed.confidence_received == pytest.approx(0.4)
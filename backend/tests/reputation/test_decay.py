@@ -0,0 +1,63 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlmodel import Session
+
+from app.core.config import settings
+from app.reputation import decay
+from tests.utils.user import create_random_user
+
+HALF_LIFE = timedelta(days=settings.REPUTATION_HALF_LIFE_DAYS)
+
+
+def test_decay_halves_every_half_life() -> None:
+    start = datetime(2026, 1, 1)
+    assert decay.decay(since=start, until=start) == 1.0
+    assert decay.decay(since=start, until=start + HALF_LIFE) == pytest.approx(0.5)
+    assert decay.decay(since=start, until=start + 2 * HALF_LIFE) == pytest.approx(0.25)
+
+
+def test_ratings_weighted_by_age(db: Session) -> None:
+    user = create_random_user(db)
+    now = datetime(2026, 6, 1)
+    # Out of order on purpose: the landmark only ever moves forward
+    decay.record_rating(session=db, user_id=user.id, rating=4, at=now)
+    decay.record_rating(session=db, user_id=user.id, rating=-2, at=now - HALF_LIFE)
+    db.commit()
+
+    result = decay.get_decayed_reputation(session=db, user_id=user.id, now=now)
+    assert result.rating_weight == pytest.approx(1.5)
+    assert result.rating_mean == pytest.approx((4 - 1) / 1.5)
+
+    later = decay.get_decayed_reputation(
+        session=db, user_id=user.id, now=now + HALF_LIFE
+    )
+    assert later.rating_weight == pytest.approx(0.75)
+    assert later.rating_mean == pytest.approx(result.rating_mean)
+
+
+def test_endorsement_update_replaces_previous(db: Session) -> None:
+    user = create_random_user(db)
+    first = datetime(2026, 1, 1)
+    second = first + HALF_LIFE
+    decay.record_endorsement(session=db, user_id=user.id, confidence=0.8, at=first)
+    decay.record_endorsement(
+        session=db,
+        user_id=user.id,
+        confidence=0.2,
+        at=second,
+        previous=(0.8, first),
+    )
+    db.commit()
+
+    result = decay.get_decayed_reputation(session=db, user_id=user.id, now=second)
+    assert result.endorsement_weight == pytest.approx(1.0)
+    assert result.endorsement_score == pytest.approx(0.2)
+
+
+def test_no_activity(db: Session) -> None:
+    user = create_random_user(db)
+    result = decay.get_decayed_reputation(session=db, user_id=user.id)
+    assert result.rating_mean is None
+    assert result.rating_weight == 0.0
+    assert result.endorsement_score == 0.0
@@ -0,0 +1,33 @@
+import numpy as np
+
+from app.reputation.engine import EndorsementGraph, build_graph, compute_global_trust
+from tests.utils.reputation import graph_from_edges
+
+
+def test_compute_global_trust_sums_to_one() -> None:
+    graph = graph_from_edges(4, [(0, 1, 1.0), (1, 2, 0.5), (2, 0, 0.8), (3, 0, 0.2)])
+    result = compute_global_trust(graph, tol=1e-12, max_iter=1000)
+    assert graph.edges == 4
+    assert np.isclose(result.scores.sum(), 1.0)
+    assert result.residual < 1e-12
+    # Nobody endorses user 3, so it only keeps its teleport share
+    assert result.scores[3] == result.scores.min()
+
+
+def test_compute_global_trust_weights_by_confidence() -> None:
+    graph = graph_from_edges(3, [(0, 1, 0.9), (0, 2, 0.1)])
+    scores = compute_global_trust(graph).scores
+    assert scores[1] > scores[2] > scores[0]
+
+
+def test_build_graph_skips_zero_confidence() -> None:
+    graph = graph_from_edges(2, [(0, 1, 0.0), (1, 0, 1.0)])
+    assert graph.edges == 1
+    assert graph.dangling.tolist() == [True, False]
+
+
+def test_compute_global_trust_empty_graph() -> None:
+    graph: EndorsementGraph = build_graph([], np.array([]), np.array([]), np.array([]))
+    result = compute_global_trust(graph)
+    assert result.scores.size == 0
+    assert result.iterations == 0
@@ -0,0 +1,98 @@
+import numpy as np
+import pytest
+from sqlmodel import Session, select
+
+from app import crud
+from app.core.config import settings
+from app.models import Endorsement, Reputation, ReputationState
+from app.reputation import incremental, worker
+from app.reputation.engine import (
+    compute_global_trust,
+    load_graph,
+    recompute_reputation,
+)
+from tests.utils.user import create_random_user
+
+
+def _stored_error(db: Session) -> float:
+    graph = load_graph(db)
+    exact = compute_global_trust(graph, tol=1e-12, max_iter=1000).scores
+    stored = np.zeros(graph.size)
+    for user_id, score in db.exec(select(Reputation.user_id, Reputation.score)):
+        stored[graph.index[user_id]] = score
+    stored /= stored.sum()
+    return float(np.abs(stored - exact).sum())
+
+
+def test_incremental_update_stays_within_tolerance(db: Session) -> None:
+    users = [create_random_user(db) for _ in range(5)]
+    for src, dst, confidence in [(0, 1, 0.9), (1, 2, 0.5), (2, 0, 0.7), (3, 1, 0.4)]:
+        crud.create_or_update_endorsement(
+            session=db,
+            endorser_id=users[src].id,
+            endorsed_id=users[dst].id,
+            confidence=confidence,
+        )
+    recompute_reputation(session=db)
+    queued = worker.worker_status(session=db).queue_depth
+
+    crud.create_or_update_endorsement(
+        session=db, endorser_id=users[3].id, endorsed_id=users[4].id, confidence=1.0
+    )
+    crud.create_or_update_endorsement(
+        session=db, endorser_id=users[0].id, endorsed_id=users[1].id, confidence=0.1
+    )
+    assert _stored_error(db) <= settings.REPUTATION_INCREMENTAL_TOLERANCE
+    # Within tolerance, so no full recompute was queued
+    assert worker.worker_status(session=db).queue_depth == queued
+
+
+def test_apply_endorsement_change_pushes_locally(db: Session) -> None:
+    endorser, endorsed = create_random_user(db), create_random_user(db)
+    crud.create_or_update_endorsement(
+        session=db, endorser_id=endorser.id, endorsed_id=endorsed.id, confidence=0.5
+    )
+    recompute_reputation(session=db)
+
+    target = create_random_user(db)
+    old_row = incremental.local_trust_row(session=db, user_id=endorsed.id)
+    db.add(Endorsement(endorser_id=endorsed.id, endorsed_id=target.id, confidence=1.0))
+    db.flush()
+    update = incremental.apply_endorsement_change(
+        session=db, endorser_id=endorsed.id, old_row=old_row
+    )
+    db.commit()
+    assert update is not None
+    assert not update.recompute_signalled
+    assert update.pushes > 0
+    assert update.edges_touched <= settings.REPUTATION_INCREMENTAL_PUSH_BUDGET
+    assert update.error_bound <= settings.REPUTATION_INCREMENTAL_TOLERANCE
+
+
+def test_exceeded_bound_queues_recompute_instead_of_running_it(
+    db: Session, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    endorser, endorsed = create_random_user(db), create_random_user(db)
+    crud.create_or_update_endorsement(
+        session=db, endorser_id=endorser.id, endorsed_id=endorsed.id, confidence=0.5
+    )
+    recompute_reputation(session=db)
+    computed_at = db.get(ReputationState, 1).computed_at
+    queued = worker.worker_status(session=db).queue_depth
+
+    monkeypatch.setattr(settings, "REPUTATION_INCREMENTAL_TOLERANCE", 1e-12)
+    monkeypatch.setattr(settings, "REPUTATION_INCREMENTAL_PUSH_BUDGET", 0)
+    target = create_random_user(db)
+    old_row = incremental.local_trust_row(session=db, user_id=endorsed.id)
+    db.add(Endorsement(endorser_id=endorsed.id, endorsed_id=target.id, confidence=1.0))
+    db.flush()
+    update = incremental.apply_endorsement_change(
+        session=db, endorser_id=endorsed.id, old_row=old_row
+    )
+    db.commit()
+    assert update is not None
+    assert update.recompute_signalled
+    assert update.error_bound > 1e-12
+    db.expire_all()
+    assert db.get(ReputationState, 1).computed_at == computed_at
+    assert worker.worker_status(session=db).queue_depth > queued
@@ -0,0 +1,84 @@
+import uuid
+
+import numpy as np
+import pytest
+
+from app.reputation.adjacency import AdjacencyIndex
+from app.reputation.paths import (
+    FOUND,
+    NO_PATH,
+    TIMEOUT,
+    IndexEdges,
+    strongest_path,
+)
+
+# 0 -> 4 directly is weak; 0 -> 1 -> 2 -> 4 is the strongest chain
+EDGES = [
+    (0, 4, 0.1),
+    (0, 1, 0.9),
+    (1, 2, 0.9),
+    (2, 4, 0.9),
+    (0, 3, 0.5),
+    (3, 4, 0.5),
+    (2, 0, 1.0),
+]
+
+
+def _index() -> AdjacencyIndex:
+    index = AdjacencyIndex()
+    array = np.array(EDGES, dtype=np.float64)
+    index.replace(
+        [uuid.uuid4() for _ in range(6)], array[:, 0], array[:, 1], array[:, 2]
+    )
+    return index
+
+
+def test_strongest_path_prefers_weight_over_hops() -> None:
+    index = _index()
+    users = index.user_ids
+    result = strongest_path(users[0], users[4], IndexEdges(index.view()), max_depth=6)
+    assert result.status == FOUND
+    assert result.path == [users[0], users[1], users[2], users[4]]
+    assert result.confidences == pytest.approx([0.9, 0.9, 0.9])
+    assert result.weight == pytest.approx(0.9**3)
+
+
+def test_strongest_path_respects_depth_cap() -> None:
+    index = _index()
+    users = index.user_ids
+    edges = IndexEdges(index.view())
+    two_hops = strongest_path(users[0], users[4], edges, max_depth=2)
+    assert two_hops.path == [users[0], users[3], users[4]]
+    assert two_hops.weight == pytest.approx(0.25)
+    one_hop = strongest_path(users[0], users[4], edges, max_depth=1)
+    assert one_hop.path == [users[0], users[4]]
+
+
+def test_strongest_path_without_path_or_time() -> None:
+    index = _index()
+    users = index.user_ids
+    edges = IndexEdges(index.view())
+    assert strongest_path(users[4], users[0], edges).status == NO_PATH
+    assert strongest_path(users[5], users[0], edges).status == NO_PATH
+    timed_out = strongest_path(users[0], users[4], edges, time_budget_ms=0)
+    assert timed_out.status == TIMEOUT
+    assert timed_out.path == []
+
+
+def test_view_is_unaffected_by_later_writes() -> None:
+    index = _index()
+    users = index.user_ids
+    edges = IndexEdges(index.view())
+    # Writes and a renumbering compaction made while a search holds the view
+    newcomer = uuid.uuid4()
+    index.set_endorsement(users[0], users[4], 1.0)
+    index.set_endorsement(newcomer, users[4], 1.0)
+    index.remove_user(users[1])
+    index.compact()
+    assert edges.dense_id(newcomer) is None
+    result = strongest_path(users[0], users[4], edges, max_depth=6)
+    assert result.path == [users[0], users[1], users[2], users[4]]
+    assert strongest_path(users[0], users[4], IndexEdges(index.view())).path == [
+        users[0],
+        users[4],
+    ]
@@ -0,0 +1,82 @@
+import time
+import uuid
+from collections.abc import Collection
+
+import numpy as np
+
+from app.reputation.personalized import forward_push
+
+EDGES = [(0, 1, 1.0), (0, 2, 0.5), (1, 2, 1.0), (2, 0, 0.2), (2, 3, 0.8)]
+
+
+def _lookup(users: list[uuid.UUID]):  # type: ignore[no-untyped-def]
+    rows: dict[uuid.UUID, dict[uuid.UUID, float]] = {u: {} for u in users}
+    for src, dst, confidence in EDGES:
+        rows[users[src]][users[dst]] = confidence
+    for row in rows.values():
+        total = sum(row.values())
+        for user_id in row:
+            row[user_id] /= total
+
+    def lookup(
+        user_ids: Collection[uuid.UUID],
+    ) -> dict[uuid.UUID, dict[uuid.UUID, float]]:
+        return {u: rows[u] for u in user_ids}
+
+    return lookup
+
+
+def _exact(size: int, damping: float) -> np.ndarray:
+    matrix = np.zeros((size, size))
+    for src, dst, confidence in EDGES:
+        matrix[src, dst] = confidence
+    out = matrix.sum(axis=1, keepdims=True)
+    matrix = np.divide(matrix, out, out=np.zeros_like(matrix), where=out > 0)
+    start = np.zeros(size)
+    start[0] = 1.0
+    return (1 - damping) * np.linalg.solve(np.eye(size) - damping * matrix.T, start)
+
+
+def test_forward_push_within_error_bound() -> None:
+    users = [uuid.uuid4() for _ in range(4)]
+    trust = forward_push(
+        users[0], _lookup(users), epsilon=1e-6, time_budget_ms=1000, damping=0.85
+    )
+    exact = _exact(4, 0.85)
+    assert trust.converged
+    for i, user_id in enumerate(users):
+        estimate = trust.scores.get(user_id, 0.0)
+        assert estimate <= exact[i] + 1e-12
+        assert exact[i] - estimate <= trust.error_bound
+
+
+def test_forward_push_coarse_epsilon_has_larger_bound() -> None:
+    users = [uuid.uuid4() for _ in range(4)]
+    fine = forward_push(users[0], _lookup(users), epsilon=1e-6, time_budget_ms=1000)
+    coarse = forward_push(users[0], _lookup(users), epsilon=1e-1, time_budget_ms=1000)
+    assert coarse.error_bound > fine.error_bound
+    assert coarse.rounds < fine.rounds
+
+
+def test_forward_push_stops_at_time_budget() -> None:
+    users = [uuid.uuid4() for _ in range(4)]
+    trust = forward_push(users[0], _lookup(users), epsilon=1e-9, time_budget_ms=1e-6)
+    assert not trust.converged
+    assert trust.error_bound == 1.0
+
+
+def test_forward_push_stops_within_a_round() -> None:
+    users = [uuid.uuid4() for _ in range(4)]
+    lookup = _lookup(users)
+
+    def slow_lookup(
+        user_ids: Collection[uuid.UUID],
+    ) -> dict[uuid.UUID, dict[uuid.UUID, float]]:
+        time.sleep(0.01)
+        return lookup(user_ids)
+
+    trust = forward_push(users[0], slow_lookup, epsilon=1e-9, time_budget_ms=1)
+    # The budget ran out during the first round's lookup, before any push
+    assert not trust.converged
+    assert trust.scores == {}
+    assert trust.error_bound == 1.0
@@ -0,0 +1,64 @@
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+from app.reputation.snapshot import SnapshotReader, write_snapshot
+
+
+def test_snapshot_round_trip(tmp_path: Path) -> None:
+    user_ids = [uuid.uuid4() for _ in range(98)]
+    # Keys must compare as raw bytes, including trailing zero bytes
+    user_ids += [uuid.UUID(bytes=bytes(16)), uuid.UUID(bytes=bytes(15) + b"\x01")]
+    scores = np.random.default_rng(0).random(100)
+    computed_at = datetime(2026, 10, 17, 12, 0)
+    version = write_snapshot(
+        user_ids, {"score": scores}, computed_at=computed_at, directory=str(tmp_path)
+    )
+
+    snapshot = SnapshotReader(str(tmp_path)).current()
+    assert snapshot is not None
+    assert snapshot.version == version
+    assert snapshot.computed_at == computed_at
+    assert len(snapshot) == 100
+    assert isinstance(snapshot.arrays["score"], np.memmap)
+    for user_id, score in zip(user_ids, scores, strict=True):
+        assert snapshot.lookup(user_id) == score
+    assert snapshot.lookup(uuid.uuid4()) is None
+    unknown = uuid.uuid4()
+    found = snapshot.lookup_many([unknown, user_ids[-1], user_ids[0]])
+    assert found == {user_ids[-1]: scores[-1], user_ids[0]: scores[0]}
+    assert snapshot.lookup_many([user_ids[0]], "certified") == {}
+
+
+def test_snapshot_reader_swaps_versions(tmp_path: Path) -> None:
+    user_id = uuid.uuid4()
+    reader = SnapshotReader(str(tmp_path))
+    assert reader.current() is None
+
+    first = write_snapshot(
+        [user_id],
+        {"score": np.array([0.25])},
+        computed_at=datetime.utcnow(),
+        directory=str(tmp_path),
+    )
+    old = reader.current()
+    assert old is not None and old.version == first
+    assert reader.current() is old
+
+    for _ in range(3):
+        latest = write_snapshot(
+            [user_id],
+            {"score": np.array([0.75])},
+            computed_at=datetime.utcnow(),
+            directory=str(tmp_path),
+            keep=2,
+        )
+    new = reader.current()
+    assert new is not None and new.version == latest
+    assert new.lookup(user_id) == 0.75
+    # The superseded version was pruned but its mapping still reads
+    assert not old.path.exists()
+    assert old.lookup(user_id) == 0.25
+    assert len([p for p in tmp_path.iterdir() if p.is_dir()]) == 2
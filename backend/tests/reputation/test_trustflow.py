@@ -0,0 +1,36 @@
+import numpy as np
+
+from app.reputation.trustflow import compute_trust_flow, node_capacities
+from tests.utils.reputation import graph_from_edges
+
+
+def test_node_capacities_by_distance() -> None:
+    distance = np.array([0, 1, 2, 5, np.inf])
+    capacity = node_capacities(distance, [10, 4, 2])
+    assert capacity.tolist() == [10, 4, 2, 1, 0]
+
+
+def test_sybil_cluster_limited_by_attack_edge() -> None:
+    # Seed 0 vouches for 1 and 2; 2 is tricked into endorsing 3, which
+    # fronts a densely connected Sybil cluster 3..9
+    edges = [(0, 1, 1.0), (0, 2, 1.0), (1, 2, 1.0), (2, 3, 1.0)]
+    sybils = range(3, 10)
+    edges += [(a, b, 1.0) for a in sybils for b in sybils if a != b]
+    graph = graph_from_edges(10, edges)
+
+    result = compute_trust_flow(graph, [0], capacities=[4, 2, 1], min_confidence=0.5)
+    assert result.certified.tolist() == [True] * 4 + [False] * 6
+    assert result.flow == 4
+    assert result.reachable == 10
+
+
+def test_weak_endorsements_do_not_carry_trust() -> None:
+    graph = graph_from_edges(3, [(0, 1, 0.9), (0, 2, 0.1)])
+    result = compute_trust_flow(graph, [0], capacities=[4, 2], min_confidence=0.5)
+    assert result.certified.tolist() == [True, True, False]
+
+
+def test_no_seeds() -> None:
+    graph = graph_from_edges(2, [(0, 1, 1.0)])
+    result = compute_trust_flow(graph, [])
+    assert not result.certified.any()
@@ -0,0 +1,61 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app import crud
+from app.core.config import settings
+from app.core.db import engine
+from app.reputation.worker import run_once, worker_status
+from tests.utils.user import create_random_user
+
+
+def test_writes_are_coalesced_into_one_recompute(
+    db: Session, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    # Without incremental updates every endorsement write queues a recompute
+    monkeypatch.setattr(settings, "REPUTATION_INCREMENTAL", False)
+    endorser = create_random_user(db)
+    endorsed = [create_random_user(db) for _ in range(3)]
+    run_once(engine, force=True)
+    for user in endorsed:
+        crud.create_or_update_endorsement(
+            session=db, endorser_id=endorser.id, endorsed_id=user.id, confidence=0.5
+        )
+    assert worker_status(session=db).queue_depth == 3
+
+    # The oldest signal has not waited a full window yet
+    assert run_once(engine) is None
+    assert worker_status(session=db).queue_depth == 3
+
+    create_random_user(db)
+    assert worker_status(session=db).queue_depth == 4
+
+    run = run_once(engine, force=True)
+    assert run is not None
+    db.expire_all()
+    status = worker_status(session=db)
+    assert status.queue_depth == 0
+    assert status.oldest_signal_at is None
+    assert status.last_run_seconds == run.duration_seconds
+    assert run_once(engine, force=True) is None
+
+
+def test_read_worker_status(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    r = client.get(
+        f"{settings.API_V1_STR}/reputation/worker", headers=superuser_token_headers
+    )
+    assert r.status_code == 200
+    status = r.json()
+    assert status["window_seconds"] == settings.REPUTATION_RECOMPUTE_WINDOW_SECONDS
+    assert status["queue_depth"] >= 0
+
+
+def test_read_worker_status_normal_user(
+    client: TestClient, normal_user_token_headers: dict[str, str]
+) -> None:
+    r = client.get(
+        f"{settings.API_V1_STR}/reputation/worker", headers=normal_user_token_headers
+    )
+    assert r.status_code == 403
@@ -0,0 +1,18 @@
+from sqlmodel import Session
+
+from app import crud
+from app.models import Interaction, User
+
+
+def create_accepted_interaction(
+    db: Session, initiator: User, target: User
+) -> Interaction:
+    interaction = crud.create_interaction(
+        session=db, initiator_id=initiator.id, target_id=target.id
+    )
+    return crud.respond_interaction(
+        session=db,
+        interaction_id=interaction.id,
+        responder_id=target.id,
+        accept=True,
+    )
@@ -0,0 +1,13 @@
+import uuid
+
+import numpy as np
+
+from app.reputation.engine import EndorsementGraph, build_graph
+
+
+def graph_from_edges(
+    size: int, edges: list[tuple[int, int, float]]
+) -> EndorsementGraph:
+    user_ids = [uuid.uuid4() for _ in range(size)]
+    array = np.array(edges, dtype=np.float64).reshape(-1, 3)
+    return build_graph(user_ids, array[:, 0], array[:, 1], array[:, 2])
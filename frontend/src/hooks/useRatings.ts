@@ -1,6 +1,8 @@
 import { useMutation, useQuery, useQueryClient } from "@tanstack/react-query"
 
 const apiBase = import.meta.env.VITE_API_URL ?? ""
+// Ratings change only when someone rates, which invalidates them
+const RATINGS_STALE_MS = 60_000
 
 function authHeader() {
   const token = localStorage.getItem("access_token")
@@ -27,7 +29,44 @@ export function useAddRating() {
       }
       return res.json()
     },
-    onSuccess: () => queryClient.invalidateQueries({ queryKey: ["interactions"] }),
+    onSuccess: () => {
+      queryClient.invalidateQueries({ queryKey: ["interactions"] })
+      queryClient.invalidateQueries({ queryKey: ["ratings"] })
+    },
+  })
+}
+
+// Ratings of every interaction on a page in one request. Each interaction's
+// ratings are also stored under its own key, so useRatingsForInteraction
+// reads them from the cache instead of fetching them one by one.
+export function useRatingsForInteractions(interactionIds: string[] = []) {
+  const queryClient = useQueryClient()
+  const ids = [...interactionIds].sort()
+  return useQuery({
+    queryKey: ["ratings", "batch", ids],
+    queryFn: async () => {
+      const res = await fetch(`${apiBase}/api/v1/interactions/ratings`, {
+        method: "POST",
+        headers: {
+          "Content-Type": "application/json",
+          ...authHeader(),
+        },
+        body: JSON.stringify({ interaction_ids: ids }),
+      })
+      if (!res.ok) {
+        const err = await res.json().catch(() => ({}))
+        throw new Error(err.detail || res.statusText)
+      }
+      const body = await res.json()
+      const byInteraction: Record<string, any[]> = {}
+      for (const { interaction_id, ratings } of body.data) {
+        byInteraction[interaction_id] = ratings
+        queryClient.setQueryData(["ratings", interaction_id], ratings)
+      }
+      return byInteraction
+    },
+    enabled: ids.length > 0,
+    staleTime: RATINGS_STALE_MS,
   })
 }
 
@@ -48,6 +87,7 @@ export function useRatingsForInteraction(interactionId?: string) {
       return res.json()
     },
     enabled: Boolean(interactionId),
+    staleTime: RATINGS_STALE_MS,
   })
 }
 
@@ -1,7 +1,14 @@
 import { useQuery } from "@tanstack/react-query"
+import { useEffect, useState } from "react"
 
 const apiBase = import.meta.env.VITE_API_URL ?? ""
 
+// Wait for typing to pause before hitting the API
+const DEBOUNCE_MS = 250
+// Shorter queries autocomplete on prefixes; longer ones are matched fuzzily
+const FUZZY_MIN_LENGTH = 3
+const LIMIT = 20
+
 function authHeader() {
   const token = localStorage.getItem("access_token")
   const headers: Record<string, string> = {}
@@ -9,12 +16,27 @@ function authHeader() {
   return headers
 }
 
+function useDebounced<T>(value: T, delay: number) {
+  const [debounced, setDebounced] = useState(value)
+  useEffect(() => {
+    const timer = setTimeout(() => setDebounced(value), delay)
+    return () => clearTimeout(timer)
+  }, [value, delay])
+  return debounced
+}
+
 export function useUserSearch(query: string | undefined) {
+  const term = useDebounced(query?.trim() ?? "", DEBOUNCE_MS)
+  const mode = term.length < FUZZY_MIN_LENGTH ? "prefix" : "fuzzy"
   return useQuery({
-    queryKey: ["userSearch", query],
+    queryKey: ["userSearch", mode, term],
     queryFn: async () => {
-      if (!query || query.trim() === "") return { data: [], count: 0 }
-      const res = await fetch(`${apiBase}/api/v1/users/search?query=${encodeURIComponent(query)}`, {
+      const params = new URLSearchParams({
+        query: term,
+        mode,
+        limit: String(LIMIT),
+      })
+      const res = await fetch(`${apiBase}/api/v1/users/search?${params}`, {
         headers: {
           ...authHeader(),
         },
@@ -25,7 +47,7 @@ export function useUserSearch(query: string | undefined) {
       }
       return res.json()
     },
-    enabled: Boolean(query),
+    enabled: term !== "",
     staleTime: 1000 * 60 * 1,
   })
 }
@@ -5,7 +5,7 @@ import useAuth from "@/hooks/useAuth"
 import useCustomToast from "@/hooks/useCustomToast"
 import { useCreateInteraction, useUserInteractions, useRespondInteraction } from "@/hooks/useInteractions"
 import useUserSearch from "@/hooks/useUserSearch"
-import useAddRating, { useRatingsForInteraction } from "@/hooks/useRatings"
+import useAddRating, { useRatingsForInteraction, useRatingsForInteractions } from "@/hooks/useRatings"
 import { Button } from "@/components/ui/button"
 import { Input } from "@/components/ui/input"
 import { Card, CardContent, CardDescription, CardHeader, CardTitle } from "@/components/ui/card"
@@ -36,6 +36,9 @@ function InteractionPage(): React.JSX.Element {
   const createMutation = useCreateInteraction()
   const { data: interactions, isLoading, error } = useUserInteractions(user?.id)
   const { data: searchResults } = useUserSearch(searchTerm)
+  const { data: ratingsByInteraction } = useRatingsForInteractions(
+    interactions?.map((interaction: any) => interaction.id),
+  )
 
   console.log("InteractionPage: interactions =", interactions, "isLoading =", isLoading, "error =", error)
 
@@ -228,6 +231,7 @@ function InteractionPage(): React.JSX.Element {
                       key={interaction.id}
                       interaction={interaction}
                       user={user}
+                      ratingCount={ratingsByInteraction?.[interaction.id]?.length}
                       isExpanded={expandedId === interaction.id}
                       onToggle={() => setExpandedId(expandedId === interaction.id ? null : interaction.id)}
                     />
@@ -245,11 +249,13 @@ function InteractionPage(): React.JSX.Element {
 function InteractionTableRow({
   interaction,
   user,
+  ratingCount,
   isExpanded,
   onToggle,
 }: {
   interaction: any
   user: any
+  ratingCount?: number
   isExpanded: boolean
   onToggle: () => void
 }): React.JSX.Element {
@@ -272,8 +278,7 @@ function InteractionTableRow({
           {new Date(interaction.created_at).toLocaleDateString()}
         </td>
         <td className="px-4 py-3 text-xs text-muted-foreground">
-          {/* Ratings count will be shown when expanded */}
-          <span>-</span>
+          <span>{ratingCount ? ratingCount : "-"}</span>
         </td>
         <td className="px-4 py-3 text-right">
           <Button variant="ghost" size="sm" onClick={(e) => {